@@ -0,0 +1,154 @@
+import threading
+import time
+from bisect import bisect_right
+from django.db import transaction
+from django.db.models import F
+from adminpanel.models import BudgetRange, MakeupType, MasterDataVersion, PaymentMethod, Product, Service
+
+# ------------------------------
+# ✅ Process-local master data registry
+#
+# MakeupType, BudgetRange, Service, Product and PaymentMethod change rarely
+# but are resolved on every lead write. Each process keeps one snapshot of
+# all five tables and serves lookups from memory. The save/delete signals
+# in adminpanel.models bump the MasterDataVersion row in the same
+# transaction as the change; it lives in the database because the default
+# cache backend is per process. A snapshot re-reads the version at most
+# every VERSION_CHECK_SECONDS and reloads when it moved, so other processes
+# pick up an admin edit within that window; the process that made it drops
+# its snapshot at once. Call master_data.invalidate() after queryset
+# updates, which do not send signals.
+#
+# Snapshot instances are shared between requests: treat them as read-only.
+# ------------------------------
+
+VERSION_CHECK_SECONDS = 5
+
+
+def lookup_key(name):
+    """Names are matched case- and whitespace-insensitively."""
+    return " ".join(str(name).split()).lower()
+
+
+class BudgetIndex:
+    """
+    Interval index over budget ranges sorted by min_value. A value lookup is
+    one bisect plus a backwards walk that stops as soon as no earlier range
+    can reach the value (prefix maximum of max_value), so O(log n) for the
+    usual non-overlapping ranges. Overlaps resolve to the lowest id, like
+    BudgetRange.objects.filter(...).first().
+    """
+
+    def __init__(self, budget_ranges):
+        bounded = sorted(
+            (budget.min_value, budget.max_value, budget.id, budget)
+            for budget in budget_ranges
+            if budget.min_value is not None and budget.max_value is not None
+        )
+        self.mins = [row[0] for row in bounded]
+        self.rows = bounded
+        self.reach = []
+        highest = None
+        for row in bounded:
+            highest = row[1] if highest is None else max(highest, row[1])
+            self.reach.append(highest)
+
+    def find(self, value):
+        best = None
+        index = bisect_right(self.mins, value) - 1
+        while index >= 0 and self.reach[index] >= value:
+            _, max_value, budget_id, budget = self.rows[index]
+            if value <= max_value and (best is None or budget_id < best.id):
+                best = budget
+            index -= 1
+        return best
+
+
+class MasterDataSnapshot:
+    def __init__(self, version):
+        self.version = version
+        self.checked_at = time.monotonic()
+
+        self.makeup_types = {row.id: row for row in MakeupType.objects.all()}
+        self.makeup_types_by_name = {lookup_key(row.name): row for row in self.makeup_types.values()}
+
+        self.budget_ranges = {row.id: row for row in BudgetRange.objects.all()}
+        self.budget_ranges_by_label = {lookup_key(row.label): row for row in self.budget_ranges.values()}
+        self.budget_index = BudgetIndex(self.budget_ranges.values())
+
+        self.services = {row.id: row for row in Service.objects.all()}
+        self.services_by_name = {lookup_key(row.name): row for row in self.services.values()}
+
+        self.products = {row.id: row for row in Product.objects.all()}
+        self.payment_methods = {row.id: row for row in PaymentMethod.objects.all()}
+
+
+class MasterDataRegistry:
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _current_version(self):
+        return MasterDataVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.checked_at < VERSION_CHECK_SECONDS:
+            return snapshot
+
+        version = self._current_version()
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = MasterDataSnapshot(version)
+                self._snapshot = snapshot
+            else:
+                snapshot.checked_at = time.monotonic()
+        return snapshot
+
+    def invalidate(self):
+        """
+        Bump the shared version with the surrounding transaction, so other
+        processes reload once it commits, and drop this process's snapshot.
+        """
+        if not MasterDataVersion.objects.filter(pk=1).update(version=F('version') + 1):
+            MasterDataVersion.objects.get_or_create(pk=1)
+        self._snapshot = None
+
+        def _drop():
+            # a reload inside the transaction may have cached uncommitted rows
+            self._snapshot = None
+        transaction.on_commit(_drop)
+
+    # ------------------------------
+    # Lookups
+    # ------------------------------
+
+    def makeup_type(self, value):
+        """By id (int) or case-insensitive name (str); None if unknown."""
+        snapshot = self.snapshot()
+        if isinstance(value, int):
+            return snapshot.makeup_types.get(value)
+        return snapshot.makeup_types_by_name.get(lookup_key(value))
+
+    def budget_range_for_value(self, value):
+        return self.snapshot().budget_index.find(value)
+
+    def budget_range_by_label(self, label):
+        return self.snapshot().budget_ranges_by_label.get(lookup_key(label))
+
+    def service(self, value):
+        """By id or case-insensitive name; None if unknown."""
+        snapshot = self.snapshot()
+        if isinstance(value, int) or str(value).strip().isdigit():
+            return snapshot.services.get(int(value))
+        return snapshot.services_by_name.get(lookup_key(value))
+
+    def product(self, product_id):
+        return self.snapshot().products.get(product_id)
+
+    def payment_method(self, payment_method_id):
+        return self.snapshot().payment_methods.get(payment_method_id)
+
+
+master_data = MasterDataRegistry()
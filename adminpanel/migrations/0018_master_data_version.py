@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0017_subscriptionplan_claim_amount_limit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MasterDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models.signals import post_save, post_delete
 
 class SubscriptionPlan(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -81,3 +82,26 @@ class PaymentMethod(models.Model):
     def __str__(self):
         return self.name
 
+
+class MasterDataVersion(models.Model):
+    """
+    Single row (id=1) bumped whenever master data changes. Every process
+    compares its snapshot (adminpanel.master_data) against it; it lives in
+    the database because the default cache is per process.
+    """
+    version = models.BigIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Master data v{self.version}"
+
+
+# master data snapshots (adminpanel.master_data) are rebuilt after any change
+def _master_data_changed(sender, **kwargs):
+    from adminpanel.master_data import master_data
+    master_data.invalidate()
+
+
+for _model in (Service, BudgetRange, MakeupType, Product, PaymentMethod):
+    post_save.connect(_master_data_changed, sender=_model, dispatch_uid=f'master_data_save_{_model.__name__}')
+    post_delete.connect(_master_data_changed, sender=_model, dispatch_uid=f'master_data_delete_{_model.__name__}')
@@ -1,3 +1,36 @@
 from django.test import TestCase
+from adminpanel.master_data import VERSION_CHECK_SECONDS, MasterDataRegistry, master_data
+from adminpanel.models import MakeupType, MasterDataVersion
 
-# Create your tests here.
+
+class MasterDataRegistryTests(TestCase):
+    """Snapshots follow the version row in the database, not a per-process cache."""
+
+    def setUp(self):
+        MakeupType.objects.create(name='HD')
+        # another worker process with its own registry
+        self.other_process = MasterDataRegistry()
+
+    def expire(self, registry):
+        registry._snapshot.checked_at -= VERSION_CHECK_SECONDS
+
+    def test_edit_reaches_other_processes_after_the_check_interval(self):
+        self.assertIsNotNone(self.other_process.makeup_type('hd'))
+        version = MasterDataVersion.objects.get(pk=1).version
+
+        MakeupType.objects.create(name='Airbrush')
+        self.assertEqual(MasterDataVersion.objects.get(pk=1).version, version + 1)
+        # the editing process reloads at once
+        self.assertIsNotNone(master_data.makeup_type('airbrush'))
+
+        # others serve their snapshot without queries until the interval passes
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.other_process.makeup_type('airbrush'))
+        self.expire(self.other_process)
+        self.assertIsNotNone(self.other_process.makeup_type('airbrush'))
+
+    def test_unchanged_version_keeps_the_snapshot(self):
+        snapshot = self.other_process.snapshot()
+        self.expire(self.other_process)
+        with self.assertNumQueries(1):
+            self.assertIs(self.other_process.snapshot(), snapshot)
@@ -0,0 +1,21 @@
+# Generated manually to index Location for lead location resolution and radius queries
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0041_artistprofile_retained_plan_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['city', 'state'], name='artists_location_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['lat', 'lng'], name='artists_location_geo_idx'),
+        ),
+    ]
@@ -10,6 +10,14 @@ class Location(models.Model):
     lat = models.FloatField(blank=True, null=True)
     lng = models.FloatField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # city/state lookups when resolving lead locations
+            models.Index(fields=['city', 'state'], name='artists_location_city_idx'),
+            # bounding-box prefilter for radius queries
+            models.Index(fields=['lat', 'lng'], name='artists_location_geo_idx'),
+        ]
+
     def __str__(self):
         return f"{self.city}, {self.state} - {self.pincode}"
 
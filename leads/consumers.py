@@ -0,0 +1,53 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+from artists.models.models import ArtistProfile
+from leads.utils.locations import city_location_ids
+from leads.utils.realtime import ALL_LEADS_GROUP, location_group
+
+
+@database_sync_to_async
+def artist_groups(token):
+    """Channel groups for the artist owning an access token, or None if it is not valid."""
+    try:
+        user_id = AccessToken(token)['user_id']
+    except (TokenError, KeyError):
+        return None
+
+    artist = ArtistProfile.objects.filter(user_id=user_id, user__is_active=True).only('id', 'preferred_locations').first()
+    if artist is None:
+        return None
+    location_ids = city_location_ids(artist.preferred_locations)
+    if not location_ids:
+        return [ALL_LEADS_GROUP]
+    return [location_group(location_id) for location_id in location_ids]
+
+
+class LeadEventsConsumer(AsyncJsonWebsocketConsumer):
+    """
+    ws/leads/?token=<access token>. Pushes {"event": "opened" | "closed",
+    "lead_ids": [...]} for leads in the artist's preferred cities.
+    Browsers cannot set an Authorization header on a WebSocket, so the JWT
+    access token travels in the query string.
+    """
+
+    async def connect(self):
+        params = parse_qs(self.scope.get('query_string', b'').decode())
+        token = (params.get('token') or [''])[0]
+        self.groups_joined = await artist_groups(token) if token else None
+        if not self.groups_joined:
+            await self.close(code=4401)
+            return
+
+        for group in self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        for group in getattr(self, 'groups_joined', None) or []:
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def lead_event(self, message):
+        await self.send_json({'event': message['event'], 'lead_ids': message['lead_ids']})
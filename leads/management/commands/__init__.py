@@ -0,0 +1 @@
+# Empty file to make commands directory a Python package
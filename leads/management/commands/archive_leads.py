@@ -0,0 +1,26 @@
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from leads.utils.archive import ARCHIVE_BATCH_SIZE, archive_leads
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Move leads older than the archive horizon whose booking date has passed, with their claims and bookings, into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Archive leads created more than this many days ago (default: LEAD_ARCHIVE_HORIZON_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='Leads moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many leads would be archived')
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.LEAD_ARCHIVE_HORIZON_DAYS
+        archived = archive_leads(horizon_days=days, batch_size=options['batch_size'], dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{archived} leads would be archived.'))
+            return
+
+        logger.info(f"Archived {archived} leads older than {days} days")
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} leads.'))
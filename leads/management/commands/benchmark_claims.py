@@ -0,0 +1,127 @@
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from artists.models.models import ArtistProfile
+from leads.models.models import Lead
+from leads.utils.claims import claim_lead, ClaimError
+from users.models import User
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        'Fire N concurrent claims at one lead from simulated artists and report '
+        'throughput, latency and correctness. Run against a MySQL/PostgreSQL '
+        'database; fixture rows are removed afterwards unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--artists', type=int, default=100, help='Simulated artists, one claim each')
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent claim threads')
+        parser.add_argument('--max-claims', type=int, default=5, help='max_claims on the contended lead')
+        parser.add_argument('--balance', type=int, default=1, help='available_leads per artist (0 exercises the balance guard)')
+        parser.add_argument('--repeat', type=int, default=1, help='Claims each artist attempts (>1 exercises the duplicate guard)')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated lead and artists')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            raise CommandError('SQLite serializes writers; run the benchmark against MySQL or PostgreSQL.')
+
+        run_id = f"{random.randint(0, 9999):04d}"
+        lead, artist_ids = self._create_fixtures(run_id, options)
+
+        attempts = [artist_id for artist_id in artist_ids for _ in range(options['repeat'])]
+        random.shuffle(attempts)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            results = list(pool.map(lambda artist_id: self._claim(lead.id, artist_id), attempts))
+        elapsed = time.perf_counter() - started
+
+        try:
+            self._report(lead, artist_ids, results, elapsed, options)
+        finally:
+            if not options['keep']:
+                Lead.objects.filter(pk=lead.pk).delete()
+                User.objects.filter(username__startswith=f"bench_claim_{run_id}_").delete()
+
+    def _create_fixtures(self, run_id, options):
+        artist_ids = []
+        for i in range(options['artists']):
+            phone = f"7{run_id}{i:05d}"
+            user = User.objects.create(username=f"bench_claim_{run_id}_{i}", phone=phone, role='artist')
+            artist = ArtistProfile.objects.create(
+                user=user,
+                first_name='Bench',
+                last_name=str(i),
+                phone=phone,
+                status='approved',
+                available_leads=options['balance'],
+            )
+            artist_ids.append(artist.id)
+
+        lead = Lead.objects.create(
+            first_name='Benchmark',
+            last_name=run_id,
+            booking_date=date.today(),
+            max_claims=options['max_claims'],
+            notes='claim contention benchmark',
+        )
+        return lead, artist_ids
+
+    def _claim(self, lead_id, artist_id):
+        started = time.perf_counter()
+        try:
+            claim_lead(lead_id, artist_id)
+            outcome = 'claimed'
+        except ClaimError as e:
+            outcome = e.message
+        finally:
+            # each worker thread holds its own connection
+            connection.close()
+        return outcome, time.perf_counter() - started
+
+    def _report(self, lead, artist_ids, results, elapsed, options):
+        latencies = sorted(latency for _, latency in results)
+        outcomes = Counter(outcome for outcome, _ in results)
+
+        lead.refresh_from_db()
+        claim_rows = Lead.claimed_artists.through.objects.filter(lead_id=lead.id).count()
+        balances = dict(ArtistProfile.objects.filter(pk__in=artist_ids).values_list('pk', 'available_leads'))
+        negative = [pk for pk, balance in balances.items() if balance < 0]
+        spent = sum(options['balance'] - balance for balance in balances.values())
+
+        checks = {
+            'claims <= max_claims': claim_rows <= lead.max_claims,
+            'total_claims matches claim rows': lead.total_claims == claim_rows,
+            'successful claims match claim rows': outcomes['claimed'] == claim_rows,
+            'no negative balance': not negative,
+            'credits spent match claim rows': spent == claim_rows,
+        }
+
+        self.stdout.write(f"Claims attempted: {len(results)} with {options['workers']} workers in {elapsed:.3f}s")
+        self.stdout.write(f"Throughput: {len(results) / elapsed:.1f} claims/s")
+        self.stdout.write(
+            f"Latency: p50 {_percentile(latencies, 50) * 1000:.1f}ms, "
+            f"p99 {_percentile(latencies, 99) * 1000:.1f}ms, "
+            f"max {latencies[-1] * 1000:.1f}ms"
+        )
+        for outcome, count in outcomes.most_common():
+            self.stdout.write(f"  {outcome}: {count}")
+
+        for name, passed in checks.items():
+            style = self.style.SUCCESS if passed else self.style.ERROR
+            self.stdout.write(style(f"{'PASS' if passed else 'FAIL'} {name}"))
+
+        if not all(checks.values()):
+            raise CommandError('Claim benchmark found a correctness violation.')
@@ -0,0 +1,22 @@
+import logging
+from django.core.management.base import BaseCommand
+from leads.utils.dedupe import backfill_fingerprints, collapse_duplicates
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Backfill lead fingerprints (phone, booking date, requested artist) and soft-delete duplicate leads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Leads per fingerprint bulk_update')
+        parser.add_argument('--dry-run', action='store_true', help='Report duplicates without deleting them')
+
+    def handle(self, *args, **options):
+        filled = backfill_fingerprints(batch_size=options['batch_size'])
+        self.stdout.write(f'Fingerprinted {filled} leads.')
+
+        groups, collapsed = collapse_duplicates(dry_run=options['dry_run'])
+        logger.info(f"Lead dedupe: {groups} duplicate groups, {len(collapsed)} leads collapsed (dry_run={options['dry_run']})")
+
+        verb = 'Would collapse' if options['dry_run'] else 'Collapsed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(collapsed)} duplicate leads across {groups} groups.'))
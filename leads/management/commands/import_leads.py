@@ -0,0 +1,55 @@
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from leads.utils.importer import LeadImporter, IMPORT_FORMATS, DEFAULT_CHUNK_SIZE, detect_format
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Import leads from a CSV or JSONL file in chunks, deduping on phone number'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file to import')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--source', help="Lead source for rows without one (e.g. 'instagram', 'referral')")
+        parser.add_argument('--created-by', help='Username recorded as created_by')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Leads per bulk_create')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and dedupe without writing')
+        parser.add_argument('--verified', action='store_true',
+                            help='Mark the imported leads verified so they go straight to the artist feed')
+
+    def handle(self, *args, **options):
+        created_by = None
+        if options['created_by']:
+            created_by = User.objects.filter(username=options['created_by']).first()
+            if created_by is None:
+                raise CommandError(f"User '{options['created_by']}' not found.")
+
+        fmt = options['format'] or detect_format(options['path'])
+        importer = LeadImporter(
+            created_by=created_by,
+            source=options['source'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            verified=options['verified'],
+        )
+
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = importer.run(stream, fmt)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in report['errors']:
+            self.stdout.write(f"  row {error['row']} {error['field']}: {error['error']}")
+        if report['errors_truncated']:
+            self.stdout.write(f"  ... {report['invalid'] - len(report['errors'])} more invalid rows")
+        for message, count in report['error_summary'].items():
+            self.stdout.write(self.style.WARNING(f"{count} x {message}"))
+
+        logger.info(f"Lead import from {options['path']}: {report}")
+        verb = 'Would create' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['created']} leads from {report['rows']} rows "
+            f"({report['duplicates']} duplicates, {report['invalid']} invalid)."
+        ))
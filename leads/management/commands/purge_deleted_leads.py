@@ -0,0 +1,27 @@
+import logging
+from django.core.management.base import BaseCommand
+from leads.utils.deletion import purge_deleted_leads
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Hard-delete leads that were soft-deleted more than --days ago, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='Only purge leads deleted more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=500, help='Leads deleted per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many leads would be purged')
+
+    def handle(self, *args, **options):
+        purged = purge_deleted_leads(
+            older_than_days=options['days'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{purged} soft-deleted leads would be purged.'))
+            return
+
+        logger.info(f"Purged {purged} soft-deleted leads older than {options['days']} days")
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} soft-deleted leads.'))
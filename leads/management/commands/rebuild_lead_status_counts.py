@@ -0,0 +1,21 @@
+import logging
+from django.core.management.base import BaseCommand
+from leads.models.status_count import LeadStatusCount
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Verify the lead status counters against the lead tables and repair drifted rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted counter rows')
+
+    def handle(self, *args, **options):
+        drifted = LeadStatusCount.rebuild(dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{drifted} status counter rows have drifted (dry run, nothing changed).'))
+            return
+
+        logger.info(f"Lead status counters rebuilt: {drifted} rows repaired")
+        self.stdout.write(self.style.SUCCESS(f'Lead status counters rebuilt. {drifted} rows repaired.'))
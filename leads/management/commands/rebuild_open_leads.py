@@ -0,0 +1,21 @@
+import logging
+from django.core.management.base import BaseCommand
+from leads.models.open_lead import OpenLead
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Resync the open-lead feed index with the lead table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows inserted per bulk_create')
+
+    def handle(self, *args, **options):
+        added, removed = OpenLead.rebuild(batch_size=options['batch_size'])
+        logger.info(f"Open lead index rebuilt: {added} added, {removed} removed")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Open lead index rebuilt. {added} leads added, {removed} stale entries removed.'
+            )
+        )
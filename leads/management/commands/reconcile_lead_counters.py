@@ -0,0 +1,38 @@
+import logging
+from django.core.management.base import BaseCommand
+from leads.models.open_lead import OpenLead
+from leads.utils.counters import reconcile_lead_counters, reconcile_my_claimed_leads
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Repair drift in the lead claim/booking counters and artist my_claimed_leads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Leads checked per chunk')
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted rows')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        drifted = reconcile_lead_counters(batch_size=options['batch_size'], dry_run=dry_run)
+        artists_drifted = reconcile_my_claimed_leads(dry_run=dry_run)
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f'{drifted} leads and {artists_drifted} artists have drifted counters (dry run, nothing changed).'
+            ))
+            return
+
+        # counters drive open-lead membership, so resync the feed index too
+        added, removed = OpenLead.rebuild()
+        logger.info(
+            f"Lead counters reconciled: {drifted} leads, {artists_drifted} artists repaired, "
+            f"open index +{added}/-{removed}"
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Lead counters reconciled. {drifted} leads and {artists_drifted} artists repaired, '
+                f'open index {added} added / {removed} removed.'
+            )
+        )
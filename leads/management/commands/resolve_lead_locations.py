@@ -0,0 +1,57 @@
+import logging
+from django.core.management.base import BaseCommand
+from leads.models.models import Lead
+from leads.utils.locations import LocationResolver, has_coordinates
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Resolve free-text lead locations to Location rows for indexed city and radius queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Leads updated per bulk_update')
+        parser.add_argument('--all', action='store_true', help='Re-resolve leads that already have a location')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        resolver = LocationResolver()
+
+        leads = Lead.objects.exclude(location__isnull=True).exclude(location='')
+        if not options['all']:
+            leads = leads.filter(resolved_location__isnull=True)
+
+        resolved = unresolved = without_coordinates = 0
+        last_id = 0
+        while True:
+            batch = list(leads.filter(pk__gt=last_id).order_by('pk').only('id', 'location', 'resolved_location')[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].pk
+
+            changed = []
+            for lead in batch:
+                location = resolver.resolve(lead.location)
+                if location is None:
+                    unresolved += 1
+                    continue
+                if not has_coordinates(location):
+                    # matches by city, but never by radius
+                    without_coordinates += 1
+                if lead.resolved_location_id != location.id:
+                    lead.resolved_location = location
+                    changed.append(lead)
+            if changed:
+                Lead.objects.bulk_update(changed, ['resolved_location'])
+                resolved += len(changed)
+
+        logger.info(
+            f"Lead locations resolved: {resolved}, unresolved: {unresolved}, without coordinates: {without_coordinates}"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Resolved {resolved} lead locations. {unresolved} could not be matched to a city.')
+        )
+        if without_coordinates:
+            self.stdout.write(self.style.WARNING(
+                f'{without_coordinates} leads matched a city whose Location has no coordinates; '
+                f'they will not show up in near-me searches until lat/lng are set.'
+            ))
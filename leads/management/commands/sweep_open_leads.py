@@ -0,0 +1,31 @@
+import logging
+from django.core.management.base import BaseCommand
+from leads.models.open_lead import OpenLead
+from leads.utils.locks import advisory_lock
+
+logger = logging.getLogger(__name__)
+
+SWEEP_LOCK_NAME = 'leads.sweep_open_leads'
+
+class Command(BaseCommand):
+    help = 'Drop leads that aged out of the active window, or were booked, from the open-lead feed index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Index rows removed per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would be removed')
+
+    def handle(self, *args, **options):
+        with advisory_lock(SWEEP_LOCK_NAME) as acquired:
+            if not acquired:
+                logger.info("Open lead sweep skipped: another node holds the lock")
+                self.stdout.write(self.style.WARNING('Another sweep is running; nothing done.'))
+                return
+
+            removed = OpenLead.sweep(batch_size=options['batch_size'], dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{removed} stale open-lead entries would be removed.'))
+            return
+
+        logger.info(f"Open lead sweep removed {removed} entries")
+        self.stdout.write(self.style.SUCCESS(f'Open lead sweep done. {removed} stale entries removed.'))
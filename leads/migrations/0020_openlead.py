@@ -0,0 +1,46 @@
+# Generated by Django 4.2.23 on 2026-10-18 12:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_open_leads(apps, schema_editor):
+    Lead = apps.get_model('leads', 'Lead')
+    OpenLead = apps.get_model('leads', 'OpenLead')
+
+    open_leads = (
+        Lead.objects
+        .filter(is_deleted=False, is_verified=True, booked_artists__isnull=True)
+        .annotate(claims=models.Count('claimed_artists'))
+        .filter(claims__lt=models.F('max_claims'))
+        .values_list('id', 'created_at')
+    )
+    batch = []
+    for lead_id, created_at in open_leads.iterator(chunk_size=1000):
+        batch.append(OpenLead(lead_id=lead_id, created_at=created_at))
+        if len(batch) >= 1000:
+            OpenLead.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        OpenLead.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0019_lead_is_verified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpenLead',
+            fields=[
+                ('lead', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='open_entry', serialize=False, to='leads.lead')),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at', 'lead'], name='leads_openlead_feed_idx')],
+            },
+        ),
+        migrations.RunPython(populate_open_leads, migrations.RunPython.noop),
+    ]
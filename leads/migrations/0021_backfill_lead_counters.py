@@ -0,0 +1,48 @@
+# Generated manually to backfill total_claims / total_bookings from the M2M tables
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_lead_counters(apps, schema_editor):
+    Lead = apps.get_model('leads', 'Lead')
+    OpenLead = apps.get_model('leads', 'OpenLead')
+
+    def relation_count(through):
+        return Coalesce(
+            models.Subquery(
+                through.objects
+                .filter(lead_id=models.OuterRef('pk'))
+                .order_by()
+                .values('lead_id')
+                .annotate(c=models.Count('*'))
+                .values('c')
+            ),
+            models.Value(0),
+        )
+
+    Lead.objects.update(
+        total_claims=relation_count(Lead.claimed_artists.through),
+        total_bookings=relation_count(Lead.booked_artists.through),
+    )
+
+    # open-lead membership is now derived from the counters
+    OpenLead.objects.exclude(
+        lead_id__in=Lead.objects.filter(
+            is_deleted=False,
+            is_verified=True,
+            total_bookings=0,
+            total_claims__lt=models.F('max_claims'),
+        ).values('id')
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0020_openlead'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_lead_counters, migrations.RunPython.noop),
+    ]
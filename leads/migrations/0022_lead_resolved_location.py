@@ -0,0 +1,20 @@
+# Generated by Django 4.2.23 on 2026-10-18 12:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0042_location_indexes'),
+        ('leads', '0021_backfill_lead_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='resolved_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='leads', to='artists.location'),
+        ),
+    ]
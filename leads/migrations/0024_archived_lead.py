@@ -0,0 +1,69 @@
+# Generated by Django 4.2.23 on 2026-10-18 14:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0017_subscriptionplan_claim_amount_limit'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('artists', '0042_location_indexes'),
+        ('leads', '0023_lead_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedLead',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('first_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('last_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('phone', models.CharField(blank=True, max_length=15, null=True)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('event_type', models.CharField(blank=True, max_length=20, null=True)),
+                ('requirements', models.TextField(blank=True)),
+                ('booking_date', models.DateField()),
+                ('makeup_type_ids', models.JSONField(blank=True, default=list)),
+                ('location', models.CharField(blank=True, max_length=100, null=True)),
+                ('source', models.CharField(blank=True, max_length=50, null=True)),
+                ('max_claims', models.PositiveIntegerField(default=5)),
+                ('status', models.CharField(max_length=20)),
+                ('last_contact', models.DateTimeField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('is_verified', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('total_bookings', models.IntegerField(default=0)),
+                ('total_claims', models.IntegerField(default=0)),
+                ('fingerprint', models.CharField(blank=True, max_length=32, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='artists.artistprofile')),
+                ('budget_range', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='adminpanel.budgetrange')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('requested_artist', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='artists.artistprofile')),
+                ('resolved_location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='artists.location')),
+                ('service', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='adminpanel.service')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedLeadArtist',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('relation', models.CharField(choices=[('claimed', 'Claimed'), ('booked', 'Booked')], max_length=10)),
+                ('artist', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='artists.artistprofile')),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='artist_relations', to='leads.archivedlead')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['lead', 'relation'], name='leads_archived_rel_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedlead',
+            index=models.Index(fields=['created_at', 'id'], name='leads_archived_created_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated manually to index the lead hot paths and the claim/booking tables
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Auto-created M2M tables cannot declare Meta.indexes. Their unique
+# (lead_id, artistprofile_id) constraint covers lookups by lead; the
+# (artistprofile_id, lead_id) index answers "leads of this artist" from the
+# index alone and replaces the single-column artistprofile_id FK index.
+THROUGH_INDEXES = [
+    ('claimed_artists', 'leads_claimed_artist_idx', 'leads_claimed_artist_fk_idx'),
+    ('booked_artists', 'leads_booked_artist_idx', 'leads_booked_artist_fk_idx'),
+]
+
+
+def _through(apps, field_name):
+    return apps.get_model('leads', 'Lead')._meta.get_field(field_name).remote_field.through
+
+
+def _artist_fk_indexes(schema_editor, through):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, through._meta.db_table)
+    return [
+        name for name, info in constraints.items()
+        if info['index'] and not info['unique'] and not info['primary_key'] and info['columns'] == ['artistprofile_id']
+    ]
+
+
+def add_through_indexes(apps, schema_editor):
+    for field_name, index_name, _ in THROUGH_INDEXES:
+        through = _through(apps, field_name)
+        schema_editor.add_index(through, models.Index(fields=['artistprofile', 'lead'], name=index_name))
+        for name in _artist_fk_indexes(schema_editor, through):
+            schema_editor.remove_index(through, models.Index(fields=['artistprofile'], name=name))
+
+
+def remove_through_indexes(apps, schema_editor):
+    for field_name, index_name, fk_index_name in THROUGH_INDEXES:
+        through = _through(apps, field_name)
+        # the FK needs an index on artistprofile_id before the composite goes
+        schema_editor.add_index(through, models.Index(fields=['artistprofile'], name=fk_index_name))
+        schema_editor.remove_index(through, models.Index(fields=['artistprofile', 'lead'], name=index_name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0042_location_indexes'),
+        ('leads', '0024_archived_lead'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['is_deleted', 'is_verified', 'created_at'], name='leads_lead_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['assigned_to', 'is_deleted', 'status'], name='leads_lead_assignee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['status', 'is_deleted', 'created_at'], name='leads_lead_status_idx'),
+        ),
+        # leads_lead_assignee_idx leads with assigned_to, so the FK index is redundant
+        migrations.AlterField(
+            model_name='lead',
+            name='assigned_to',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_leads', to='artists.artistprofile'),
+        ),
+        migrations.RunPython(add_through_indexes, remove_through_indexes),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.23 on 2026-10-18 15:02
+
+from collections import Counter
+from django.db import migrations, models
+from django.db.models.functions import Lower, TruncDate
+
+
+def backfill_status_counts(apps, schema_editor):
+    LeadStatusCount = apps.get_model('leads', 'LeadStatusCount')
+    counts = Counter()
+    for model_name in ('Lead', 'ArchivedLead'):
+        grouped = (
+            apps.get_model('leads', model_name).objects
+            .filter(is_deleted=False)
+            .annotate(status_key=Lower('status'), day=TruncDate('created_at'))
+            .values('status_key', 'day', 'source')
+            .annotate(total=models.Count('id'))
+            .order_by()
+        )
+        for row in grouped:
+            counts[(row['status_key'] or '', row['day'], row['source'] or '')] += row['total']
+    LeadStatusCount.objects.bulk_create([
+        LeadStatusCount(status=status, day=day, source=source, count=total)
+        for (status, day, source), total in counts.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0025_lead_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('day', models.DateField()),
+                ('source', models.CharField(blank=True, default='', max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='leadstatuscount',
+            constraint=models.UniqueConstraint(fields=('status', 'day', 'source'), name='leads_status_count_key'),
+        ),
+        migrations.RunPython(backfill_status_counts, migrations.RunPython.noop),
+    ]
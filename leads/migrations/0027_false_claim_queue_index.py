@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0026_lead_status_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='falseleadclaim',
+            index=models.Index(fields=['status', 'created_at'], name='leads_falseclaim_queue_idx'),
+        ),
+    ]
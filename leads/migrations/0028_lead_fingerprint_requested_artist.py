@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:48
+
+from django.db import migrations, models
+from django.db.models.functions import Cast, Concat
+
+
+def append_requested_artist(apps, schema_editor):
+    # artist-directed leads now fingerprint as phone:date:a<artist id>
+    Lead = apps.get_model('leads', 'Lead')
+    Lead.objects.filter(fingerprint__isnull=False, requested_artist__isnull=False).update(
+        fingerprint=Concat(
+            models.F('fingerprint'), models.Value(':a'), Cast('requested_artist_id', models.CharField()),
+            output_field=models.CharField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0027_false_claim_queue_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedlead',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=48, null=True),
+        ),
+        migrations.AlterField(
+            model_name='lead',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=48, null=True),
+        ),
+        migrations.RunPython(append_requested_artist, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0028_lead_fingerprint_requested_artist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedlead',
+            name='detail_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='detail_changed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
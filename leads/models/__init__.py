@@ -1,2 +1,5 @@
 from .lead_distribution_rule import LeadDistributionRule, LeadDistributionConfig
 from .false_lead_claim import FalseLeadClaim
+from .open_lead import OpenLead
+from .archive import ArchivedLead, ArchivedLeadArtist
+from .status_count import LeadStatusCount
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.db import models
+from adminpanel.models import BudgetRange, Service
+from artists.models.models import ArtistProfile, Location
+
+
+class ArchivedLead(models.Model):
+    """
+    Lead moved out of leads_lead once it is older than the archive horizon
+    (settings.LEAD_ARCHIVE_HORIZON_DAYS) by the archive_leads command. Keeps
+    the original id, columns and counters; makeup types are kept as ids and
+    claim/booking relations as ArchivedLeadArtist rows.
+    """
+    id = models.IntegerField(primary_key=True)
+
+    first_name = models.CharField(max_length=255, null=True, blank=True)
+    last_name = models.CharField(max_length=100, null=True, blank=True)
+    phone = models.CharField(max_length=15, null=True, blank=True)
+    email = models.EmailField(blank=True, null=True)
+
+    service = models.ForeignKey(Service, on_delete=models.SET_NULL, null=True, related_name='+')
+    event_type = models.CharField(max_length=20, null=True, blank=True)
+    requirements = models.TextField(blank=True)
+    booking_date = models.DateField()
+
+    budget_range = models.ForeignKey(BudgetRange, on_delete=models.SET_NULL, null=True, related_name='+')
+    makeup_type_ids = models.JSONField(default=list, blank=True)
+    location = models.CharField(max_length=100, null=True, blank=True)
+    resolved_location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    source = models.CharField(max_length=50, null=True, blank=True)
+
+    assigned_to = models.ForeignKey(ArtistProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    requested_artist = models.ForeignKey(ArtistProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    max_claims = models.PositiveIntegerField(default=5)
+    status = models.CharField(max_length=20)
+    last_contact = models.DateTimeField(null=True, blank=True)
+    notes = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    is_verified = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    detail_changed_at = models.DateTimeField(null=True, blank=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    is_deleted = models.BooleanField(default=False)
+
+    total_bookings = models.IntegerField(default=0)
+    total_claims = models.IntegerField(default=0)
+    fingerprint = models.CharField(max_length=48, null=True, blank=True)
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='leads_archived_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived lead #{self.id}"
+
+
+class ArchivedLeadArtist(models.Model):
+    """Claim or booking of an archived lead."""
+    RELATION_CHOICES = [
+        ('claimed', 'Claimed'),
+        ('booked', 'Booked'),
+    ]
+
+    lead = models.ForeignKey(ArchivedLead, on_delete=models.CASCADE, related_name='artist_relations')
+    artist = models.ForeignKey(ArtistProfile, on_delete=models.SET_NULL, null=True, related_name='+')
+    relation = models.CharField(max_length=10, choices=RELATION_CHOICES)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['lead', 'relation'], name='leads_archived_rel_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived lead #{self.lead_id} {self.relation} by {self.artist_id}"
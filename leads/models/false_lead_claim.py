@@ -28,6 +28,12 @@ class FalseLeadClaim(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # admin queue: one status tab paged newest first
+            models.Index(fields=['status', 'created_at'], name='leads_falseclaim_queue_idx'),
+        ]
+
     def __str__(self):
         return f"False Claim by {self.artist} on Lead #{self.lead.id} [{self.status}]"
 
@@ -2,8 +2,13 @@ from django.db import models
 from django.conf import settings
 from adminpanel.models import BudgetRange, MakeupType, Service
 from artists.models.models import ArtistProfile, Location
-from django.db.models.signals import post_save, pre_save, post_delete
+from django.db.models import F
+from django.utils import timezone
+from django.db.models.signals import post_save, pre_save, pre_delete, m2m_changed
 from django.dispatch import receiver
+from contextlib import contextmanager
+import contextvars
+import re
 
 class Lead(models.Model):
     EVENT_CHOICES = [
@@ -44,11 +49,16 @@ class Lead(models.Model):
     budget_range = models.ForeignKey(BudgetRange, on_delete=models.SET_NULL, null=True)
     makeup_types = models.ManyToManyField(MakeupType, blank=True)
     location = models.CharField(max_length=100, null=True, blank=True)
+    # location text resolved to a Location row at ingestion (indexed city / lat-lng lookups)
+    resolved_location = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='leads'
+    )
 
     source = models.CharField(max_length=50, choices=SOURCE_CHOICES, null=True, blank=True)
 
+    # indexed by leads_lead_assignee_idx (see Meta)
     assigned_to = models.ForeignKey(
-        ArtistProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name="assigned_leads"
+        ArtistProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name="assigned_leads", db_index=False
     )
     requested_artist = models.ForeignKey(
         ArtistProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name="requested_leads"
@@ -67,83 +77,355 @@ class Lead(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # last change of a related row embedded in the lead detail (leads.utils.lead_detail)
+    detail_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
     is_deleted = models.BooleanField(default=False)
 
     total_bookings = models.IntegerField(default=0)
     total_claims = models.IntegerField(default=0)
 
+    # normalized phone + booking date (+ requested artist), used to spot repeated submissions
+    fingerprint = models.CharField(max_length=48, null=True, blank=True, db_index=True, editable=False)
+
+    # columns whose transitions drive ArtistProfile.my_claimed_leads and LeadStatusCount
+    TRACKED_FIELDS = ('status', 'is_deleted', 'assigned_to_id', 'source')
+
+    class Meta:
+        indexes = [
+            # feed / admin listing: live, verified leads newest first
+            models.Index(fields=['is_deleted', 'is_verified', 'created_at'], name='leads_lead_feed_idx'),
+            # artist dashboards and the my_claimed_leads signal lookups
+            models.Index(fields=['assigned_to', 'is_deleted', 'status'], name='leads_lead_assignee_idx'),
+            # status counts; created_at lets status-filtered listings page off the index
+            models.Index(fields=['status', 'is_deleted', 'created_at'], name='leads_lead_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name or ''} {self.last_name or ''} - {self.phone or ''}"
 
-# store previous assigned_to before save so we can update both old/new artists
+    def save(self, *args, **kwargs):
+        self.fingerprint = lead_fingerprint(self.phone, self.booking_date, self.requested_artist_id)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'phone', 'booking_date', 'requested_artist'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'fingerprint'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember what was loaded so signals can diff without re-fetching the row
+        if all(field in instance.__dict__ for field in cls.TRACKED_FIELDS):
+            instance._loaded_state = instance._tracked_state()
+        return instance
+
+    def _tracked_state(self):
+        return {field: getattr(self, field) for field in self.TRACKED_FIELDS}
+
+def lead_fingerprint(phone, booking_date, requested_artist_id=None):
+    """
+    '+91 98765-43210' booked for 2026-12-01 → '9876543210:2026-12-01'; None
+    without a usable phone. Submissions directed at an artist get the
+    artist id appended ('...:2026-12-01:a42'), so contacting a second
+    artist for the same date is a new lead, not a repeat.
+    """
+    digits = re.sub(r'\D', '', str(phone or ''))
+    if len(digits) < 10 or not booking_date:
+        return None
+    booking = booking_date.isoformat() if hasattr(booking_date, 'isoformat') else str(booking_date)
+    if requested_artist_id:
+        return f"{digits[-10:]}:{booking}:a{requested_artist_id}"
+    return f"{digits[-10:]}:{booking}"
+
+# ------------------------------
+# ArtistProfile.my_claimed_leads delta accounting
+#
+# A lead counts towards an artist while it is "active" (status 'claimed',
+# not deleted) and the artist is one of its claimed_artists or its
+# assigned_to. Instead of recounting every involved artist on each save we
+# diff the state the row was loaded with against the state being written
+# and apply +1/-1 to exactly the artists whose membership changed.
+# leads.utils.counters.reconcile_my_claimed_leads repairs any drift.
+# ------------------------------
+
+_counter_signals_suspended = contextvars.ContextVar('lead_counter_signals_suspended', default=False)
+
+
+@contextmanager
+def suspended_counter_signals():
+    """
+    Skip the per-row counter deltas (my_claimed_leads, status counts) on lead
+    deletes. For bulk paths that settle the counters themselves afterwards.
+    """
+    token = _counter_signals_suspended.set(True)
+    try:
+        yield
+    finally:
+        _counter_signals_suspended.reset(token)
+
+
+def counter_signals_suspended():
+    return _counter_signals_suspended.get()
+
+
+def _is_active_state(state):
+    return bool(state) and state['status'] == 'claimed' and not state['is_deleted']
+
+
+def apply_claimed_lead_deltas(plus_ids=(), minus_ids=()):
+    plus_ids, minus_ids = set(plus_ids) - {None}, set(minus_ids) - {None}
+    # an artist in both sets nets out to zero
+    plus_ids, minus_ids = plus_ids - minus_ids, minus_ids - plus_ids
+    if plus_ids:
+        ArtistProfile.objects.filter(pk__in=plus_ids).update(my_claimed_leads=F('my_claimed_leads') + 1)
+    if minus_ids:
+        ArtistProfile.objects.filter(pk__in=minus_ids).update(my_claimed_leads=F('my_claimed_leads') - 1)
+
+
+def claimed_artist_ids(lead_id):
+    return set(
+        Lead.claimed_artists.through.objects.filter(lead_id=lead_id).values_list('artistprofile_id', flat=True)
+    )
+
+
 @receiver(pre_save, sender='leads.Lead')
 def _lead_pre_save(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            prev = sender.objects.get(pk=instance.pk)
-            instance._prev_assigned_to_id = getattr(prev, 'assigned_to_id', None)
-        except sender.DoesNotExist:
-            instance._prev_assigned_to_id = None
-    else:
-        instance._prev_assigned_to_id = None
+    # state captured in from_db(); only hit the DB for rows loaded with deferred fields
+    instance._prev_state = getattr(instance, '_loaded_state', None)
+    if instance._prev_state is None and instance.pk and not instance._state.adding:
+        instance._prev_state = (
+            sender.objects.filter(pk=instance.pk).values(*Lead.TRACKED_FIELDS).first()
+        )
+
 
 @receiver(post_save, sender='leads.Lead')
 def _lead_post_save(sender, instance, created, **kwargs):
-    # Update my_claimed_leads count on ArtistProfile for claimed_artists
-    for artist in instance.claimed_artists.all():
-        try:
-            count = sender.objects.filter(
-                claimed_artists=artist, status='claimed', is_deleted=False
-            ).count()
-            if artist.my_claimed_leads != count:
-                artist.my_claimed_leads = count
-                artist.save(update_fields=['my_claimed_leads'])
-        except ArtistProfile.DoesNotExist:
-            continue
-
-    # Update my_claimed_leads count for previous assigned_to if changed
-    prev_id = getattr(instance, '_prev_assigned_to_id', None)
-    curr_id = getattr(instance, 'assigned_to_id', None)
-    for artist_id in {prev_id, curr_id}:
-        if not artist_id:
-            continue
-        try:
-            artist = ArtistProfile.objects.get(pk=artist_id)
-            count = sender.objects.filter(
-                assigned_to_id=artist_id, status='claimed', is_deleted=False
-            ).count()
-            if artist.my_claimed_leads != count:
-                artist.my_claimed_leads = count
-                artist.save(update_fields=['my_claimed_leads'])
-        except ArtistProfile.DoesNotExist:
-            continue
-
-@receiver(post_delete, sender='leads.Lead')
-def _lead_post_delete(sender, instance, **kwargs):
-    # Update my_claimed_leads count on ArtistProfile for claimed_artists
-    for artist in instance.claimed_artists.all():
-        try:
-            count = sender.objects.filter(
-                claimed_artists=artist, status='claimed', is_deleted=False
-            ).count()
-            if artist.my_claimed_leads != count:
-                artist.my_claimed_leads = count
-                artist.save(update_fields=['my_claimed_leads'])
-        except ArtistProfile.DoesNotExist:
-            continue
-
-    # Update my_claimed_leads count for assigned_to
-    artist_id = getattr(instance, 'assigned_to_id', None)
-    if not artist_id:
+    prev = getattr(instance, '_prev_state', None)
+    curr = instance._tracked_state()
+    instance._loaded_state = curr
+
+    if not created:
+        from leads.utils.lead_detail import invalidate_lead_detail
+        invalidate_lead_detail([instance.pk])
+
+    if prev != curr:
+        from leads.utils.dashboard import invalidate_artist_dashboards
+        invalidate_artist_dashboards([prev['assigned_to_id'] if prev else None, curr['assigned_to_id']])
+
+    was_active, now_active = _is_active_state(prev), _is_active_state(curr)
+    prev_assigned = prev['assigned_to_id'] if prev else None
+    curr_assigned = curr['assigned_to_id']
+
+    if not was_active and not now_active:
         return
-    try:
-        artist = ArtistProfile.objects.get(pk=artist_id)
-        count = sender.objects.filter(
-            assigned_to_id=artist_id, status='claimed', is_deleted=False
-        ).count()
-        if artist.my_claimed_leads != count:
-            artist.my_claimed_leads = count
-            artist.save(update_fields=['my_claimed_leads'])
-    except ArtistProfile.DoesNotExist:
-        pass
+
+    if was_active and now_active:
+        if prev_assigned == curr_assigned:
+            return
+        # only the assignee changed; claimants keep counting either way
+        claimed = claimed_artist_ids(instance.pk)
+        apply_claimed_lead_deltas(
+            plus_ids=[curr_assigned] if curr_assigned not in claimed else [],
+            minus_ids=[prev_assigned] if prev_assigned not in claimed else [],
+        )
+        return
+
+    claimed = claimed_artist_ids(instance.pk)
+    if now_active:
+        apply_claimed_lead_deltas(plus_ids=claimed | {curr_assigned})
+    else:
+        apply_claimed_lead_deltas(minus_ids=claimed | {prev_assigned})
+
+
+@receiver(pre_delete, sender='leads.Lead')
+def _lead_pre_delete(sender, instance, **kwargs):
+    if counter_signals_suspended():
+        return
+    # through rows are gone by post_delete, so release the lead here
+    state = getattr(instance, '_loaded_state', None) or instance._tracked_state()
+    if not state['is_deleted']:
+        from leads.utils.dashboard import invalidate_artist_dashboards
+        invalidate_artist_dashboards([state['assigned_to_id']])
+    if _is_active_state(state):
+        apply_claimed_lead_deltas(minus_ids=claimed_artist_ids(instance.pk) | {state['assigned_to_id']})
+
+
+# ------------------------------
+# total_claims / total_bookings counters
+# ------------------------------
+
+def _sync_relation_counter(instance, action, reverse, pk_set, counter_field, forward_accessor, reverse_accessor):
+    """
+    Apply claimed/booked M2M changes to the Lead counter column with an
+    atomic F() update. Works from both sides of the relation:
+    lead.claimed_artists.add(artist) and artist.claimed_leads.add(lead).
+    """
+    related = getattr(instance, reverse_accessor if reverse else forward_accessor)
+
+    if action == 'pre_remove':
+        # remove() reports the requested ids, keep only real members
+        instance._counter_removed_ids = set(related.filter(pk__in=pk_set).values_list('pk', flat=True))
+        return
+    if action == 'pre_clear':
+        # clear() sends no pk_set, remember what is about to go
+        instance._counter_removed_ids = set(related.values_list('pk', flat=True))
+        return
+
+    if action == 'post_add':
+        # Django only reports ids that were actually inserted
+        changed_ids, delta = pk_set or set(), 1
+    elif action in ('post_remove', 'post_clear'):
+        changed_ids, delta = getattr(instance, '_counter_removed_ids', set()), -1
+        instance._counter_removed_ids = set()
+    else:
+        return
+
+    if not changed_ids:
+        return
+
+    if reverse:
+        # instance is an ArtistProfile, changed_ids are lead ids
+        Lead.objects.filter(pk__in=changed_ids).update(**{counter_field: F(counter_field) + delta})
+    else:
+        step = delta * len(changed_ids)
+        Lead.objects.filter(pk=instance.pk).update(**{counter_field: F(counter_field) + step})
+        # keep the in-memory row in step so a later save() doesn't write a stale value
+        setattr(instance, counter_field, (getattr(instance, counter_field) or 0) + step)
+
+
+@receiver(m2m_changed, sender=Lead.claimed_artists.through)
+def _lead_claims_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        # read before _sync_relation_counter resets the stash
+        changed_ids = pk_set if action == 'post_add' else getattr(instance, '_counter_removed_ids', set())
+        _sync_claimed_lead_membership(instance, action, reverse, set(changed_ids or ()))
+    _sync_relation_counter(instance, action, reverse, pk_set, 'total_claims', 'claimed_artists', 'claimed_leads')
+
+
+def _sync_claimed_lead_membership(instance, action, reverse, changed_ids):
+    """my_claimed_leads delta for artists added to / removed from claimed_artists."""
+    if not changed_ids:
+        return
+    delta = 1 if action == 'post_add' else -1
+
+    if reverse:
+        # instance is an ArtistProfile, changed_ids are lead ids
+        step = (
+            Lead.objects
+            .filter(pk__in=changed_ids, status='claimed', is_deleted=False)
+            .exclude(assigned_to_id=instance.pk)
+            .count()
+        ) * delta
+        if step:
+            ArtistProfile.objects.filter(pk=instance.pk).update(my_claimed_leads=F('my_claimed_leads') + step)
+        return
+
+    # the assignee already counts this lead, so their claim changes nothing
+    if _is_active_state(instance._tracked_state()):
+        artist_ids = changed_ids - {instance.assigned_to_id}
+        if delta > 0:
+            apply_claimed_lead_deltas(plus_ids=artist_ids)
+        else:
+            apply_claimed_lead_deltas(minus_ids=artist_ids)
+
+
+@receiver(m2m_changed, sender=Lead.booked_artists.through)
+def _lead_bookings_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _sync_relation_counter(instance, action, reverse, pk_set, 'total_bookings', 'booked_artists', 'booked_leads')
+
+
+@receiver(pre_delete, sender=ArtistProfile)
+def _artist_pre_delete_release_counters(sender, instance, **kwargs):
+    # through rows cascade without m2m_changed, so release the counters here
+    claimed = Lead.claimed_artists.through.objects.filter(artistprofile_id=instance.pk).values('lead_id')
+    Lead.objects.filter(pk__in=claimed).update(total_claims=F('total_claims') - 1)
+    booked = Lead.booked_artists.through.objects.filter(artistprofile_id=instance.pk).values('lead_id')
+    Lead.objects.filter(pk__in=booked).update(total_bookings=F('total_bookings') - 1)
+
+
+# ------------------------------
+# Lead detail validators: embedded related rows
+#
+# LeadDetailSerializer embeds these fields of related rows. When a saved
+# row's values for them actually differ from the stored ones (or the row
+# is deleted), detail_changed_at is stamped on the live leads that embed
+# it, which changes just those leads' ETags. Saves that only touch other
+# fields (counters, OTP flags, last_login) cost no lead writes.
+# ------------------------------
+
+LEAD_DETAIL_RELATED_FIELDS = {
+    Service: ('name', 'description'),
+    BudgetRange: ('label', 'min_value', 'max_value'),
+    MakeupType: ('name', 'description'),
+    ArtistProfile: ('first_name', 'last_name', 'phone'),
+    settings.AUTH_USER_MODEL: ('first_name', 'last_name', 'email', 'phone'),
+}
+
+
+def _detail_fields(sender):
+    return LEAD_DETAIL_RELATED_FIELDS.get(sender) or LEAD_DETAIL_RELATED_FIELDS.get(sender._meta.label)
+
+
+def _leads_embedding(sender, pk):
+    """Live leads whose detail payload shows this related row."""
+    if sender is Service:
+        leads = Lead.objects.filter(service_id=pk)
+    elif sender is BudgetRange:
+        leads = Lead.objects.filter(budget_range_id=pk)
+    elif sender is MakeupType:
+        leads = Lead.objects.filter(pk__in=Lead.makeup_types.through.objects.filter(makeuptype_id=pk).values('lead_id'))
+    elif sender is ArtistProfile:
+        claimed = Lead.claimed_artists.through.objects.filter(artistprofile_id=pk).values('lead_id')
+        booked = Lead.booked_artists.through.objects.filter(artistprofile_id=pk).values('lead_id')
+        leads = Lead.objects.filter(
+            models.Q(assigned_to_id=pk) | models.Q(requested_artist_id=pk) | models.Q(pk__in=claimed) | models.Q(pk__in=booked)
+        )
+    else:
+        leads = Lead.objects.filter(created_by_id=pk)
+    return leads.filter(is_deleted=False)
+
+
+def touch_lead_details(leads):
+    leads.update(detail_changed_at=timezone.now())
+
+
+@receiver(pre_save)
+def _lead_detail_related_pre_save(sender, instance, update_fields=None, **kwargs):
+    fields = _detail_fields(sender)
+    if fields is None or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+    stored = sender.objects.filter(pk=instance.pk).values(*fields).first() if fields else None
+    instance._lead_detail_changed = bool(stored) and any(
+        stored[field] != getattr(instance, field) for field in fields
+    )
+
+
+@receiver(post_save)
+def _lead_detail_related_saved(sender, instance, created, **kwargs):
+    if getattr(instance, '_lead_detail_changed', False):
+        instance._lead_detail_changed = False
+        touch_lead_details(_leads_embedding(sender, instance.pk))
+
+
+@receiver(pre_delete)
+def _lead_detail_related_deleted(sender, instance, **kwargs):
+    if _detail_fields(sender) is not None:
+        touch_lead_details(_leads_embedding(sender, instance.pk))
+
+
+@receiver(m2m_changed, sender=Lead.makeup_types.through)
+def _lead_makeup_types_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            touch_lead_details(Lead.objects.filter(pk=instance.pk))
+        return
+    # changed from the makeup type side: pk_set holds lead ids
+    if action == 'pre_clear':
+        # clear() sends no pk_set, remember the leads before the rows go
+        instance._lead_detail_cleared_ids = list(sender.objects.filter(makeuptype_id=instance.pk).values_list('lead_id', flat=True))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        touch_lead_details(Lead.objects.filter(pk__in=pk_set))
+    elif action == 'post_clear':
+        touch_lead_details(Lead.objects.filter(pk__in=getattr(instance, '_lead_detail_cleared_ids', [])))
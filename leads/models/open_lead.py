@@ -0,0 +1,166 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from leads.models.models import Lead
+from leads.utils.realtime import LEAD_CLOSED, LEAD_OPENED, publish_lead_events
+
+OPEN_LEADS_VERSION_KEY = 'open_leads_version'
+
+
+class OpenLead(models.Model):
+    """
+    Maintained index of leads artists can still claim: verified, not deleted,
+    not booked, below max_claims and created within the active window
+    (LEAD_OPEN_WINDOW_DAYS). The artist feed reads this table instead of
+    re-filtering the whole lead table on every poll. Saves keep single rows
+    in step; leads ageing out of the window are dropped by sweep()
+    (sweep_open_leads command, run from cron).
+    """
+    lead = models.OneToOneField(Lead, on_delete=models.CASCADE, primary_key=True, related_name='open_entry')
+
+    # copy of lead.created_at so the feed can range scan this table alone
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'lead'], name='leads_openlead_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"Open lead #{self.lead_id}"
+
+    @staticmethod
+    def window_start():
+        """Leads created before this moment have aged out of the feed."""
+        return timezone.now() - timedelta(days=settings.LEAD_OPEN_WINDOW_DAYS)
+
+    @staticmethod
+    def is_lead_open(lead):
+        return (
+            not lead.is_deleted
+            and lead.is_verified
+            and lead.total_bookings == 0
+            and lead.total_claims < lead.max_claims
+            and lead.created_at >= OpenLead.window_start()
+        )
+
+    @staticmethod
+    def open_leads_queryset():
+        """Source-of-truth query for the set of open leads."""
+        return Lead.objects.filter(
+            is_deleted=False,
+            is_verified=True,
+            total_bookings=0,
+            total_claims__lt=F('max_claims'),
+            created_at__gte=OpenLead.window_start(),
+        )
+
+    @staticmethod
+    def current_version():
+        """Version stamp of the open-lead set; caches derived from it key on this."""
+        return cache.get_or_set(OPEN_LEADS_VERSION_KEY, 1, None)
+
+    @staticmethod
+    def bump_version():
+        # bump after commit so nobody caches pre-commit state under the new version
+        def _bump():
+            try:
+                cache.incr(OPEN_LEADS_VERSION_KEY)
+            except ValueError:
+                cache.set(OPEN_LEADS_VERSION_KEY, 1, None)
+        transaction.on_commit(_bump)
+
+    @classmethod
+    def refresh_for(cls, lead):
+        """
+        Add or remove a single lead from the index.
+        Returns 'opened', 'closed' or None when membership did not change.
+        """
+        if cls.is_lead_open(lead):
+            _, created = cls.objects.get_or_create(lead_id=lead.pk, defaults={'created_at': lead.created_at})
+            change = LEAD_OPENED if created else None
+        else:
+            deleted, _ = cls.objects.filter(lead_id=lead.pk).delete()
+            change = LEAD_CLOSED if deleted else None
+
+        if change:
+            cls.bump_version()
+            publish_lead_events(change, [(lead.pk, lead.resolved_location_id)])
+        return change
+
+    @classmethod
+    def stale_entries(cls):
+        """Index rows whose lead is no longer open (aged out, booked, full, deleted or unverified)."""
+        return cls.objects.filter(
+            Q(created_at__lt=cls.window_start())
+            | Q(lead__is_deleted=True)
+            | Q(lead__is_verified=False)
+            | Q(lead__total_bookings__gt=0)
+            | Q(lead__total_claims__gte=F('lead__max_claims'))
+        )
+
+    @classmethod
+    def sweep(cls, batch_size=1000, dry_run=False):
+        """
+        Drop stale index rows in chunks of batch_size, one short transaction
+        per chunk. Idempotent: a second run right after finds nothing.
+        Returns the number of rows removed (or that would be, with dry_run).
+        """
+        stale = cls.stale_entries()
+        if dry_run:
+            return stale.count()
+
+        removed = 0
+        while True:
+            with transaction.atomic():
+                batch = list(stale.values_list('lead_id', 'lead__resolved_location_id')[:batch_size])
+                if not batch:
+                    break
+                deleted, _ = cls.objects.filter(lead_id__in=[lead_id for lead_id, _ in batch]).delete()
+                cls.bump_version()
+                publish_lead_events(LEAD_CLOSED, batch)
+            removed += deleted
+        return removed
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """
+        Set-based resync of the whole index, used after bulk UPDATEs that
+        bypass model signals and by the rebuild_open_leads command.
+        Returns (added, removed).
+        """
+        open_ids = cls.open_leads_queryset().values('id')
+        removed, _ = cls.objects.exclude(lead_id__in=open_ids).delete()
+
+        missing = (
+            cls.open_leads_queryset()
+            .filter(open_entry__isnull=True)
+            .values_list('id', 'created_at')
+        )
+        added = 0
+        batch = []
+        for lead_id, created_at in missing.iterator(chunk_size=batch_size):
+            batch.append(cls(lead_id=lead_id, created_at=created_at))
+            if len(batch) >= batch_size:
+                cls.objects.bulk_create(batch, ignore_conflicts=True)
+                added += len(batch)
+                batch = []
+        if batch:
+            cls.objects.bulk_create(batch, ignore_conflicts=True)
+            added += len(batch)
+
+        if added or removed:
+            cls.bump_version()
+        return added, removed
+
+
+@receiver(post_save, sender='leads.Lead')
+def _lead_refresh_open_entry(sender, instance, **kwargs):
+    # claim/book views add to the M2M before saving the lead, so the
+    # relation state is already current here
+    OpenLead.refresh_for(instance)
@@ -0,0 +1,146 @@
+from collections import Counter
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Lower, TruncDate
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from leads.models.archive import ArchivedLead
+from leads.models.models import Lead, counter_signals_suspended
+
+
+def status_count_key(status, created_at, source):
+    """Counter row a lead belongs to: (lowercased status, creation day, source or '')."""
+    return (status or '').lower(), timezone.localtime(created_at).date(), source or ''
+
+
+class LeadStatusCount(models.Model):
+    """
+    Number of non-deleted leads (live and archived) per status, creation day
+    and source. Kept in step by the lead save/delete signals below and by
+    the bulk lead paths via apply(); rebuild() recomputes it from the lead
+    tables (rebuild_lead_status_counts command).
+    """
+    status = models.CharField(max_length=20)
+    day = models.DateField()
+    source = models.CharField(max_length=50, blank=True, default='')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['status', 'day', 'source'], name='leads_status_count_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.status} {self.day} {self.source or '-'}: {self.count}"
+
+    @classmethod
+    def apply(cls, deltas):
+        """Add {(status, day, source): delta} to the counters, creating rows as needed."""
+        for (status, day, source), delta in deltas.items():
+            if not delta:
+                continue
+            rows = cls.objects.filter(status=status, day=day, source=source)
+            if rows.update(count=F('count') + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(status=status, day=day, source=source, count=delta)
+            except IntegrityError:
+                # created concurrently since the UPDATE
+                rows.update(count=F('count') + delta)
+
+    @classmethod
+    def totals(cls, start_day=None, end_day=None, source=None):
+        """{status: count}, optionally limited to a creation-day range and a source."""
+        rows = cls.objects.all()
+        if start_day:
+            rows = rows.filter(day__gte=start_day)
+        if end_day:
+            rows = rows.filter(day__lte=end_day)
+        if source is not None:
+            rows = rows.filter(source=source)
+        return {
+            row['status']: row['total']
+            for row in rows.values('status').annotate(total=Sum('count')).order_by()
+        }
+
+    @staticmethod
+    def actual_counts():
+        """Counter of the source of truth, grouped like the counter rows."""
+        actual = Counter()
+        for queryset in (Lead.objects.filter(is_deleted=False), ArchivedLead.objects.filter(is_deleted=False)):
+            grouped = (
+                queryset
+                .annotate(status_key=Lower('status'), day=TruncDate('created_at'))
+                .values('status_key', 'day', 'source')
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            for row in grouped:
+                actual[(row['status_key'] or '', row['day'], row['source'] or '')] += row['total']
+        return actual
+
+    @classmethod
+    def rebuild(cls, dry_run=False):
+        """
+        Compare every counter row with the lead tables and repair the ones
+        that drifted. Returns the number of drifted rows (dry run) or of
+        rows repaired.
+
+        The comparison runs without locks; only the drifted rows are locked
+        afterwards, in a short transaction. A row that a lead transition
+        changed since it was read is left for the next rebuild, since its
+        difference from the lead tables no longer holds.
+        """
+        stored = {(row.status, row.day, row.source): row for row in cls.objects.all()}
+        actual = cls.actual_counts()
+
+        drifted = {row.pk: row for key, row in stored.items() if row.count != actual.get(key, 0)}
+        missing = [key for key in actual if key not in stored]
+        if dry_run or not (drifted or missing):
+            return len(drifted) + len(missing)
+
+        repaired = []
+        with transaction.atomic():
+            for row in cls.objects.select_for_update().filter(pk__in=drifted):
+                if row.count != drifted[row.pk].count:
+                    continue
+                row.count = actual.get((row.status, row.day, row.source), 0)
+                repaired.append(row)
+            cls.objects.bulk_update(repaired, ['count'])
+            cls.objects.filter(pk__in=[row.pk for row in repaired], count=0).delete()
+
+        created = 0
+        for status, day, source in missing:
+            try:
+                with transaction.atomic():
+                    cls.objects.create(status=status, day=day, source=source, count=actual[(status, day, source)])
+                created += 1
+            except IntegrityError:
+                # created by a lead transition since the counters were read
+                continue
+        return len(repaired) + created
+
+@receiver(post_save, sender='leads.Lead')
+def _lead_count_status(sender, instance, created, **kwargs):
+    prev = getattr(instance, '_prev_state', None)
+    if prev is None and not created:
+        return
+
+    deltas = Counter()
+    if prev and not prev['is_deleted']:
+        deltas[status_count_key(prev['status'], instance.created_at, prev['source'])] -= 1
+    if not instance.is_deleted:
+        deltas[status_count_key(instance.status, instance.created_at, instance.source)] += 1
+    LeadStatusCount.apply(deltas)
+
+
+@receiver(pre_delete, sender='leads.Lead')
+def _lead_uncount_status(sender, instance, **kwargs):
+    # bulk paths that suspend the signals (archiving) keep the lead counted
+    if counter_signals_suspended():
+        return
+    state = getattr(instance, '_loaded_state', None) or instance._tracked_state()
+    if not state['is_deleted']:
+        LeadStatusCount.apply({status_count_key(state['status'], instance.created_at, state['source']): -1})
@@ -0,0 +1,6 @@
+from django.urls import path
+from leads.consumers import LeadEventsConsumer
+
+websocket_urlpatterns = [
+    path('ws/leads/', LeadEventsConsumer.as_asgi()),
+]
@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from leads.models.models import Lead
+from leads.models.archive import ArchivedLead
 from adminpanel.models import BudgetRange, MakeupType, Service
 from artists.models.models import ArtistProfile, Location
 from users.models import User
+from leads.utils.locations import resolve_location
+from adminpanel.master_data import master_data
 
 # This is your nested serializer for lead detail view
 
@@ -36,6 +39,7 @@ class MakeupTypeNameField(serializers.Field):
     """
     Custom field to handle makeup_types as names during input,
     but convert to MakeupType instances for storage.
+    Resolved from the in-process master data registry (no queries).
     """
 
     def to_internal_value(self, data):
@@ -46,17 +50,15 @@ class MakeupTypeNameField(serializers.Field):
         for name in data:
             # Accept both string names and integer IDs
             if isinstance(name, int):
-                try:
-                    makeup_type = MakeupType.objects.get(id=name)
-                    makeup_type_instances.append(makeup_type)
-                except MakeupType.DoesNotExist:
+                makeup_type = master_data.makeup_type(name)
+                if makeup_type is None:
                     raise serializers.ValidationError(f"Makeup type with ID '{name}' does not exist.")
+                makeup_type_instances.append(makeup_type)
             elif isinstance(name, str):
-                try:
-                    makeup_type = MakeupType.objects.get(name__iexact=name.strip())
-                    makeup_type_instances.append(makeup_type)
-                except MakeupType.DoesNotExist:
+                makeup_type = master_data.makeup_type(name)
+                if makeup_type is None:
                     raise serializers.ValidationError(f"Makeup type '{name}' does not exist.")
+                makeup_type_instances.append(makeup_type)
             else:
                 raise serializers.ValidationError(f"Makeup type name must be a string or int, got {type(name)}: {name}")
 
@@ -71,35 +73,42 @@ class BudgetRangeValueField(serializers.Field):
     """
     Custom field to handle budget_range as integer value during input,
     but convert to BudgetRange instance for storage.
+    Resolved with the registry's sorted interval index (no queries).
     """
 
     def to_internal_value(self, data):
         if not isinstance(data, int):
             raise serializers.ValidationError("Budget range must be an integer value.")
 
-        try:
-            # Find BudgetRange where min_value <= data <= max_value
-            budget_range = BudgetRange.objects.filter(
-                min_value__lte=data,
-                max_value__gte=data
-            ).first()
-
-            if not budget_range:
-                raise serializers.ValidationError(f"No budget range found for value {data}.")
-
-            return budget_range
-        except BudgetRange.DoesNotExist:
+        # Find BudgetRange where min_value <= data <= max_value
+        budget_range = master_data.budget_range_for_value(data)
+        if not budget_range:
             raise serializers.ValidationError(f"No budget range found for value {data}.")
 
+        return budget_range
+
     def to_representation(self, value):
         # This will be handled by the NestedBudgetRangeSerializer in to_representation
         return value
 
 
+class ServicePrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField for Service that resolves ids from the master data registry."""
+
+    def to_internal_value(self, data):
+        try:
+            service = master_data.service(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if service is None:
+            self.fail('does_not_exist', pk_value=data)
+        return service
+
+
 class LeadSerializer(serializers.ModelSerializer):
     makeup_types = MakeupTypeNameField(required=False)
     budget_range = BudgetRangeValueField(required=False)
-    service = serializers.PrimaryKeyRelatedField(queryset=Service.objects.all(), required=False)
+    service = ServicePrimaryKeyField(queryset=Service.objects.all(), required=False)
     location = serializers.CharField(required=False)
     claimed_artists = NestedArtistProfileSerializer(read_only=True, many=True)
     booked_artists = NestedArtistProfileSerializer(read_only=True, many=True)
@@ -114,7 +123,7 @@ class LeadSerializer(serializers.ModelSerializer):
     class Meta:
         model = Lead
         fields = '__all__'
-        read_only_fields = ['created_by', 'created_at', 'updated_at']
+        read_only_fields = ['created_by', 'created_at', 'updated_at', 'total_claims', 'total_bookings', 'resolved_location']
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -136,13 +145,15 @@ class LeadSerializer(serializers.ModelSerializer):
         return data
 
     def get_claimed_count(self, obj):
-        return obj.claimed_artists.count()
+        return obj.total_claims
 
     def get_booked_count(self, obj):
-        return obj.booked_artists.count()
+        return obj.total_bookings
 
     def create(self, validated_data):
         makeup_types = validated_data.pop('makeup_types', [])
+        if validated_data.get('location'):
+            validated_data['resolved_location'] = resolve_location(validated_data['location'])
         lead = super().create(validated_data)
 
         # Add makeup types to the lead
@@ -151,6 +162,67 @@ class LeadSerializer(serializers.ModelSerializer):
 
         return lead
 
+    def update(self, instance, validated_data):
+        makeup_types = validated_data.pop('makeup_types', None)
+        if 'location' in validated_data:
+            validated_data['resolved_location'] = resolve_location(validated_data['location'])
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+
+        # Save only the submitted columns so a stale instance can't overwrite
+        # the claim/booking counters maintained with F() updates
+        instance.save(update_fields=[*validated_data.keys(), 'updated_at'])
+
+        if makeup_types is not None:
+            instance.makeup_types.set(makeup_types)
+
+        return instance
+
+class ArchivedLeadSerializer(serializers.ModelSerializer):
+    """Read-only, same shape as LeadSerializer output plus "archived": true."""
+    makeup_types = serializers.SerializerMethodField()
+    claimed_artists = serializers.SerializerMethodField()
+    booked_artists = serializers.SerializerMethodField()
+    claimed_count = serializers.SerializerMethodField()
+    booked_count = serializers.SerializerMethodField()
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedLead
+        exclude = ['makeup_type_ids']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['service'] = NestedServiceSerializer(instance.service).data if instance.service else None
+        data['budget_range'] = NestedBudgetRangeSerializer(instance.budget_range).data if instance.budget_range else None
+        data['assigned_to'] = NestedArtistProfileSerializer(instance.assigned_to).data if instance.assigned_to else None
+        data['requested_artist'] = NestedArtistProfileSerializer(instance.requested_artist).data if instance.requested_artist else None
+        return data
+
+    def get_makeup_types(self, obj):
+        makeup_types = [master_data.makeup_type(makeup_id) for makeup_id in obj.makeup_type_ids]
+        return NestedMakeupTypeSerializer([row for row in makeup_types if row], many=True).data
+
+    def _artists(self, obj, relation):
+        # artist_relations is prefetched with its artists by the listing view
+        artists = [row.artist for row in obj.artist_relations.all() if row.relation == relation and row.artist]
+        return NestedArtistProfileSerializer(artists, many=True).data
+
+    def get_claimed_artists(self, obj):
+        return self._artists(obj, 'claimed')
+
+    def get_booked_artists(self, obj):
+        return self._artists(obj, 'booked')
+
+    def get_claimed_count(self, obj):
+        return obj.total_claims
+
+    def get_booked_count(self, obj):
+        return obj.total_bookings
+
+    def get_archived(self, obj):
+        return True
+
 # this serializer is used for the recent leads list for artist dashboard
 class LeadDashboardListSerializer(serializers.ModelSerializer):
     client_name = serializers.SerializerMethodField()
@@ -206,10 +278,10 @@ class LeadDetailSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_claimed_count(self, obj):
-        return obj.claimed_artists.count()
+        return obj.total_claims
 
     def get_booked_count(self, obj):
-        return obj.booked_artists.count()
+        return obj.total_bookings
 
 # This serializer is used for the claimed leads list for artist dashboard
 
@@ -241,7 +313,7 @@ class ClaimedLeadListSerializer(serializers.ModelSerializer):
         ]
 
     def get_claimed_count(self, obj):
-        return obj.claimed_artists.count()
+        return obj.total_claims
 
     def get_booked_count(self, obj):
-        return obj.booked_artists.count()
+        return obj.total_bookings
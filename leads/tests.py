@@ -1,3 +1,956 @@
-from django.test import TestCase
+import re
+import threading
+from collections import Counter
+from io import StringIO
+from contextlib import contextmanager
+from unittest import mock, skipUnless
+from datetime import date, timedelta
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+import wedmac_services.urls  # noqa: F401  (loads models only imported by views)
+from adminpanel.models import MakeupType, Service
+from appconfig.models import MasterConfig
+from artists.models.models import ArtistProfile, Location
+from leads.consumers import LeadEventsConsumer
+from leads.views.raise_false_claim_view import RaiseFalseLeadClaimView
+from leads.models.archive import ArchivedLead, ArchivedLeadArtist
+from leads.models.false_lead_claim import FalseClaimDocument, FalseLeadClaim
+from leads.models.models import Lead
+from leads.models.open_lead import OpenLead
+from leads.models.status_count import LeadStatusCount
+from leads.utils import claims as claim_engine
+from leads.utils.archive import _archive_batch, archivable_leads, archive_cutoff, archive_leads
+from leads.utils.dedupe import DEDUPE_CONFIG_KEY, collapse_duplicates, find_duplicate, merge_submission
+from leads.utils.deletion import purge_deleted_leads, soft_delete_leads
+from leads.utils.importer import LeadImporter, assign_inserted_ids
+from leads.utils.locations import LocationResolver, resolve_location
+from leads.utils.scoring import rank_leads
+from users.models import User
+
+
+def explain(sql):
+    """Query plan for a captured statement, flattened to one string."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        else:
+            if connection.vendor == 'postgresql':
+                # tiny test tables would otherwise always be sequentially scanned
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+        return " ".join(str(column) for row in cursor.fetchall() for column in row)
+
+
+def unquoted(sql):
+    return re.sub(r'["`]', '', sql)
+
+
+class LeadQueryPlanTests(TestCase):
+    """
+    Query budget and index use of the lead hot paths against a seeded
+    database. Each test captures the SQL an endpoint runs, asserts how many
+    statements it took and EXPLAINs the statement that should be served by
+    one of the Lead / through-table indexes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='artist', phone='9000000001')
+        cls.artist = ArtistProfile.objects.create(
+            user=user, first_name='Asha', last_name='K', phone='9000000001', available_leads=50, status='approved'
+        )
+        other = User.objects.create(username='other', phone='9000000002')
+        cls.other_artist = ArtistProfile.objects.create(
+            user=other, first_name='Bina', last_name='S', phone='9000000002', available_leads=50, status='approved'
+        )
+        cls.admin = User.objects.create(username='admin', phone='9000000003', is_staff=True, is_superuser=True)
+
+        statuses = ['new', 'claimed', 'qualified', 'converted']
+        cls.leads = []
+        for i in range(60):
+            lead = Lead.objects.create(
+                first_name=f"Lead {i}",
+                phone=f"98{i:08d}",
+                booking_date=date.today() + timedelta(days=i),
+                assigned_to=cls.artist if i % 4 == 0 else cls.other_artist,
+                is_verified=i % 5 != 0,
+            )
+            cls.leads.append(lead)
+        for i, lead in enumerate(cls.leads[:20]):
+            lead.claimed_artists.add(cls.artist if i % 2 else cls.other_artist)
+
+        Lead.objects.filter(pk__in=[lead.pk for lead in cls.leads[40:]]).update(is_deleted=True, deleted_at=timezone.now())
+        for i, status in enumerate(statuses):
+            Lead.objects.filter(pk__in=[lead.pk for lead in cls.leads[i::len(statuses)]]).update(status=status)
+        # queryset updates bypass the counter signals
+        LeadStatusCount.rebuild()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def request(self, user, method, url):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url)
+        self.assertLess(response.status_code, 300, getattr(response, 'data', None))
+        return response, [query['sql'] for query in ctx.captured_queries]
+
+    def statement(self, queries, *fragments):
+        """The single captured statement containing every fragment (quotes ignored)."""
+        matches = [sql for sql in queries if all(fragment in unquoted(sql) for fragment in fragments)]
+        self.assertEqual(len(matches), 1, f"expected one statement with {fragments}, got {matches}")
+        return matches[0]
+
+    def assertUsesIndex(self, sql, index_name):
+        plan = explain(sql)
+        self.assertIn(index_name, plan, f"{index_name} not used:\n{plan}\n{sql}")
+
+    def test_feed(self):
+        response, queries = self.request(self.artist.user, 'get', '/api/leads/all-leads/?limit=10')
+        self.assertEqual(len(response.data['leads']), 10)
+        # page, makeup types, claimed artists, booked artists
+        self.assertEqual(len(queries), 4)
+        page = self.statement(queries, 'FROM leads_lead INNER JOIN leads_openlead')
+        self.assertUsesIndex(page, 'leads_openlead')
+
+    def test_relevance_ranking_is_cached(self):
+        response, queries = self.request(self.artist.user, 'get', '/api/leads/all-leads/?sort=relevance&limit=5')
+        self.assertEqual(len(response.data['leads']), 5)
+        self.assertTrue([sql for sql in queries if 'DISTINCT' in sql])
+
+        # the second feed request reuses the ranking instead of re-reading the candidates
+        response, queries = self.request(self.artist.user, 'get', '/api/leads/all-leads/?sort=relevance&limit=5&offset=5')
+        self.assertFalse([sql for sql in queries if 'DISTINCT' in sql])
+
+        # per-request values in the queryset (a moving "now" bound) do not change the key
+        open_leads = Lead.objects.filter(open_entry__isnull=False)
+        first = rank_leads(open_leads.filter(created_at__gte=timezone.now() - timedelta(days=30)), self.artist, {'location': None})
+        with CaptureQueriesContext(connection) as ctx:
+            again = rank_leads(open_leads.filter(created_at__gte=timezone.now() - timedelta(days=30)), self.artist, {'location': None})
+        self.assertEqual(again, first)
+        self.assertFalse([query['sql'] for query in ctx.captured_queries if 'DISTINCT' in query['sql']])
+
+    def test_admin_listing(self):
+        response, queries = self.request(self.admin, 'get', '/api/leads/list/?per_page=10')
+        self.assertEqual(response.data['count'], 40)
+        # count, page, makeup types, claimed artists, booked artists
+        self.assertEqual(len(queries), 5)
+        self.assertUsesIndex(self.statement(queries, 'COUNT(*)'), 'leads_lead_feed_idx')
+
+        response, queries = self.request(self.admin, 'get', '/api/leads/list/?per_page=10&status=claimed&total=none')
+        self.assertEqual(len(queries), 4)
+        self.assertUsesIndex(self.statement(queries, 'FROM leads_lead', 'ORDER BY'), 'leads_lead_status_idx')
+
+    def test_status_counts(self):
+        response, queries = self.request(self.admin, 'get', '/api/leads/status-count/')
+        self.assertEqual(response.data['new'], 10)
+        self.assertEqual(response.data['qualified'], 10)
+        # one grouped read of the counter table, whatever the lead volume
+        self.assertEqual(len(queries), 1)
+        self.assertIn('leads_leadstatuscount', unquoted(queries[0]))
+        self.assertEqual(LeadStatusCount.rebuild(dry_run=True), 0)
+
+    def test_lead_detail(self):
+        lead = self.leads[1]
+        response, queries = self.request(self.artist.user, 'get', f'/api/leads/lead-detail/{lead.pk}/')
+        self.assertEqual(response.data['id'], lead.pk)
+        # validators, lead with its FKs, makeup types, claimed artists, booked artists
+        self.assertEqual(len(queries), 5)
+        etag = response['ETag']
+
+        # cached payload: only the validator read
+        response, queries = self.request(self.artist.user, 'get', f'/api/leads/lead-detail/{lead.pk}/')
+        self.assertEqual(response.data['id'], lead.pk)
+        self.assertEqual(len(queries), 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/leads/lead-detail/{lead.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        response = self.client.get(f'/api/leads/lead-detail/{lead.pk}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+        # a claim moves the counters, so the old ETag no longer matches
+        self.request(self.other_artist.user, 'post', f'/api/leads/{lead.pk}/claim/')
+        response, queries = self.request(self.artist.user, 'get', f'/api/leads/lead-detail/{lead.pk}/')
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['claimed_count'], lead.total_claims + 1)
+
+    def test_lead_detail_follows_related_rows(self):
+        service = Service.objects.create(name='Bridal')
+        makeup = MakeupType.objects.create(name='HD')
+        lead, other = self.leads[2], self.leads[3]
+        Lead.objects.filter(pk=lead.pk).update(service=service)
+        url = f'/api/leads/lead-detail/{lead.pk}/'
+        etag = self.request(self.artist.user, 'get', url)[0]['ETag']
+        other_etag = self.request(self.artist.user, 'get', f'/api/leads/lead-detail/{other.pk}/')[0]['ETag']
+
+        # renaming the embedded service
+        service.name = 'Bridal HD'
+        service.save()
+        response, _ = self.request(self.artist.user, 'get', url)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['service']['name'], 'Bridal HD')
+        etag = response['ETag']
+        # leads without that service keep their ETag
+        self.assertEqual(self.request(self.artist.user, 'get', f'/api/leads/lead-detail/{other.pk}/')[0]['ETag'], other_etag)
+
+        # adding a makeup type to the lead
+        lead.makeup_types.add(makeup)
+        response, _ = self.request(self.artist.user, 'get', url)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual([row['name'] for row in response.data['makeup_types']], ['HD'])
+        etag = response['ETag']
+
+        # editing the assigned artist's profile
+        self.other_artist.first_name = 'Bindu'
+        self.other_artist.save(update_fields=['first_name'])
+        response, _ = self.request(self.artist.user, 'get', url)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['assigned_to']['first_name'], 'Bindu')
+        etag = response['ETag']
+
+        # saves that leave the shown fields as they were keep the cached payload,
+        # including the full user.save() of the OTP login
+        self.other_artist.available_leads = 10
+        self.other_artist.save()
+        self.other_artist.user.otp_verified = True
+        self.other_artist.user.save()
+        service.price = 100
+        service.save()
+        response, queries = self.request(self.artist.user, 'get', url)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 1)
+
+    def test_artist_recent_leads(self):
+        response, queries = self.request(self.artist.user, 'get', '/api/leads/artist/recent-leads/?per_page=2')
+        # page, summary aggregate
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(response.data['count'], 10)
+        self.assertEqual(len(response.data['leads']), 2)
+        self.assertUsesIndex(self.statement(queries, 'FROM leads_lead', 'ORDER BY'), 'leads_lead_assignee_idx')
+        self.assertUsesIndex(self.statement(queries, 'COUNT('), 'leads_lead_assignee_idx')
+
+        # summary is cached until one of the artist's assigned leads changes
+        response, queries = self.request(self.artist.user, 'get', '/api/leads/artist/recent-leads/?per_page=2')
+        self.assertEqual(len(queries), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.create(first_name='New', booking_date=date.today(), assigned_to=self.artist)
+        response, queries = self.request(self.artist.user, 'get', '/api/leads/artist/recent-leads/?per_page=2')
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(response.data['count'], 11)
+        self.assertEqual(response.data['summary']['new_this_week'], 11)
+
+    def test_claim(self):
+        lead = self.leads[36]
+        response, queries = self.request(self.artist.user, 'post', f'/api/leads/{lead.pk}/claim/')
+        self.assertEqual(response.data['lead_id'], lead.pk)
+        queries = [sql for sql in queries if 'SAVEPOINT' not in sql]
+        # snapshot, debit, balance, log, guarded count, status transition,
+        # relation, claimants, deltas, status counters (open index only when full)
+        self.assertLessEqual(len(queries), 11)
+        # the lead row is held from the guarded UPDATE to commit: keep that part short
+        locked_from = queries.index(self.statement(queries, 'UPDATE leads_lead SET total_claims'))
+        self.assertLessEqual(len(queries) - locked_from, 7)
+        self.assertFalse([sql for sql in queries[locked_from:] if 'artists_artistactivitylog' in sql])
+
+    def test_my_claimed_leads(self):
+        url = '/api/leads/artist/my-claimed-leads/'
+        response, queries = self.request(self.artist.user, 'get', f'{url}?per_page=50')
+        self.assertEqual(response.data['count'], 10)
+        self.assertEqual(len(response.data['leads']), 10)
+        # count, page with its FKs, makeup types: the same whatever the page size
+        self.assertEqual(len(queries), 3)
+
+        response, queries = self.request(self.artist.user, 'get', f'{url}?per_page=4')
+        self.assertEqual(len(queries), 3)
+        seen = [lead['id'] for lead in response.data['leads']]
+        while response.data['next_cursor']:
+            response, queries = self.request(self.artist.user, 'get', f"{url}?per_page=4&cursor={response.data['next_cursor']}")
+            self.assertEqual(len(queries), 3)
+            seen += [lead['id'] for lead in response.data['leads']]
+        self.assertEqual(seen, [lead.pk for lead in reversed(self.leads[:20]) if lead.pk % 2 == self.leads[1].pk % 2])
+
+    def test_my_assigned_leads(self):
+        response, queries = self.request(self.artist.user, 'get', '/api/leads/artist/my-assigned-leads/?per_page=50')
+        self.assertEqual(response.data['count'], 10)
+        self.assertEqual(len(response.data['leads']), 10)
+        # count, page with its FKs, makeup types, claimed artists, booked artists
+        self.assertEqual(len(queries), 5)
+        self.assertUsesIndex(self.statement(queries, 'ORDER BY'), 'leads_lead_assignee_idx')
+
+        response, queries = self.request(self.artist.user, 'get', '/api/leads/artist/my-assigned-leads/?per_page=3')
+        self.assertEqual(len(response.data['leads']), 3)
+        self.assertIsNotNone(response.data['next_cursor'])
+        self.assertEqual(len(queries), 5)
+
+    def test_false_claim_queue(self):
+        for i, lead in enumerate(self.leads[:25]):
+            claim = FalseLeadClaim.objects.create(
+                lead=lead, artist=self.artist, reason='Wrong number', status=['pending', 'approved', 'rejected'][i % 3]
+            )
+            for tag in ('call log', 'chat'):
+                FalseClaimDocument.objects.create(false_claim=claim, lead=lead, file_name=f'{tag}.png', tag=tag)
+
+        response, queries = self.request(self.admin, 'get', '/api/leads/false-claims/admin/?status=pending&per_page=5')
+        self.assertEqual(response.data['counts'], {'all': 25, 'pending': 9, 'approved': 8, 'rejected': 8})
+        self.assertEqual([len(claim['proof_documents']) for claim in response.data['claims']], [2] * 5)
+        # counts, page with leads, documents
+        self.assertEqual(len(queries), 3)
+        page = self.statement(queries, 'FROM leads_falseleadclaim INNER JOIN leads_lead')
+        self.assertUsesIndex(page, 'leads_falseclaim_queue_idx')
+
+        cursor = response.data['next_cursor']
+        response, queries = self.request(self.admin, 'get', f'/api/leads/false-claims/admin/?status=pending&per_page=5&cursor={cursor}')
+        self.assertEqual(len(response.data['claims']), 4)
+        self.assertIsNone(response.data['next_cursor'])
+        self.assertEqual(len(queries), 3)
+
+    def test_claimed_leads_of_artist(self):
+        # "leads this artist claimed" is answered from the through-table index alone
+        claims = Lead.claimed_artists.through.objects.filter(artistprofile_id=self.artist.pk).values_list('lead_id', flat=True)
+        self.assertUsesIndex(str(claims.query), 'leads_claimed_artist_idx')
+        bookings = Lead.booked_artists.through.objects.filter(artistprofile_id=self.artist.pk).values_list('lead_id', flat=True)
+        self.assertUsesIndex(str(bookings.query), 'leads_booked_artist_idx')
+
+
+
+class ClaimLeadTests(TestCase):
+    """Claims racing on one lead: only capacity decides, counters stay consistent."""
+
+    def setUp(self):
+        self.artists = []
+        for i in range(3):
+            user = User.objects.create(username=f'artist{i}', phone=f'900000000{i}')
+            self.artists.append(ArtistProfile.objects.create(
+                user=user, first_name='Artist', last_name=str(i), phone=f'900000000{i}', available_leads=5, status='approved'
+            ))
+        self.assignee = self.artists[2]
+        self.lead = Lead.objects.create(
+            first_name='Lead', phone='9800000001', booking_date=date.today(), assigned_to=self.assignee, max_claims=2
+        )
+
+    def test_claim_with_stale_new_snapshot_succeeds(self):
+        first, second = self.artists[0], self.artists[1]
+        # both requests read the lead while it was still 'new'
+        stale = claim_engine.claim_snapshot(self.lead.pk, second.pk)
+        claim_engine.claim_lead(self.lead.pk, first.pk)
+        with mock.patch.object(claim_engine, 'claim_snapshot', return_value=stale):
+            result = claim_engine.claim_lead(self.lead.pk, second.pk)
+
+        self.assertEqual(result['claimed_count'], 2)
+        lead = Lead.objects.get(pk=self.lead.pk)
+        self.assertEqual((lead.status, lead.total_claims), ('claimed', 2))
+        self.assertEqual(
+            dict(ArtistProfile.objects.values_list('pk', 'my_claimed_leads')),
+            {first.pk: 1, second.pk: 1, self.assignee.pk: 1}
+        )
+        self.assertEqual(LeadStatusCount.rebuild(dry_run=True), 0)
+        # the stale path still sees the lead fill up
+        self.assertFalse(OpenLead.objects.filter(lead_id=self.lead.pk).exists())
+
+    def test_full_lead_is_rejected(self):
+        claim_engine.claim_lead(self.lead.pk, self.artists[0].pk)
+        stale = claim_engine.claim_snapshot(self.lead.pk, self.artists[1].pk)
+        claim_engine.claim_lead(self.lead.pk, self.artists[1].pk)
+        with mock.patch.object(claim_engine, 'claim_snapshot', return_value=stale), \
+                self.assertRaises(claim_engine.ClaimError) as raised:
+            claim_engine.claim_lead(self.lead.pk, self.assignee.pk)
+        self.assertEqual(raised.exception.message, "Maximum claims reached for this lead.")
+        self.assertEqual(ArtistProfile.objects.get(pk=self.assignee.pk).available_leads, 5)
+
+
+class ImportedLeadIdTests(TestCase):
+    """Leads bulk-inserted without returned ids (MySQL) are matched back to their own rows."""
+
+    def test_same_phone_inserted_concurrently_is_not_picked_up(self):
+        batch = Lead.objects.bulk_create([
+            Lead(first_name=f'Imported {i}', phone=f'980000000{i}', booking_date=date.today()) for i in range(3)
+        ])
+        expected = [lead.pk for lead in batch]
+        # another request stores the same phone while the batch is being inserted
+        other = Lead.objects.create(first_name='Web form', phone=batch[0].phone, booking_date=date.today())
+        Lead.objects.filter(pk=other.pk).update(created_at=batch[1].created_at)
+
+        for lead in batch:
+            lead.pk = None
+        assign_inserted_ids(batch)
+        self.assertEqual([lead.pk for lead in batch], expected)
+
+    def test_import_without_returned_ids(self):
+        stream = StringIO(
+            "first_name,phone,booking_date\n"
+            f"Asha,9800000001,{date.today().isoformat()}\n"
+            f"Bina,9800000002,{date.today().isoformat()}\n"
+        )
+        features = type(connection.features)
+        with mock.patch.object(features, 'can_return_rows_from_bulk_insert', new_callable=mock.PropertyMock, return_value=False):
+            report = LeadImporter(source='website').run(stream, 'csv')
+
+        self.assertEqual(report['created'], 2)
+        self.assertEqual(LeadStatusCount.rebuild(dry_run=True), 0)
+        self.assertEqual(OpenLead.rebuild(), (0, 0))
+
+
+class LeadImportTests(TestCase):
+    """LeadImporter and the admin import endpoint"""
+
+    url = '/api/leads/admin/import/'
+
+    def csv(self, *phones):
+        rows = ''.join(f"Guest,{phone},{date.today().isoformat()}\n" for phone in phones)
+        return "first_name,phone,booking_date\n" + rows
+
+    def test_imported_leads_wait_for_verification(self):
+        LeadImporter().run(StringIO(self.csv('9800000001')), 'csv')
+        LeadImporter(verified=True).run(StringIO(self.csv('9800000002')), 'csv')
+
+        self.assertEqual(
+            dict(Lead.objects.values_list('phone', 'is_verified')), {'9800000001': False, '9800000002': True}
+        )
+        self.assertEqual(list(OpenLead.objects.values_list('lead__phone', flat=True)), ['9800000002'])
+
+    @override_settings(LEAD_IMPORT_MAX_UPLOAD_BYTES=100)
+    def test_large_files_are_sent_to_the_command(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username='admin', phone='9100000000', is_staff=True))
+
+        small = SimpleUploadedFile('leads.csv', self.csv('9800000001').encode())
+        response = client.post(self.url, {'file': small, 'verified': 'true'}, format='multipart')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertTrue(Lead.objects.get(phone='9800000001').is_verified)
+
+        large = SimpleUploadedFile('leads.csv', self.csv(*(f'98000001{i:02d}' for i in range(10))).encode())
+        response = client.post(self.url, {'file': large}, format='multipart')
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('import_leads', response.data['error'])
+        self.assertEqual(Lead.objects.count(), 1)
+
+
+class LeadCounterTestCase(TestCase):
+    """
+    Base for the bulk lead operations that settle counters themselves instead
+    of going through the per-row signals. After each operation the status
+    counters must match the rows and my_claimed_leads the claimed leads.
+    """
+
+    def setUp(self):
+        self.artists = []
+        for i in range(3):
+            user = User.objects.create(username=f'artist{i}', phone=f'900000000{i}')
+            self.artists.append(ArtistProfile.objects.create(
+                user=user, first_name='Artist', last_name=str(i), phone=f'900000000{i}', available_leads=10, status='approved'
+            ))
+
+    def create_lead(self, i, **kwargs):
+        kwargs.setdefault('phone', f'98{i:08d}')
+        kwargs.setdefault('booking_date', date.today())
+        return Lead.objects.create(first_name=f'Lead {i}', **kwargs)
+
+    def claim(self, lead, *artists):
+        for artist in artists:
+            claim_engine.claim_lead(lead.pk, artist.pk)
+
+    def assertCountersConsistent(self, my_claimed_leads):
+        actual = Counter()
+        for (status, _, _), total in LeadStatusCount.actual_counts().items():
+            actual[status] += total
+        totals = {status: total for status, total in LeadStatusCount.totals().items() if total}
+        self.assertEqual(totals, dict(actual))
+        self.assertEqual(LeadStatusCount.rebuild(dry_run=True), 0)
+        self.assertEqual(
+            [ArtistProfile.objects.get(pk=artist.pk).my_claimed_leads for artist in self.artists], my_claimed_leads
+        )
+
+
+class LeadStatusCountRebuildTests(LeadCounterTestCase):
+    """LeadStatusCount.rebuild"""
+
+    def test_rebuild(self):
+        for i in range(3):
+            self.create_lead(i, source='web')
+        self.create_lead(3, status='qualified')
+        LeadStatusCount.objects.filter(status='new').update(count=7)
+        LeadStatusCount.objects.filter(status='qualified').delete()
+
+        self.assertEqual(LeadStatusCount.rebuild(dry_run=True), 2)
+        self.assertEqual(LeadStatusCount.rebuild(), 2)
+        self.assertEqual(LeadStatusCount.totals(), {'new': 3, 'qualified': 1})
+        self.assertCountersConsistent([0, 0, 0])
+
+    def test_rows_changed_since_they_were_read_are_left(self):
+        self.create_lead(0)
+        LeadStatusCount.objects.update(count=5)
+        actual_counts = LeadStatusCount.actual_counts
+
+        def saved_meanwhile():
+            # a lead transition commits between the unlocked reads and the repair
+            self.create_lead(1)
+            return actual_counts()
+
+        with mock.patch.object(LeadStatusCount, 'actual_counts', side_effect=saved_meanwhile):
+            self.assertEqual(LeadStatusCount.rebuild(), 0)
+        self.assertEqual(LeadStatusCount.totals(), {'new': 6})
+        self.assertEqual(LeadStatusCount.rebuild(), 1)
+        self.assertCountersConsistent([0, 0, 0])
+
+
+class LeadDeletionTests(LeadCounterTestCase):
+    """soft_delete_leads / purge_deleted_leads"""
+
+    def setUp(self):
+        super().setUp()
+        self.open = self.create_lead(0, is_verified=True)
+        self.assigned = self.create_lead(1, assigned_to=self.artists[2])
+        self.shared = self.create_lead(2)
+        self.claim(self.assigned, self.artists[0])
+        self.claim(self.shared, self.artists[0], self.artists[1])
+        self.assertCountersConsistent([2, 1, 1])
+
+    def test_soft_delete(self):
+        deleted, not_found = soft_delete_leads([self.assigned.pk, self.open.pk, self.assigned.pk, 0])
+        self.assertEqual(sorted(deleted), sorted([self.assigned.pk, self.open.pk]))
+        self.assertEqual(not_found, [0])
+
+        self.assertEqual(set(Lead.objects.filter(is_deleted=True).values_list('pk', flat=True)), set(deleted))
+        self.assertFalse(OpenLead.objects.filter(lead_id=self.open.pk).exists())
+        self.assertEqual(LeadStatusCount.totals(), {'new': 0, 'claimed': 1})
+        self.assertCountersConsistent([1, 1, 0])
+
+        # already deleted leads are reported as not found and change nothing
+        self.assertEqual(soft_delete_leads([self.assigned.pk]), ([], [self.assigned.pk]))
+        self.assertCountersConsistent([1, 1, 0])
+
+    def test_deleted_lead_cannot_be_edited(self):
+        soft_delete_leads([self.open.pk])
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username='admin', phone='9100000000', is_staff=True))
+
+        response = client.patch(f'/api/leads/admin/{self.open.pk}/set-verified/', {'is_verified': True}, format='json')
+        self.assertEqual(response.status_code, 404)
+        response = client.put(f'/api/leads/{self.open.pk}/update/', {'status': 'claimed'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(OpenLead.objects.filter(lead_id=self.open.pk).exists())
+        self.assertEqual(Lead.objects.get(pk=self.open.pk).status, 'new')
+
+    def test_purge(self):
+        soft_delete_leads([self.assigned.pk, self.shared.pk])
+        self.assertCountersConsistent([0, 0, 0])
+        Lead.objects.filter(pk=self.assigned.pk).update(deleted_at=timezone.now() - timedelta(days=91))
+
+        self.assertEqual(purge_deleted_leads(older_than_days=90, dry_run=True), 1)
+        self.assertEqual(purge_deleted_leads(older_than_days=90, batch_size=1), 1)
+        self.assertFalse(Lead.objects.filter(pk=self.assigned.pk).exists())
+        self.assertFalse(Lead.claimed_artists.through.objects.filter(lead_id=self.assigned.pk).exists())
+        self.assertTrue(Lead.objects.filter(pk=self.shared.pk, is_deleted=True).exists())
+        self.assertCountersConsistent([0, 0, 0])
+        self.assertEqual(purge_deleted_leads(older_than_days=90), 0)
+
+
+class LeadDedupeTests(LeadCounterTestCase):
+    """find_duplicate / merge_submission / collapse_duplicates and the public submission modes"""
+
+    url = '/api/leads/public/submit/'
+
+    def submit(self, **data):
+        payload = {'first_name': 'Riya', 'phone': '+91 98765-43210', 'booking_date': date.today().isoformat(), **data}
+        return APIClient().post(self.url, payload, format='json')
+
+    def set_mode(self, mode):
+        MasterConfig.objects.update_or_create(key=DEDUPE_CONFIG_KEY, defaults={'value': {'mode': mode, 'window_hours': 72}})
+
+    def test_find_duplicate(self):
+        lead = self.create_lead(0, phone='9876543210')
+        self.assertEqual(find_duplicate('+91 98765 43210', date.today(), 72), lead)
+        self.assertIsNone(find_duplicate('9876543210', date.today() + timedelta(days=1), 72))
+
+        Lead.objects.filter(pk=lead.pk).update(created_at=timezone.now() - timedelta(hours=73))
+        self.assertIsNone(find_duplicate('9876543210', date.today(), 72))
+        self.assertEqual(find_duplicate('9876543210', date.today(), 96), lead)
+
+        soft_delete_leads([lead.pk])
+        self.assertIsNone(find_duplicate('9876543210', date.today(), 96))
+
+    def test_merge_submission(self):
+        lead = self.create_lead(0, last_name='Original')
+        merge_submission(lead, {'last_name': 'Repeat', 'email': 'riya@example.com', 'requirements': 'Airbrush'})
+        lead.refresh_from_db()
+        self.assertEqual((lead.last_name, lead.email, lead.requirements), ('Original', 'riya@example.com', 'Airbrush'))
+
+    def test_merged_location_is_resolved(self):
+        pune = Location.objects.create(city='Pune', state='Maharashtra', lat=18.52, lng=73.86)
+        lead = self.create_lead(0)
+        merge_submission(lead, {'location': 'Pune, Maharashtra'})
+        lead.refresh_from_db()
+        self.assertEqual((lead.location, lead.resolved_location_id), ('Pune, Maharashtra', pune.pk))
+
+    def test_merge_mode(self):
+        response = self.submit()
+        self.assertEqual(response.status_code, 201, response.data)
+        lead_id = response.data['lead_id']
+
+        response = self.submit(email='riya@example.com')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual((response.data['lead_id'], response.data['duplicate']), (lead_id, True))
+        self.assertEqual(Lead.objects.get().email, 'riya@example.com')
+        self.assertCountersConsistent([0, 0, 0])
+
+    def test_each_requested_artist_gets_their_own_lead(self):
+        first = self.submit(requested_artist=self.artists[0].pk)
+        self.assertEqual(first.status_code, 201, first.data)
+        # the same client contacting another artist for the same date
+        second = self.submit(requested_artist=self.artists[1].pk)
+        self.assertEqual(second.status_code, 201, second.data)
+        self.assertNotEqual(second.data['lead_id'], first.data['lead_id'])
+
+        repeat = self.submit(requested_artist=self.artists[0].pk)
+        self.assertEqual((repeat.status_code, repeat.data['lead_id']), (200, first.data['lead_id']))
+        self.assertEqual(
+            set(Lead.objects.values_list('requested_artist_id', flat=True)), {self.artists[0].pk, self.artists[1].pk}
+        )
+
+    def test_check_and_insert_hold_the_fingerprint_lock(self):
+        held = []
+
+        @contextmanager
+        def recording_lock(name, timeout=0):
+            held.append(name)
+            yield True
+            # the lead was committed before the lock is released
+            held.append(Lead.objects.count())
+
+        with mock.patch('leads.utils.dedupe.advisory_lock', recording_lock):
+            self.assertEqual(self.submit().status_code, 201)
+        self.assertEqual(held, [f'lead_submission:9876543210:{date.today().isoformat()}', 1])
+
+        @contextmanager
+        def busy_lock(name, timeout=0):
+            yield False
+
+        # a submission that cannot get the lock in time is refused rather than inserted twice
+        with mock.patch('leads.utils.dedupe.advisory_lock', busy_lock):
+            self.assertEqual(self.submit().status_code, 409)
+        self.assertEqual(Lead.objects.count(), 1)
+
+    def test_reject_mode(self):
+        self.set_mode('reject')
+        self.assertEqual(self.submit().status_code, 201)
+        self.assertEqual(self.submit().status_code, 409)
+        # another booking date is a different lead
+        self.assertEqual(self.submit(booking_date=(date.today() + timedelta(days=1)).isoformat()).status_code, 201)
+        self.assertEqual(Lead.objects.count(), 2)
+        self.assertCountersConsistent([0, 0, 0])
+
+    def test_off_mode(self):
+        self.set_mode('off')
+        self.assertEqual(self.submit().status_code, 201)
+        self.assertEqual(self.submit().status_code, 201)
+        self.assertEqual(Lead.objects.count(), 2)
+        self.assertCountersConsistent([0, 0, 0])
+
+    def test_collapse_duplicates_keeps_claimed_repeats(self):
+        keep = self.create_lead(0, phone='9876543210')
+        repeat = self.create_lead(1, phone='+91 98765 43210')
+        claimed = self.create_lead(2, phone='9876543210', assigned_to=self.artists[1])
+        self.claim(claimed, self.artists[0])
+        other_date = self.create_lead(3, phone='9876543210', booking_date=date.today() + timedelta(days=1))
+        self.assertCountersConsistent([1, 1, 0])
+
+        self.assertEqual(collapse_duplicates(dry_run=True), (1, [repeat.pk]))
+        self.assertFalse(Lead.objects.filter(is_deleted=True).exists())
+
+        self.assertEqual(collapse_duplicates(), (1, [repeat.pk]))
+        self.assertEqual(
+            set(Lead.objects.filter(is_deleted=False).values_list('pk', flat=True)), {keep.pk, claimed.pk, other_date.pk}
+        )
+        self.assertCountersConsistent([1, 1, 0])
+        # the claimed repeat stays; nothing left to collapse
+        self.assertEqual(collapse_duplicates(), (1, []))
+
+@skipUnless(connection.vendor in ('mysql', 'postgresql'), 'needs database advisory locks')
+class ConcurrentSubmissionTests(TransactionTestCase):
+    """Double-submits racing through the public form end up as one lead."""
+
+    def test_concurrent_double_submit(self):
+        payload = {'first_name': 'Riya', 'phone': '9876543210', 'booking_date': date.today().isoformat()}
+        barrier = threading.Barrier(4, timeout=10)
+        statuses = []
+
+        def worker():
+            try:
+                barrier.wait()
+                statuses.append(APIClient().post('/api/leads/public/submit/', payload, format='json').status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuses), [200, 200, 200, 201])
+        self.assertEqual(Lead.objects.count(), 1)
+
+class LeadArchiveTests(LeadCounterTestCase):
+    """archive_leads / _archive_batch"""
+
+    def setUp(self):
+        super().setUp()
+        past, ahead = date.today() - timedelta(days=200), date.today() + timedelta(days=30)
+        self.makeup = MakeupType.objects.create(name='Airbrush')
+        self.claimed = self.create_lead(0, assigned_to=self.artists[2], booking_date=past)
+        self.claimed.makeup_types.add(self.makeup)
+        self.claim(self.claimed, self.artists[0])
+        self.open = self.create_lead(1, is_verified=True, booking_date=past)
+        self.claimed_by_other = self.create_lead(2, booking_date=past)
+        self.claim(self.claimed_by_other, self.artists[1])
+        self.deleted = self.create_lead(3, booking_date=past)
+        soft_delete_leads([self.deleted.pk])
+        self.recent = self.create_lead(4)
+        self.claim(self.recent, self.artists[0])
+        # created long ago for a wedding still ahead: artists still work on it
+        self.upcoming = self.create_lead(5, booking_date=ahead)
+        self.claim(self.upcoming, self.artists[1])
+        self.unqualified = self.create_lead(6, booking_date=ahead, status='unqualified')
+
+        old = [self.claimed.pk, self.open.pk, self.claimed_by_other.pk, self.deleted.pk, self.upcoming.pk, self.unqualified.pk]
+        Lead.objects.filter(pk__in=old).update(created_at=timezone.now() - timedelta(days=400))
+        # queryset update: move the counters to the new creation day
+        LeadStatusCount.rebuild()
+        self.cutoff = archive_cutoff(180)
+        self.assertCountersConsistent([2, 2, 1])
+
+    def test_archive_leads(self):
+        archived_ids = {self.claimed.pk, self.open.pk, self.claimed_by_other.pk, self.unqualified.pk}
+        self.assertEqual(archive_leads(horizon_days=180, dry_run=True), 4)
+        self.assertEqual(archive_leads(horizon_days=180, batch_size=2), 4)
+
+        self.assertEqual(set(ArchivedLead.objects.values_list('pk', flat=True)), archived_ids)
+        self.assertEqual(
+            set(Lead.objects.values_list('pk', flat=True)), {self.deleted.pk, self.recent.pk, self.upcoming.pk}
+        )
+        archived = ArchivedLead.objects.get(pk=self.claimed.pk)
+        self.assertEqual((archived.status, archived.total_claims, archived.makeup_type_ids), ('claimed', 1, [self.makeup.pk]))
+        self.assertEqual(
+            set(ArchivedLeadArtist.objects.values_list('lead_id', 'artist_id', 'relation')),
+            {(self.claimed.pk, self.artists[0].pk, 'claimed'), (self.claimed_by_other.pk, self.artists[1].pk, 'claimed')}
+        )
+        self.assertFalse(OpenLead.objects.filter(lead_id=self.open.pk).exists())
+        # archived leads stay in the status totals but no longer count as claimed
+        self.assertCountersConsistent([1, 1, 0])
+        self.assertEqual(archive_leads(horizon_days=180), 0)
+
+    def test_batch_skips_leads_flagged_since_it_was_read(self):
+        batch = list(archivable_leads(self.cutoff).order_by('pk').values_list('pk', flat=True))
+        FalseLeadClaim.objects.create(lead=self.claimed_by_other, artist=self.artists[1], reason='Wrong number')
+
+        self.assertEqual(_archive_batch(batch, self.cutoff), 3)
+        self.assertTrue(Lead.objects.filter(pk=self.claimed_by_other.pk).exists())
+        self.assertFalse(ArchivedLead.objects.filter(pk=self.claimed_by_other.pk).exists())
+        self.assertCountersConsistent([1, 2, 0])
+
+class LocationResolutionTests(TestCase):
+    """Lead locations prefer Location rows that can answer radius queries."""
+
+    def setUp(self):
+        # registration's get_or_create left a 0,0 copy before the real row
+        Location.objects.create(city='Pune', state='Maharashtra', lat=0.0, lng=0.0)
+        self.pune = Location.objects.create(city='Pune', state='Maharashtra', lat=18.52, lng=73.86)
+        self.nashik = Location.objects.create(city='Nashik', state='Maharashtra', lat=0.0, lng=0.0)
+
+    def test_rows_with_coordinates_win(self):
+        resolver = LocationResolver()
+        for text in ('Pune, Maharashtra', 'pune'):
+            self.assertEqual(resolve_location(text), self.pune)
+            self.assertEqual(resolver.resolve(text), self.pune)
+        # a city with only a 0,0 row still resolves, for city matching
+        self.assertEqual(resolve_location('Nashik'), self.nashik)
+
+    def test_command_reports_leads_without_coordinates(self):
+        Lead.objects.create(first_name='A', phone='9800000001', booking_date=date.today(), location='Pune')
+        Lead.objects.create(first_name='B', phone='9800000002', booking_date=date.today(), location='Nashik')
+        Lead.objects.update(resolved_location=None)
+
+        out = StringIO()
+        call_command('resolve_lead_locations', stdout=out)
+        self.assertIn('Resolved 2 lead locations', out.getvalue())
+        self.assertIn('1 leads matched a city whose Location has no coordinates', out.getvalue())
+        self.assertEqual(Lead.objects.get(phone='9800000001').resolved_location, self.pune)
+
+class OpenLeadSweepTests(TestCase):
+    """sweep_open_leads drops aged-out and booked leads from the feed index, once."""
+
+    def setUp(self):
+        self.leads = [
+            Lead.objects.create(first_name=f"Lead {i}", phone=f"98{i:08d}", booking_date=date.today(), is_verified=True)
+            for i in range(4)
+        ]
+        aged = timezone.now() - timedelta(days=31)
+        Lead.objects.filter(pk=self.leads[0].pk).update(created_at=aged)
+        OpenLead.objects.filter(lead_id=self.leads[0].pk).update(created_at=aged)
+        # queryset update: the post_save refresh never sees the booking
+        Lead.objects.filter(pk=self.leads[1].pk).update(total_bookings=1)
+
+    def test_sweep(self):
+        self.assertEqual(OpenLead.sweep(dry_run=True), 2)
+        self.assertEqual(OpenLead.objects.count(), 4)
+
+        self.assertEqual(OpenLead.sweep(batch_size=1), 2)
+        self.assertEqual(
+            set(OpenLead.objects.values_list('lead_id', flat=True)), {self.leads[2].pk, self.leads[3].pk}
+        )
+        self.assertEqual(OpenLead.sweep(), 0)
+
+    def test_aged_lead_is_not_reopened_on_save(self):
+        call_command('sweep_open_leads', stdout=StringIO())
+        lead = Lead.objects.get(pk=self.leads[0].pk)
+        lead.save()
+        self.assertFalse(OpenLead.objects.filter(lead_id=lead.pk).exists())
+
+
+class FakeUploader:
+    """Stands in for CloudinaryUploader; every upload waits until all of them have started."""
+
+    def __init__(self, parallel, fail=()):
+        self.barrier = threading.Barrier(parallel, timeout=5)
+        self.fail = set(fail)
+        self.uploaded = set()
+        self.deleted = set()
+        self.lock = threading.Lock()
+
+    def upload_file(self, file, folder=None, tags=None, resource_type='auto'):
+        self.barrier.wait()  # raises BrokenBarrierError if the uploads run one after another
+        if file.name in self.fail:
+            return {'error': 'upload rejected'}
+        with self.lock:
+            self.uploaded.add(file.name)
+        return {'url': f'https://files.test/{file.name}', 'public_id': file.name, 'resource_type': 'image'}
+
+    def delete_file(self, public_id, resource_type='image'):
+        with self.lock:
+            self.deleted.add(public_id)
+        return {'result': 'ok'}
+
+
+class RaiseFalseClaimUploadTests(TestCase):
+    """Proof documents upload concurrently and the claim is written only if all of them succeed."""
+
+    def setUp(self):
+        user = User.objects.create(username='artist', phone='9000000001')
+        ArtistProfile.objects.create(user=user, first_name='Asha', last_name='K', phone='9000000001', status='approved')
+        self.lead = Lead.objects.create(first_name='Lead', phone='9800000001', booking_date=date.today())
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def raise_claim(self, uploader, names):
+        files = [SimpleUploadedFile(name, b'proof', content_type='image/png') for name in names]
+        with mock.patch.object(RaiseFalseLeadClaimView, 'uploader', uploader):
+            return self.client.post(
+                '/api/leads/false-claims/',
+                {'lead': self.lead.pk, 'reason': 'Wrong number', 'proof_documents': files},
+                format='multipart'
+            )
+
+    def test_uploads_in_parallel_then_saves(self):
+        uploader = FakeUploader(parallel=3)
+        response = self.raise_claim(uploader, ['a.png', 'b.png', 'c.png'])
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            [doc['file_url'] for doc in response.data['claim']['proof_documents']],
+            ['https://files.test/a.png', 'https://files.test/b.png', 'https://files.test/c.png']
+        )
+        self.assertEqual(uploader.deleted, set())
+
+    def test_failed_upload_leaves_nothing_behind(self):
+        uploader = FakeUploader(parallel=3, fail={'b.png'})
+        response = self.raise_claim(uploader, ['a.png', 'b.png', 'c.png'])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('b.png', response.data['error'])
+        self.assertFalse(FalseLeadClaim.objects.exists())
+        self.assertFalse(FalseClaimDocument.objects.exists())
+        self.assertEqual(uploader.deleted, {'a.png', 'c.png'})
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class LeadEventsConsumerTests(TransactionTestCase):
+    """Realtime feed: artists hear about leads opening and closing in their cities."""
+
+    def setUp(self):
+        self.pune = Location.objects.create(city='Pune', state='MH')
+        self.delhi = Location.objects.create(city='Delhi', state='DL')
+        user = User.objects.create(username='artist', phone='9000000001')
+        self.artist = ArtistProfile.objects.create(
+            user=user, first_name='Asha', last_name='K', phone='9000000001',
+            available_leads=5, status='approved', preferred_locations=['Pune'],
+        )
+
+    def create_lead(self, location, phone='9800000001'):
+        return Lead.objects.create(
+            first_name='Lead', phone=phone, booking_date=date.today(), resolved_location=location, is_verified=True
+        )
+
+    @async_to_sync
+    async def exchange(self, token, action=None, application=None, headers=None):
+        """Connect with a token, run action (sync) and return (connected, messages received)."""
+        communicator = WebsocketCommunicator(
+            application or LeadEventsConsumer.as_asgi(), f'/ws/leads/?token={token}', headers=headers or []
+        )
+        connected, _ = await communicator.connect()
+        messages = []
+        if connected:
+            if action:
+                await database_sync_to_async(action)()
+            while not await communicator.receive_nothing(timeout=0.2):
+                messages.append(await communicator.receive_json_from())
+        await communicator.disconnect()
+        return connected, messages
+
+    def test_rejects_missing_or_invalid_token(self):
+        self.assertFalse(self.exchange('')[0])
+        self.assertFalse(self.exchange('not-a-token')[0])
+
+    def test_origin_check_of_asgi_application(self):
+        from wedmac_services.asgi import application
+        token = str(AccessToken.for_user(self.artist.user))
+
+        # native apps send no Origin; the web frontend sends its CORS origin
+        self.assertTrue(self.exchange(token, application=application)[0])
+        self.assertTrue(self.exchange(token, application=application, headers=[(b'origin', b'https://wedmacindia.com')])[0])
+        self.assertFalse(self.exchange(token, application=application, headers=[(b'origin', b'https://evil.example')])[0])
+
+    def test_channel_layer_outage_does_not_fail_the_write(self):
+        broken_layer = mock.Mock(group_send=mock.AsyncMock(side_effect=ConnectionError('redis down')))
+        with mock.patch('leads.utils.realtime.get_channel_layer', return_value=broken_layer), \
+                self.assertLogs('leads.utils.realtime', level='ERROR'):
+            lead = self.create_lead(self.pune)
+        self.assertTrue(OpenLead.objects.filter(lead_id=lead.pk).exists())
+
+    def test_pushes_open_and_close_for_preferred_city(self):
+        token = str(AccessToken.for_user(self.artist.user))
+
+        def open_and_close():
+            lead = self.create_lead(self.pune)
+            lead.is_verified = False
+            lead.save()
+            self.create_lead(self.delhi, phone='9800000002')
+
+        connected, messages = self.exchange(token, open_and_close)
+        self.assertTrue(connected)
+        lead_id = Lead.objects.get(resolved_location=self.pune).pk
+        self.assertEqual(messages, [
+            {'event': 'opened', 'lead_ids': [lead_id]},
+            {'event': 'closed', 'lead_ids': [lead_id]},
+        ])
 
-# Create your tests here.
@@ -18,10 +18,12 @@ from leads.views.admin_leads_count_view import AdminLeadStatusCountView
 from leads.views.selected_artist_view import SelectedArtistView
 from leads.views.set_max_claims_view import SetMaxClaimsView
 from leads.views.bulk_set_max_claims_view import BulkSetMaxClaimsView
+from leads.views.import_leads_view import ImportLeadsView
 
 urlpatterns = [
     path('admin/create/', AdminCreateLeadView.as_view(), name='admin-create-lead'),
     path('admin/create-multiple/', AdminCreateMultipleLeadsView.as_view(), name='admin-create-multiple-leads'),
+    path('admin/import/', ImportLeadsView.as_view(), name='admin-import-leads'),
     path('admin/delete/<int:lead_id>/', AdminDeleteLeadView.as_view(), name='admin-delete-lead'),
     path('admin/bulk-delete/', AdminBulkDeleteLeadsView.as_view(), name='admin-bulk-delete-leads'),
     path('admin/<int:lead_id>/set-verified/', AdminSetLeadVerifiedView.as_view(), name='admin-set-lead-verified'),
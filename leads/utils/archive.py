@@ -0,0 +1,119 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from leads.models.archive import ArchivedLead, ArchivedLeadArtist
+from leads.models.false_lead_claim import FalseLeadClaim
+from leads.models.models import Lead, suspended_counter_signals
+from leads.models.open_lead import OpenLead
+from leads.utils.counters import reconcile_my_claimed_leads
+from leads.utils.dashboard import invalidate_artist_dashboards
+from leads.utils.deletion import _active_lead_artist_ids, _assignee_ids
+
+# ------------------------------
+# ✅ Lead archive
+#
+# Leads created before the horizon (settings.LEAD_ARCHIVE_HORIZON_DAYS) are
+# moved, batch by batch, from leads_lead and its M2M tables into
+# ArchivedLead / ArchivedLeadArtist, so the hot tables only hold the window
+# the feed and admin listings actually read. Each batch is one transaction:
+# copy rows, copy relations, delete the originals. Only leads that are
+# done with are moved: the booking date has passed or the lead was marked
+# unqualified. An old lead for a wedding still ahead stays, because
+# artists reach it through their claimed leads, lead detail and booking
+# views, which only read leads_lead. Leads with false claims stay behind
+# because the admin review queue still points at them, and soft-deleted
+# leads are left to purge_deleted_leads.
+# ------------------------------
+
+ARCHIVE_BATCH_SIZE = 500
+# archivable whatever the booking date
+ARCHIVE_TERMINAL_STATUSES = ('unqualified',)
+
+_LEAD_COLUMNS = [field.attname for field in Lead._meta.concrete_fields]
+
+
+def archive_cutoff(horizon_days=None):
+    if horizon_days is None:
+        horizon_days = settings.LEAD_ARCHIVE_HORIZON_DAYS
+    return timezone.now() - timedelta(days=horizon_days)
+
+
+def archivable_leads(cutoff):
+    return (
+        Lead.objects
+        .filter(is_deleted=False, created_at__lt=cutoff)
+        .filter(Q(booking_date__lt=timezone.localdate()) | Q(status__in=ARCHIVE_TERMINAL_STATUSES))
+        .exclude(Exists(FalseLeadClaim.objects.filter(lead_id=OuterRef('pk'))))
+    )
+
+
+def _archive_batch(lead_ids, cutoff):
+    """Move one batch; returns the number of leads archived."""
+    with transaction.atomic():
+        # re-check under lock: a lead may have been claimed or flagged since the batch was read
+        rows = list(
+            archivable_leads(cutoff)
+            .filter(pk__in=lead_ids)
+            .select_for_update()
+            .values(*_LEAD_COLUMNS)
+        )
+        if not rows:
+            return 0
+        lead_ids = [row['id'] for row in rows]
+
+        makeup_ids = defaultdict(list)
+        makeup_rows = Lead.makeup_types.through.objects.filter(lead_id__in=lead_ids).values_list('lead_id', 'makeuptype_id')
+        for lead_id, makeup_id in makeup_rows:
+            makeup_ids[lead_id].append(makeup_id)
+
+        ArchivedLead.objects.bulk_create([
+            ArchivedLead(**row, makeup_type_ids=sorted(makeup_ids[row['id']])) for row in rows
+        ])
+
+        relations = []
+        for relation, through in (('claimed', Lead.claimed_artists.through), ('booked', Lead.booked_artists.through)):
+            pairs = through.objects.filter(lead_id__in=lead_ids).values_list('lead_id', 'artistprofile_id')
+            relations += [
+                ArchivedLeadArtist(lead_id=lead_id, artist_id=artist_id, relation=relation)
+                for lead_id, artist_id in pairs
+            ]
+        ArchivedLeadArtist.objects.bulk_create(relations)
+
+        affected_artists = _active_lead_artist_ids(lead_ids)
+        invalidate_artist_dashboards(_assignee_ids(lead_ids))
+        removed, _ = OpenLead.objects.filter(lead_id__in=lead_ids).delete()
+        if removed:
+            OpenLead.bump_version()
+
+        # archived leads stop counting towards my_claimed_leads; one grouped
+        # reconcile replaces the per-row pre_delete deltas
+        with suspended_counter_signals():
+            Lead.objects.filter(pk__in=lead_ids).delete()
+        if affected_artists:
+            reconcile_my_claimed_leads(affected_artists)
+
+    return len(lead_ids)
+
+
+def archive_leads(horizon_days=None, batch_size=ARCHIVE_BATCH_SIZE, dry_run=False):
+    """
+    Archive every archivable lead older than the horizon. Returns the number
+    of leads archived (or that would be, with dry_run).
+    """
+    cutoff = archive_cutoff(horizon_days)
+    candidates = archivable_leads(cutoff)
+    if dry_run:
+        return candidates.count()
+
+    archived = 0
+    last_id = 0
+    while True:
+        batch = list(candidates.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1]
+        archived += _archive_batch(batch, cutoff)
+    return archived
@@ -0,0 +1,151 @@
+from django.db import transaction, IntegrityError
+from django.db.models import Exists, OuterRef, F
+from django.utils import timezone
+from artists.models.models import ArtistProfile, ArtistActivityLog
+from leads.models.models import Lead, apply_claimed_lead_deltas, claimed_artist_ids
+from leads.models.open_lead import OpenLead
+from leads.models.status_count import LeadStatusCount, status_count_key
+from leads.utils.dashboard import invalidate_artist_dashboards
+from leads.utils.realtime import LEAD_CLOSED, publish_lead_events
+
+# ------------------------------
+# ✅ Claim engine
+#
+# A claim is a handful of short statements and takes no SELECT ... FOR
+# UPDATE on the happy path:
+#   1. snapshot read (no lock) for cheap rejections
+#   2. conditional UPDATE on the artist balance (available_leads > 0),
+#      balance read + activity log INSERT
+#   3. guarded UPDATE total_claims = total_claims + 1 WHERE total_claims <
+#      max_claims: capacity is the only guard, rowcount 0 means full
+#   4. conditional UPDATE status = 'claimed' WHERE status, assigned_to and
+#      the counters are still what the snapshot saw; rowcount 0 means the
+#      snapshot is stale and the row (ours since step 3) is read once more
+#   5. INSERT into the claim relation (unique on lead/artist)
+#      (+ my_claimed_leads / status counter deltas if the lead just turned 'claimed')
+#   6. drop the lead from the open index if it just became full
+# Any failed guard raises ClaimError and the transaction rolls back.
+# The lead row is only locked from step 3 to commit (the log write is done
+# before it), and always after the artist row, so concurrent claims queue
+# briefly instead of deadlocking.
+# ------------------------------
+
+class ClaimError(Exception):
+    def __init__(self, message, status_code=400, extra=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.extra = extra or {}
+
+
+def claim_snapshot(lead_id, artist_id):
+    """Unlocked read of the lead for the cheap rejections; may be stale by the time the guards run."""
+    claims = Lead.claimed_artists.through
+    return (
+        Lead.objects
+        .filter(pk=lead_id, is_deleted=False)
+        .annotate(already_claimed=Exists(claims.objects.filter(lead_id=OuterRef('pk'), artistprofile_id=artist_id)))
+        .values(
+            'status', 'assigned_to_id', 'max_claims', 'total_claims', 'already_claimed',
+            'created_at', 'source', 'resolved_location_id'
+        )
+        .first()
+    )
+
+
+def claim_lead(lead_id, artist_id):
+    """
+    Claim a lead for an artist. Returns a dict describing the claimed lead
+    or raises ClaimError with the HTTP status the view should answer with.
+    """
+    claims = Lead.claimed_artists.through
+
+    with transaction.atomic():
+        snapshot = claim_snapshot(lead_id, artist_id)
+        if snapshot is None:
+            raise ClaimError("Lead not found.", 404)
+        if snapshot['already_claimed']:
+            raise ClaimError("You have already claimed this lead.", 400)
+        if snapshot['total_claims'] >= snapshot['max_claims']:
+            raise ClaimError("Maximum claims reached for this lead.", 400)
+
+        debited = ArtistProfile.objects.filter(pk=artist_id, available_leads__gt=0).update(
+            available_leads=F('available_leads') - 1
+        )
+        if not debited:
+            raise ClaimError("No leads available. Please purchase more leads.", 403, {"available_leads": 0})
+
+        # balance and log before the lead row is touched, to keep its lock short
+        leads_after = ArtistProfile.objects.filter(pk=artist_id).values_list('available_leads', flat=True).get()
+        ArtistActivityLog.objects.create(
+            artist_id=artist_id,
+            activity_type='claim',
+            leads_before=leads_after + 1,
+            leads_after=leads_after,
+            details={
+                'lead_id': lead_id,
+                'lead_status': snapshot['status'],
+            }
+        )
+
+        # capacity is the only guard, so concurrent claims of a 'new' lead
+        # all succeed; this UPDATE locks the lead (always after the artist row)
+        now = timezone.now()
+        counted = Lead.objects.filter(pk=lead_id, is_deleted=False, total_claims__lt=F('max_claims')).update(
+            total_claims=F('total_claims') + 1, updated_at=now
+        )
+        if not counted:
+            if not Lead.objects.filter(pk=lead_id, is_deleted=False).exists():
+                raise ClaimError("Lead not found.", 404)
+            raise ClaimError("Maximum claims reached for this lead.", 400)
+
+        prev_status, assigned_to_id = snapshot['status'], snapshot['assigned_to_id']
+        total_claims, max_claims = snapshot['total_claims'] + 1, snapshot['max_claims']
+        confirmed = Lead.objects.filter(
+            pk=lead_id, status=prev_status, assigned_to_id=assigned_to_id,
+            total_claims=total_claims, max_claims=max_claims,
+        ).update(status='claimed')
+        if not confirmed:
+            # changed since the snapshot (usually a concurrent claim); the row
+            # is locked by the UPDATE above, so this read waits on nothing
+            prev_status, assigned_to_id, total_claims, max_claims = (
+                Lead.objects.select_for_update().filter(pk=lead_id)
+                .values_list('status', 'assigned_to_id', 'total_claims', 'max_claims').get()
+            )
+            if prev_status != 'claimed':
+                Lead.objects.filter(pk=lead_id).update(status='claimed')
+
+        try:
+            claims.objects.create(lead_id=lead_id, artistprofile_id=artist_id)
+        except IntegrityError:
+            # concurrent duplicate claim by the same artist
+            raise ClaimError("You have already claimed this lead.", 400)
+
+        if prev_status != 'claimed':
+            # lead just became active: every claimant and the assignee gain it
+            apply_claimed_lead_deltas(plus_ids=claimed_artist_ids(lead_id) | {assigned_to_id})
+            invalidate_artist_dashboards([assigned_to_id])
+            LeadStatusCount.apply({
+                status_count_key(prev_status, snapshot['created_at'], snapshot['source']): -1,
+                status_count_key('claimed', snapshot['created_at'], snapshot['source']): 1,
+            })
+        elif artist_id != assigned_to_id:
+            # lead already counts for its other claimants; only this artist gains it
+            apply_claimed_lead_deltas(plus_ids=[artist_id])
+
+        closed = 0
+        if total_claims >= max_claims:
+            closed, _ = OpenLead.objects.filter(lead_id=lead_id).delete()
+        if closed:
+            OpenLead.bump_version()
+            publish_lead_events(LEAD_CLOSED, [(lead_id, snapshot['resolved_location_id'])])
+
+    return {
+        "lead_id": lead_id,
+        "claimed_count": total_claims,
+        "max_claims": max_claims,
+        "status": 'claimed',
+        "available_leads": leads_after,
+        "created_at": snapshot['created_at'],
+        "updated_at": now,
+    }
@@ -0,0 +1,103 @@
+from collections import Counter
+from django.db.models import Count, OuterRef, Subquery, F, Q, Value, Case, When, IntegerField
+from django.db.models.functions import Coalesce
+from artists.models.models import ArtistProfile
+from leads.models.models import Lead
+
+# ------------------------------
+# ✅ Lead claim/booking counter reconciliation
+# ------------------------------
+
+def _relation_count_subquery(through):
+    return Subquery(
+        through.objects
+        .filter(lead_id=OuterRef('pk'))
+        .order_by()
+        .values('lead_id')
+        .annotate(c=Count('*'))
+        .values('c')
+    )
+
+
+def reconcile_lead_counters(batch_size=1000, dry_run=False):
+    """
+    Recompute Lead.total_claims / total_bookings from the M2M tables and
+    repair rows that drifted. Walks the table in primary-key chunks so each
+    UPDATE only touches a bounded range. Returns the number of drifted leads.
+    """
+    claims = Coalesce(_relation_count_subquery(Lead.claimed_artists.through), Value(0))
+    bookings = Coalesce(_relation_count_subquery(Lead.booked_artists.through), Value(0))
+
+    drifted_total = 0
+    last_id = 0
+    while True:
+        chunk_ids = list(
+            Lead.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not chunk_ids:
+            break
+        last_id = chunk_ids[-1]
+
+        drifted_ids = list(
+            Lead.objects
+            .filter(pk__in=chunk_ids)
+            .annotate(actual_claims=claims, actual_bookings=bookings)
+            .filter(~Q(total_claims=F('actual_claims')) | ~Q(total_bookings=F('actual_bookings')))
+            .values_list('pk', flat=True)
+        )
+        drifted_total += len(drifted_ids)
+
+        if drifted_ids and not dry_run:
+            Lead.objects.filter(pk__in=drifted_ids).update(total_claims=claims, total_bookings=bookings)
+
+    return drifted_total
+
+
+# ------------------------------
+# ✅ ArtistProfile.my_claimed_leads reconciliation
+# ------------------------------
+
+def _claimed_lead_counts(artist_ids):
+    """
+    Active-lead count per artist: leads with status 'claimed', not deleted,
+    where the artist is a claimant or the assignee (counted once).
+    """
+    claimed_pairs = Lead.claimed_artists.through.objects.filter(
+        artistprofile_id__in=artist_ids, lead__status='claimed', lead__is_deleted=False
+    ).values_list('artistprofile_id', 'lead_id')
+    assigned_pairs = Lead.objects.filter(
+        assigned_to_id__in=artist_ids, status='claimed', is_deleted=False
+    ).values_list('assigned_to_id', 'id')
+
+    return Counter(artist_id for artist_id, _ in set(claimed_pairs) | set(assigned_pairs))
+
+
+def reconcile_my_claimed_leads(artist_ids=None, batch_size=500, dry_run=False):
+    """
+    Deferred safety net for the delta accounting in leads.models.models.
+    Recomputes my_claimed_leads for the given artists (or all of them) with
+    two grouped reads per chunk and fixes drifted rows in a single UPDATE.
+    Returns the number of artists repaired.
+    """
+    if artist_ids is None:
+        artist_ids = ArtistProfile.objects.order_by('pk').values_list('pk', flat=True)
+    artist_ids = list(artist_ids)
+
+    repaired = 0
+    for start in range(0, len(artist_ids), batch_size):
+        chunk = artist_ids[start:start + batch_size]
+        actual = _claimed_lead_counts(chunk)
+        current = dict(ArtistProfile.objects.filter(pk__in=chunk).values_list('pk', 'my_claimed_leads'))
+
+        drifted = {pk: actual.get(pk, 0) for pk, value in current.items() if value != actual.get(pk, 0)}
+        repaired += len(drifted)
+
+        if drifted and not dry_run:
+            ArtistProfile.objects.filter(pk__in=drifted.keys()).update(
+                my_claimed_leads=Case(
+                    *[When(pk=pk, then=Value(count)) for pk, count in drifted.items()],
+                    output_field=IntegerField(),
+                )
+            )
+
+    return repaired
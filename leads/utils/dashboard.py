@@ -0,0 +1,58 @@
+from datetime import datetime, time, timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from leads.models.models import Lead
+
+# ------------------------------
+# ✅ Artist dashboard summary
+#
+# The summary numbers come from one conditional aggregate over the artist's
+# assigned new/claimed leads (served by leads_lead_assignee_idx) and are
+# cached per artist and day. Lead saves that touch an artist's assignments
+# and the bulk lead paths call invalidate_artist_dashboards(), which drops
+# the cached summary once the transaction commits.
+# ------------------------------
+
+DASHBOARD_CACHE_TTL = 600
+DASHBOARD_STATUSES = ('new', 'claimed')
+
+
+def dashboard_cache_key(artist_id, today=None):
+    # the week/month boundaries move with the date, so it is part of the key
+    today = today or timezone.now().date()
+    return f"artist_dashboard:{artist_id}:{today.isoformat()}"
+
+
+def dashboard_leads(artist_id):
+    return Lead.objects.filter(assigned_to_id=artist_id, status__in=DASHBOARD_STATUSES, is_deleted=False)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def dashboard_summary(artist_id):
+    """{"new_this_week", "total_this_month", "total"} for the artist, cached."""
+    today = timezone.now().date()
+    key = dashboard_cache_key(artist_id, today)
+    summary = cache.get(key)
+    if summary is not None:
+        return summary
+
+    start_of_week = _day_start(today - timedelta(days=today.weekday()))  # Monday
+    start_of_month = _day_start(today.replace(day=1))
+    summary = dashboard_leads(artist_id).aggregate(
+        new_this_week=Count('id', filter=Q(status='new', created_at__gte=start_of_week)),
+        total_this_month=Count('id', filter=Q(created_at__gte=start_of_month)),
+        total=Count('id'),
+    )
+    cache.set(key, summary, DASHBOARD_CACHE_TTL)
+    return summary
+
+
+def invalidate_artist_dashboards(artist_ids):
+    keys = [dashboard_cache_key(artist_id) for artist_id in set(artist_ids) - {None}]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
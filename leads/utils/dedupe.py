@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from appconfig.utils import MasterConfigManager
+from leads.models.models import Lead, lead_fingerprint
+from leads.utils.deletion import soft_delete_leads
+from leads.utils.locations import resolve_location
+from leads.utils.locks import advisory_lock
+
+DEDUPE_CONFIG_KEY = "LEAD_DEDUPE"
+DEFAULT_WINDOW_HOURS = 72
+DEDUPE_MODES = ('merge', 'reject', 'off')
+SUBMISSION_LOCK_TIMEOUT = 5
+
+# ------------------------------
+# ✅ Duplicate detection on submission
+# ------------------------------
+
+def get_dedupe_settings():
+    """
+    MasterConfig LEAD_DEDUPE, e.g. {"window_hours": 72, "mode": "merge"}.
+    mode 'merge' folds a repeat submission into the earlier lead, 'reject'
+    refuses it, 'off' disables the check.
+    """
+    config = MasterConfigManager.get_config(DEDUPE_CONFIG_KEY, {}) or {}
+    mode = config.get('mode', 'merge')
+    if mode not in DEDUPE_MODES:
+        mode = 'merge'
+    try:
+        window_hours = float(config.get('window_hours', DEFAULT_WINDOW_HOURS))
+    except (TypeError, ValueError):
+        window_hours = DEFAULT_WINDOW_HOURS
+    return mode, window_hours
+
+
+def find_duplicate(phone, booking_date, window_hours, requested_artist_id=None):
+    """Earliest live lead with the same fingerprint created inside the window (one indexed lookup)."""
+    fingerprint = lead_fingerprint(phone, booking_date, requested_artist_id)
+    if not fingerprint:
+        return None
+    since = timezone.now() - timedelta(hours=window_hours)
+    return (
+        Lead.objects
+        .filter(fingerprint=fingerprint, is_deleted=False, created_at__gte=since)
+        .order_by('id')
+        .first()
+    )
+
+
+@contextmanager
+def submission_lock(fingerprint):
+    """
+    Serialize submissions sharing a fingerprint, so a double-submit cannot
+    pass find_duplicate twice before either lead is saved. Hold it around
+    the check and the committed insert; yields whether it was acquired
+    (always, without a fingerprint).
+    """
+    if not fingerprint:
+        yield True
+        return
+    with advisory_lock(f"lead_submission:{fingerprint}", timeout=SUBMISSION_LOCK_TIMEOUT) as acquired:
+        yield acquired
+
+
+MERGEABLE_FIELDS = ('first_name', 'last_name', 'email', 'service', 'event_type', 'requirements', 'budget_range', 'location')
+
+
+def merge_submission(lead, validated_data):
+    """Fill fields the earlier submission left blank and add any new makeup types."""
+    changed = []
+    for field in MERGEABLE_FIELDS:
+        value = validated_data.get(field)
+        if value and not getattr(lead, field):
+            setattr(lead, field, value)
+            changed.append(field)
+
+    if 'location' in changed:
+        # keep the city/radius matching in step with the merged text
+        lead.resolved_location = resolve_location(lead.location)
+        changed.append('resolved_location')
+
+    makeup_types = validated_data.get('makeup_types') or []
+    if makeup_types:
+        lead.makeup_types.add(*makeup_types)
+
+    if changed:
+        lead.save(update_fields=changed + ['updated_at'])
+    return lead
+
+# ------------------------------
+# ✅ Backfill: fingerprints + collapse existing duplicates
+# ------------------------------
+
+def backfill_fingerprints(batch_size=1000):
+    """Compute fingerprint for leads saved before the column existed. Returns rows updated."""
+    updated = 0
+    last_id = 0
+    while True:
+        batch = list(
+            Lead.objects.filter(pk__gt=last_id, fingerprint__isnull=True)
+            .exclude(phone__isnull=True).exclude(phone='')
+            .order_by('pk').only('id', 'phone', 'booking_date', 'requested_artist_id')[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].pk
+
+        changed = []
+        for lead in batch:
+            lead.fingerprint = lead_fingerprint(lead.phone, lead.booking_date, lead.requested_artist_id)
+            if lead.fingerprint:
+                changed.append(lead)
+        Lead.objects.bulk_update(changed, ['fingerprint'])
+        updated += len(changed)
+    return updated
+
+
+def collapse_duplicates(dry_run=False):
+    """
+    Soft-delete repeat leads, keeping the earliest lead of every fingerprint.
+    Duplicates that were already claimed, booked or disputed are left alone
+    because artists paid credits for them. Returns (groups, collapsed_ids).
+    """
+    groups = (
+        Lead.objects
+        .filter(is_deleted=False, fingerprint__isnull=False)
+        .values('fingerprint')
+        .annotate(total=Count('id'), keep_id=Min('id'))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    keep_ids = {row['fingerprint']: row['keep_id'] for row in groups}
+    if not keep_ids:
+        return 0, []
+
+    candidates = (
+        Lead.objects
+        .filter(is_deleted=False, fingerprint__in=list(keep_ids), total_claims=0, total_bookings=0, false_claims__isnull=True)
+        .exclude(pk__in=list(keep_ids.values()))
+        .values_list('pk', flat=True)
+    )
+    collapse_ids = list(candidates)
+
+    if collapse_ids and not dry_run:
+        with transaction.atomic():
+            soft_delete_leads(collapse_ids)
+    return len(keep_ids), collapse_ids
@@ -0,0 +1,105 @@
+from collections import Counter
+from django.db import transaction
+from datetime import timedelta
+from django.utils import timezone
+from leads.models.models import Lead
+from leads.models.open_lead import OpenLead
+from leads.models.status_count import LeadStatusCount, status_count_key
+from leads.utils.counters import reconcile_my_claimed_leads
+from leads.utils.dashboard import invalidate_artist_dashboards
+from leads.utils.realtime import LEAD_CLOSED, publish_lead_events
+
+DELETE_CHUNK_SIZE = 1000
+
+# ------------------------------
+# ✅ Set-based soft delete
+# ------------------------------
+
+def _assignee_ids(lead_ids):
+    return set(
+        Lead.objects.filter(pk__in=lead_ids, assigned_to__isnull=False)
+        .order_by().values_list('assigned_to_id', flat=True).distinct()
+    )
+
+
+def _active_lead_artist_ids(lead_ids):
+    """Artists whose my_claimed_leads includes any of these leads (claimants and assignees of active leads)."""
+    claimants = Lead.claimed_artists.through.objects.filter(
+        lead_id__in=lead_ids, lead__status='claimed', lead__is_deleted=False
+    ).values_list('artistprofile_id', flat=True)
+    assignees = Lead.objects.filter(
+        pk__in=lead_ids, status='claimed', is_deleted=False, assigned_to__isnull=False
+    ).values_list('assigned_to_id', flat=True)
+    return set(claimants) | set(assignees)
+
+
+def soft_delete_leads(lead_ids):
+    """
+    Mark leads deleted with one UPDATE per chunk of ids, drop them from the
+    open index and reconcile my_claimed_leads for the artists they counted
+    towards in one grouped pass. Returns (deleted_ids, not_found_ids);
+    leads that were already deleted count as not found.
+    """
+    lead_ids = list(dict.fromkeys(lead_ids))
+    deleted_ids = []
+    affected_artists = set()
+    now = timezone.now()
+
+    with transaction.atomic():
+        for start in range(0, len(lead_ids), DELETE_CHUNK_SIZE):
+            chunk = lead_ids[start:start + DELETE_CHUNK_SIZE]
+            live = list(
+                Lead.objects.filter(pk__in=chunk, is_deleted=False).select_for_update()
+                .values_list('pk', 'status', 'created_at', 'source', 'assigned_to_id', 'resolved_location_id')
+            )
+            if not live:
+                continue
+            live_ids = [row[0] for row in live]
+
+            affected_artists |= _active_lead_artist_ids(live_ids)
+            invalidate_artist_dashboards(row[4] for row in live)
+            # queryset update: no per-row save signals, counters are settled here and below
+            Lead.objects.filter(pk__in=live_ids, is_deleted=False).update(
+                is_deleted=True, deleted_at=now, updated_at=now
+            )
+            status_deltas = Counter()
+            for _, status, created_at, source, _, _ in live:
+                status_deltas[status_count_key(status, created_at, source)] -= 1
+            LeadStatusCount.apply(status_deltas)
+            removed, _ = OpenLead.objects.filter(lead_id__in=live_ids).delete()
+            if removed:
+                OpenLead.bump_version()
+                publish_lead_events(LEAD_CLOSED, [(row[0], row[5]) for row in live])
+            deleted_ids.extend(live_ids)
+
+        if affected_artists:
+            reconcile_my_claimed_leads(affected_artists)
+
+    deleted = set(deleted_ids)
+    return deleted_ids, [lead_id for lead_id in lead_ids if lead_id not in deleted]
+
+# ------------------------------
+# ✅ Hard purge of old soft-deleted leads
+# ------------------------------
+
+def purge_deleted_leads(older_than_days=90, batch_size=500, dry_run=False):
+    """
+    Hard-delete leads soft-deleted more than `older_than_days` ago, one
+    batch (and one transaction) at a time so locks stay short. Returns the
+    number of leads purged (or that would be, with dry_run).
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    candidates = Lead.objects.filter(is_deleted=True, deleted_at__lt=cutoff)
+    if dry_run:
+        return candidates.count()
+
+    purged = 0
+    while True:
+        batch = list(candidates.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            # cascades to claim/booking rows, false claims and documents
+            Lead.objects.filter(pk__in=batch).delete()
+        purged += len(batch)
+    return purged
@@ -1,7 +1,22 @@
 from artists.models.models import ArtistProfile
-from artists.models.models import ArtistSubscription
+from leads.models.models import Lead
 from leads.models.lead_distribution_rule import LeadDistributionConfig, LeadDistributionRule
+from leads.models.status_count import LeadStatusCount, status_count_key
+from leads.utils.dashboard import invalidate_artist_dashboards
 from django.db import transaction
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Value, ExpressionWrapper
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from datetime import timedelta
+from collections import Counter
+import heapq
+
+POINTER_KEY = "CURRENT_ARTIST_POINTER"
+DEFAULT_ARTIST_KEY = "DEFAULT_ARTIST_ID"
+
+# capacity_based: score = available_leads * tier / (1 + recent load)
+RECENT_LOAD_DAYS = 7
+PLAN_TIER_SCALE = 100.0
 
 # ------------------------------
 # ✅ Config Utilities
@@ -13,6 +28,19 @@ def get_config_value(key, default=None):
     except LeadDistributionConfig.DoesNotExist:
         return default
 
+
+def lock_scheduler_state():
+    """
+    Lock the scheduler row for the rest of the transaction. Every assignment
+    goes through this row, so concurrent workers hand out artists one at a
+    time instead of reading the same pointer.
+    """
+    try:
+        return LeadDistributionConfig.objects.select_for_update().get(key=POINTER_KEY)
+    except LeadDistributionConfig.DoesNotExist:
+        LeadDistributionConfig.objects.get_or_create(key=POINTER_KEY, defaults={"value": ""})
+        return LeadDistributionConfig.objects.select_for_update().get(key=POINTER_KEY)
+
 # ------------------------------
 # ✅ Strategy Resolver
 # ------------------------------
@@ -21,92 +49,206 @@ def get_active_distribution_strategy():
     active_rule = LeadDistributionRule.objects.filter(is_active=True).first()
     return active_rule.strategy if active_rule else None
 
+
+def eligible_artists():
+    return ArtistProfile.objects.filter(status='approved', available_leads__gt=0)
+
 # ------------------------------
 # ✅ Round Robin Logic
 # ------------------------------
 
-def get_next_artist_round_robin():
-    # Fetch all eligible artists
-    artists = ArtistProfile.objects.filter(status='approved').order_by('id')
-
-    if not artists.exists():
-        return None
-
-    # Get the last used pointer from config
-    pointer = get_config_value("CURRENT_ARTIST_POINTER")
-    pointer = int(pointer) if pointer and pointer.isdigit() else None
+def plan_round_robin(state, count):
+    """
+    Artist ids for the next `count` leads in rotation after the pointer.
+    Reads at most 2 * count eligible artists (ids after the pointer, then
+    from the start) and walks them in memory, each artist taking leads up
+    to their balance. Advances the pointer to the last artist used.
+    """
+    pointer = int(state.value) if state.value.isdigit() else 0
+
+    artists = eligible_artists().order_by('id')
+    rotation = list(artists.filter(id__gt=pointer).values_list('id', 'available_leads')[:count])
+    if len(rotation) < count:
+        rotation += list(artists.filter(id__lte=pointer).values_list('id', 'available_leads')[:count - len(rotation)])
+
+    balances = dict(rotation)
+    order = [artist_id for artist_id, _ in rotation]
+    picks = []
+    position = 0
+    while len(picks) < count and order:
+        artist_id = order[position % len(order)]
+        picks.append(artist_id)
+        balances[artist_id] -= 1
+        if balances[artist_id] <= 0:
+            order.remove(artist_id)
+        else:
+            position += 1
+        if order:
+            position %= len(order)
+
+    if picks:
+        state.value = str(picks[-1])
+        state.save(update_fields=['value'])
+    return picks
 
-    artist_ids = list(artists.values_list('id', flat=True))
+# ------------------------------
+# ✅ Capacity Based Logic
+# ------------------------------
 
-    try:
-        current_index = artist_ids.index(pointer)
-        next_index = (current_index + 1) % len(artist_ids)
-    except ValueError:
-        next_index = 0  # fallback to first artist if pointer is invalid
-
-    next_artist_id = artist_ids[next_index]
-    next_artist = ArtistProfile.objects.get(id=next_artist_id)
-
-    # Update the pointer in config
-    LeadDistributionConfig.objects.update_or_create(
-        key="CURRENT_ARTIST_POINTER",
-        defaults={"value": str(next_artist_id)}
+def capacity_ranked_artists(since=None):
+    """
+    Eligible artists annotated with plan_tier, recent_load and
+    capacity_score, best first. Plan tier grows with the plan's lead
+    allowance; recent load is the number of leads assigned to the artist in
+    the last RECENT_LOAD_DAYS.
+    """
+    since = since or timezone.now() - timedelta(days=RECENT_LOAD_DAYS)
+    recent_load = (
+        Lead.objects
+        .filter(assigned_to=OuterRef('pk'), is_deleted=False, created_at__gte=since)
+        .order_by()
+        .values('assigned_to')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    return (
+        eligible_artists()
+        .annotate(
+            recent_load=Coalesce(Subquery(recent_load), 0),
+            plan_tier=ExpressionWrapper(
+                Value(1.0) + Cast(Coalesce(F('current_plan__total_leads'), 0), FloatField()) / Value(PLAN_TIER_SCALE),
+                output_field=FloatField(),
+            ),
+        )
+        .annotate(capacity_score=ExpressionWrapper(
+            Cast(F('available_leads'), FloatField()) * F('plan_tier') / (Value(1.0) + Cast(F('recent_load'), FloatField())),
+            output_field=FloatField(),
+        ))
+        .order_by('-capacity_score', 'id')
     )
 
-    return next_artist
+
+def plan_capacity_based(state, count):
+    """
+    Artist ids for the next `count` leads, each going to the artist with the
+    best capacity score at that point. Only the top `count` artists can win
+    a lead in a batch of `count`, so that is all that is read; scores are
+    then updated in memory as balances drop and load grows.
+    """
+    top = capacity_ranked_artists().values_list('id', 'available_leads', 'recent_load', 'plan_tier')[:count]
+
+    heap = []
+    artists = {}
+    for artist_id, balance, load, tier in top:
+        artists[artist_id] = [balance, load, tier]
+        heapq.heappush(heap, (-(balance * tier / (1 + load)), artist_id))
+
+    picks = []
+    while heap and len(picks) < count:
+        _, artist_id = heapq.heappop(heap)
+        picks.append(artist_id)
+        entry = artists[artist_id]
+        entry[0] -= 1
+        entry[1] += 1
+        if entry[0] > 0:
+            heapq.heappush(heap, (-(entry[0] * entry[2] / (1 + entry[1])), artist_id))
+    return picks
 
 # ------------------------------
 # ✅ Main Assignment Function
 # ------------------------------
-from django.utils import timezone
 
-def assign_lead_automatically(lead):
+STRATEGIES = {
+    'round_robin': plan_round_robin,
+    'capacity_based': plan_capacity_based,
+}
+
+
+def debit_artist(artist_id, count=1):
+    """Guarded balance deduction; returns False if the artist ran out meanwhile."""
+    return bool(ArtistProfile.objects.filter(pk=artist_id, available_leads__gte=count).update(
+        available_leads=F('available_leads') - count
+    ))
+
+
+def _default_artist():
+    default_artist_id = get_config_value(DEFAULT_ARTIST_KEY)
+    if not default_artist_id or not str(default_artist_id).isdigit():
+        return None
+    return ArtistProfile.objects.filter(id=int(default_artist_id), status="approved").select_related('user').first()
+
+
+def assign_leads_in_batch(leads):
+    """
+    Assign a batch of newly created leads with the active strategy. Strategy, scheduler
+    state and eligible artists are read once; assignments are planned in
+    memory and written with one bulk_update plus one guarded balance UPDATE
+    per artist. Leads left over (no eligible artist, or an artist who spent
+    their credits concurrently) go to the DEFAULT_ARTIST_ID fallback if set.
+
+    Returns {lead_id: ArtistProfile or None}.
+    """
+    leads = list(leads)
+    if not leads:
+        return {}
+
     with transaction.atomic():
         strategy = get_active_distribution_strategy()
 
         if not strategy:
             print("No active distribution strategy found. Skipping automatic assignment.")
-            return None
+            return {lead.id: None for lead in leads}
 
-        artist = None
+        plan = STRATEGIES.get(strategy)
         print(f"Active distribution strategy: {strategy}")
 
-        if strategy == 'round_robin':
-            artist = get_next_artist_round_robin()
-
-        # Validate artist eligibility
-        if artist:
-            if artist.status != "approved":
-                print(f"Artist {artist} is not approved.")
-                artist = None
-            elif artist.available_leads <= 0:
-                print(f"Artist {artist} has no available leads.")
-                artist = None
-
-        if artist:
-            # Assign the lead and deduct available lead
-            lead.assigned_to = artist
-            lead.status = "contacted"
-            lead.save()
-
-            # Deduct one lead from available_leads
-            artist.available_leads = max(0, artist.available_leads - 1)
-            artist.save()
-
-            print(f"Lead assigned to artist: {artist}")
-            return artist
-
-        # ✅ Fallback artist if strategy is active but no eligible artist found
-        default_artist_id = get_config_value("DEFAULT_ARTIST_ID")
-        if default_artist_id:
-            try:
-                default_artist = ArtistProfile.objects.get(id=int(default_artist_id))
-                if default_artist.status == "approved":
-                    lead.assigned_to = default_artist
-                    lead.status = "contacted"
-                    lead.save()
-                    return default_artist
-            except ArtistProfile.DoesNotExist:
-                return None
+        picks = []
+        if plan:
+            state = lock_scheduler_state()
+            picks = plan(state, len(leads))
+
+        # Deduct credits per artist; a concurrent claim may have spent them
+        wanted = {}
+        for artist_id in picks:
+            wanted[artist_id] = wanted.get(artist_id, 0) + 1
+        funded = {artist_id for artist_id, count in wanted.items() if debit_artist(artist_id, count)}
+
+        assignments = {}
+        for lead, artist_id in zip(leads, picks):
+            if artist_id in funded:
+                assignments[lead.id] = artist_id
+
+        unassigned = [lead for lead in leads if lead.id not in assignments]
+        default_artist = _default_artist() if unassigned else None
+        if default_artist:
+            for lead in unassigned:
+                assignments[lead.id] = default_artist.id
+
+        if not assignments:
+            return {lead.id: None for lead in leads}
+
+        artists = ArtistProfile.objects.select_related('user').in_bulk(set(assignments.values()))
+        now = timezone.now()
+        changed = []
+        status_deltas = Counter()
+        for lead in leads:
+            artist_id = assignments.get(lead.id)
+            if artist_id:
+                status_deltas[status_count_key(lead.status, lead.created_at, lead.source)] -= 1
+                lead.assigned_to = artists[artist_id]
+                lead.status = "contacted"
+                lead.updated_at = now
+                status_deltas[status_count_key(lead.status, lead.created_at, lead.source)] += 1
+                changed.append(lead)
+
+        # new leads are unclaimed, so assignment touches no counters or the open index
+        Lead.objects.bulk_update(changed, ['assigned_to', 'status', 'updated_at'])
+        LeadStatusCount.apply(status_deltas)
+        invalidate_artist_dashboards(artists)
+
+        print(f"Assigned {len(changed)} of {len(leads)} leads")
+        return {lead.id: artists.get(assignments.get(lead.id)) for lead in leads}
 
-        return None
+
+def assign_lead_automatically(lead):
+    return assign_leads_in_batch([lead]).get(lead.id)
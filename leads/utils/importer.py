@@ -0,0 +1,385 @@
+import csv
+import io
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from django.db import connection, transaction
+from adminpanel.master_data import master_data, lookup_key
+from leads.models.models import Lead, lead_fingerprint
+from leads.models.open_lead import OpenLead
+from leads.models.status_count import LeadStatusCount, status_count_key
+from leads.utils.realtime import LEAD_OPENED, publish_lead_events
+from leads.utils.locations import LocationResolver
+
+# ------------------------------
+# ✅ Bulk lead import (CSV / JSONL)
+#
+# Rows are parsed one at a time from the stream, validated against the
+# master data registry snapshot, deduped on the normalized phone number and
+# written in chunks: one bulk_create for the leads, one for the makeup type
+# through rows and one for the open-lead index per chunk. Memory is bounded
+# by the chunk size plus the set of phone numbers seen so far. Imported
+# leads are unverified unless the import says otherwise, so a bought or
+# scraped list goes through admin review before it reaches the artist feed.
+# ------------------------------
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 200
+DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y')
+
+_LIST_SPLIT_RE = re.compile(r'[,|;]')
+
+
+def normalize_phone(value):
+    """Last 10 digits of an Indian mobile number ('+91 98765-43210' → '9876543210')."""
+    digits = re.sub(r'\D', '', str(value or ''))
+    if len(digits) < 10:
+        return None
+    return digits[-10:]
+
+
+def phone_variants(phone10):
+    """Stored spellings a 10-digit number may already exist under."""
+    return [phone10, f"+91{phone10}", f"91{phone10}", f"0{phone10}"]
+
+
+def detect_format(filename, default='csv'):
+    name = (filename or '').lower()
+    if name.endswith('.jsonl') or name.endswith('.ndjson'):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def iter_rows(stream, fmt):
+    """
+    Yield (row_number, row) from a binary or text stream without reading it
+    whole. Malformed JSONL lines are yielded as (row_number, ValueError).
+    """
+    if isinstance(stream, (io.TextIOBase, io.StringIO)):
+        text = stream
+    else:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(text), start=2):
+            yield number, {(key or '').strip().lower(): value for key, value in row.items()}
+        return
+
+    for number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield number, ValueError("Each line must be a JSON object.")
+            continue
+        yield number, row
+
+
+class ImportMasterData:
+    """Master data snapshot and locations, fixed for the whole import."""
+
+    def __init__(self):
+        self.snapshot = master_data.snapshot()
+        self.makeup_ids = set(self.snapshot.makeup_types)
+        self.makeup_by_name = {name: row.id for name, row in self.snapshot.makeup_types_by_name.items()}
+        self.budget_by_label = {label: row.id for label, row in self.snapshot.budget_ranges_by_label.items()}
+        self.service_ids = set(self.snapshot.services)
+        self.service_by_name = {name: row.id for name, row in self.snapshot.services_by_name.items()}
+        self.locations = LocationResolver()
+
+    def budget_for_value(self, value):
+        budget = self.snapshot.budget_index.find(value)
+        return budget.id if budget else None
+
+
+def assign_inserted_ids(leads):
+    """
+    Set the pks of leads just bulk-inserted on a backend that does not return
+    them. bulk_create stamps every object with its own created_at, stored to
+    the microsecond, so each row is found by (phone, created_at) and a lead
+    with the same phone inserted concurrently is never picked up instead.
+    """
+    rows = (
+        Lead.objects
+        .filter(
+            phone__in={lead.phone for lead in leads},
+            created_at__range=(min(lead.created_at for lead in leads), max(lead.created_at for lead in leads)),
+        )
+        .values_list('phone', 'created_at', 'id')
+    )
+    ids = {(phone, created_at): pk for phone, created_at, pk in rows}
+    for lead in leads:
+        lead.pk = ids[(lead.phone, lead.created_at)]
+
+
+class LeadImporter:
+    """
+    Streams rows into Lead rows. Usage:
+
+        report = LeadImporter(created_by=user).run(uploaded_file, 'csv')
+    """
+
+    def __init__(self, created_by=None, source=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False,
+                 max_errors=MAX_REPORTED_ERRORS, verified=False):
+        self.created_by = created_by
+        self.default_source = source
+        self.verified = verified
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.max_errors = max_errors
+
+        self.event_types = {key for key, _ in Lead.EVENT_CHOICES}
+        self.sources = {key for key, _ in Lead.SOURCE_CHOICES}
+
+        self.seen_phones = set()
+        self.rows = 0
+        self.created = 0
+        self.duplicates = 0
+        self.errors = []
+        self.error_counts = Counter()
+
+    # ------------------------------
+    # Row validation
+    # ------------------------------
+
+    def _error(self, number, field, message):
+        self.error_counts[f"{field}: {message}"] += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": number, "field": field, "error": message})
+
+    def _parse_date(self, value):
+        value = str(value or '').strip()
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                continue
+        return None
+
+    def _parse_makeup_types(self, value):
+        if value in (None, ''):
+            return [], None
+        names = value if isinstance(value, list) else _LIST_SPLIT_RE.split(str(value))
+        makeup_ids = []
+        for name in names:
+            if isinstance(name, int):
+                if name not in self.master.makeup_ids:
+                    return None, f"Makeup type with ID '{name}' does not exist."
+                makeup_ids.append(name)
+                continue
+            name = str(name).strip()
+            if not name:
+                continue
+            makeup_id = self.master.makeup_by_name.get(lookup_key(name))
+            if makeup_id is None:
+                return None, f"Makeup type '{name}' does not exist."
+            makeup_ids.append(makeup_id)
+        return sorted(set(makeup_ids)), None
+
+    def _parse_budget(self, value):
+        if value in (None, ''):
+            return None, None
+        text = str(value).strip()
+        budget_id = self.master.budget_by_label.get(lookup_key(text))
+        if budget_id:
+            return budget_id, None
+        try:
+            amount = Decimal(text.replace(',', '').lstrip('₹'))
+        except InvalidOperation:
+            return None, f"Unknown budget range '{text}'."
+        budget_id = self.master.budget_for_value(amount)
+        if budget_id is None:
+            return None, f"No budget range found for value {text}."
+        return budget_id, None
+
+    def _parse_service(self, value):
+        if value in (None, ''):
+            return None, None
+        text = str(value).strip()
+        if text.isdigit() and int(text) in self.master.service_ids:
+            return int(text), None
+        service_id = self.master.service_by_name.get(lookup_key(text))
+        if service_id is None:
+            return None, f"Service '{text}' does not exist."
+        return service_id, None
+
+    def build_lead(self, number, row):
+        """Validate one row. Returns (Lead, makeup_ids) or None after recording errors."""
+        phone = normalize_phone(row.get('phone'))
+        if not phone:
+            self._error(number, 'phone', "A valid 10 digit phone number is required.")
+            return None
+
+        booking_date = self._parse_date(row.get('booking_date'))
+        if booking_date is None:
+            self._error(number, 'booking_date', "Use YYYY-MM-DD, DD-MM-YYYY or DD/MM/YYYY.")
+            return None
+
+        event_type = str(row.get('event_type') or '').strip().lower() or None
+        if event_type and event_type not in self.event_types:
+            self._error(number, 'event_type', f"'{event_type}' is not a valid choice.")
+            return None
+
+        source = str(row.get('source') or self.default_source or '').strip().lower() or None
+        if source and source not in self.sources:
+            self._error(number, 'source', f"'{source}' is not a valid choice.")
+            return None
+
+        max_claims = row.get('max_claims')
+        if max_claims in (None, ''):
+            max_claims = Lead._meta.get_field('max_claims').default
+        else:
+            try:
+                max_claims = int(max_claims)
+                if max_claims < 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                self._error(number, 'max_claims', "Must be a non-negative integer.")
+                return None
+
+        makeup_ids, message = self._parse_makeup_types(row.get('makeup_types'))
+        if message:
+            self._error(number, 'makeup_types', message)
+            return None
+
+        budget_id, message = self._parse_budget(row.get('budget_range'))
+        if message:
+            self._error(number, 'budget_range', message)
+            return None
+
+        service_id, message = self._parse_service(row.get('service'))
+        if message:
+            self._error(number, 'service', message)
+            return None
+
+        # dedupe last, so invalid rows do not claim a phone number
+        if phone in self.seen_phones:
+            self.duplicates += 1
+            return None
+        self.seen_phones.add(phone)
+
+        location = str(row.get('location') or '').strip() or None
+        lead = Lead(
+            first_name=str(row.get('first_name') or '').strip() or None,
+            last_name=str(row.get('last_name') or '').strip() or None,
+            phone=phone,
+            email=str(row.get('email') or '').strip() or None,
+            service_id=service_id,
+            event_type=event_type,
+            requirements=str(row.get('requirements') or ''),
+            booking_date=booking_date,
+            budget_range_id=budget_id,
+            location=location,
+            resolved_location=self.master.locations.resolve(location),
+            source=source,
+            max_claims=max_claims,
+            is_verified=self.verified,
+            notes=str(row.get('notes') or ''),
+            created_by=self.created_by,
+        )
+        # bulk_create bypasses Lead.save()
+        lead.fingerprint = lead_fingerprint(phone, booking_date)
+        return lead, makeup_ids
+
+    # ------------------------------
+    # Chunk writes
+    # ------------------------------
+
+    def _drop_existing(self, chunk):
+        """Drop rows whose phone already belongs to a lead in the database."""
+        variants = {}
+        for lead, _ in chunk:
+            for variant in phone_variants(lead.phone):
+                variants[variant] = lead.phone
+        existing = {
+            variants[stored]
+            for stored in Lead.objects.filter(phone__in=list(variants)).values_list('phone', flat=True)
+        }
+        if not existing:
+            return chunk
+        self.duplicates += sum(1 for lead, _ in chunk if lead.phone in existing)
+        return [(lead, makeup_ids) for lead, makeup_ids in chunk if lead.phone not in existing]
+
+    def _flush(self, chunk):
+        chunk = self._drop_existing(chunk)
+        if not chunk or self.dry_run:
+            self.created += len(chunk)
+            return
+
+        with transaction.atomic():
+            leads = Lead.objects.bulk_create([lead for lead, _ in chunk])
+
+            if not connection.features.can_return_rows_from_bulk_insert:
+                # MySQL does not hand back ids
+                assign_inserted_ids(leads)
+
+            through = Lead.makeup_types.through
+            through.objects.bulk_create([
+                through(lead_id=lead.pk, makeuptype_id=makeup_id)
+                for lead, (_, makeup_ids) in zip(leads, chunk)
+                for makeup_id in makeup_ids
+            ])
+
+            # bulk_create skips post_save, so open-index rows and status counts are written here
+            LeadStatusCount.apply(Counter(status_count_key(lead.status, lead.created_at, lead.source) for lead in leads))
+            open_rows = [OpenLead(lead_id=lead.pk, created_at=lead.created_at) for lead in leads if OpenLead.is_lead_open(lead)]
+            OpenLead.objects.bulk_create(open_rows)
+            if open_rows:
+                OpenLead.bump_version()
+                publish_lead_events(LEAD_OPENED, [
+                    (lead.pk, lead.resolved_location_id) for lead in leads if OpenLead.is_lead_open(lead)
+                ])
+
+        self.created += len(leads)
+
+    # ------------------------------
+    # Entry point
+    # ------------------------------
+
+    def run(self, stream, fmt='csv'):
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}.")
+
+        self.master = ImportMasterData()
+        chunk = []
+        for number, row in iter_rows(stream, fmt):
+            self.rows += 1
+            if isinstance(row, Exception):
+                self._error(number, 'row', str(row))
+                continue
+
+            built = self.build_lead(number, row)
+            if built is None:
+                continue
+            chunk.append(built)
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+
+        if chunk:
+            self._flush(chunk)
+
+        return self.report()
+
+    def report(self):
+        invalid = sum(self.error_counts.values())
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "invalid": invalid,
+            "dry_run": self.dry_run,
+            "error_summary": dict(self.error_counts.most_common()),
+            "errors": self.errors,
+            "errors_truncated": invalid > len(self.errors),
+        }
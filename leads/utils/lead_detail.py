@@ -0,0 +1,57 @@
+import hashlib
+from django.core.cache import cache
+from django.db import transaction
+from leads.models.models import Lead
+
+# ------------------------------
+# ✅ Lead detail validators and cache
+#
+# The ETag of a lead's detail view comes from one narrow read:
+# updated_at, detail_changed_at and the claim/booking counters. Claims and
+# bookings move the counters even when updated_at does not change.
+# detail_changed_at is stamped on a lead when a related row its payload
+# embeds (service, budget range, makeup types, artists, creator) really
+# changes; see the receivers in leads.models.models. Both live on the lead
+# row, so every process sees the same ETag. The serialized payload is
+# cached briefly together with the ETag it was built for. A cached payload
+# is only served while its ETag still matches, and lead saves also drop
+# it after commit.
+# ------------------------------
+
+LEAD_DETAIL_CACHE_TTL = 300
+
+
+def lead_detail_cache_key(lead_id):
+    return f"lead_detail:{lead_id}"
+
+
+def lead_detail_validators(lead_id):
+    """(etag, last_modified) for a live lead, or None if it does not exist or is deleted."""
+    row = (
+        Lead.objects.filter(pk=lead_id, is_deleted=False)
+        .values_list('updated_at', 'detail_changed_at', 'total_claims', 'total_bookings')
+        .first()
+    )
+    if row is None:
+        return None
+    updated_at, detail_changed_at, total_claims, total_bookings = row
+    detail_changed_at = detail_changed_at or updated_at
+    version = f"{lead_id}:{updated_at.isoformat()}:{detail_changed_at.isoformat()}:{total_claims}:{total_bookings}"
+    return f'"{hashlib.md5(version.encode()).hexdigest()}"', max(updated_at, detail_changed_at)
+
+
+def cached_lead_detail(lead_id, etag):
+    cached = cache.get(lead_detail_cache_key(lead_id))
+    if cached and cached['etag'] == etag:
+        return cached['data']
+    return None
+
+
+def cache_lead_detail(lead_id, etag, data):
+    cache.set(lead_detail_cache_key(lead_id), {'etag': etag, 'data': data}, LEAD_DETAIL_CACHE_TTL)
+
+
+def invalidate_lead_detail(lead_ids):
+    keys = [lead_detail_cache_key(lead_id) for lead_id in set(lead_ids) - {None}]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,127 @@
+import math
+from django.db.models import Case, F, IntegerField, Q, Value, When, FloatField, ExpressionWrapper
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+from artists.models.models import Location
+
+EARTH_RADIUS_KM = 6371.0
+
+# ------------------------------
+# ✅ Location text → Location row
+# ------------------------------
+
+def normalize_city(text):
+    return " ".join((text or "").split()).lower()
+
+
+def split_location_text(text):
+    """'Pune, Maharashtra' → ('pune', 'maharashtra'); 'Pune' → ('pune', None)."""
+    parts = [normalize_city(part) for part in (text or "").split(",")]
+    parts = [part for part in parts if part]
+    if not parts:
+        return None, None
+    return parts[0], (parts[1] if len(parts) > 1 else None)
+
+
+def with_coordinates_first(locations):
+    """
+    Order Location rows so ones with real coordinates come first (then by
+    id): registration's get_or_create leaves 0.0/0.0 duplicates of a city,
+    and a lead resolved to one of those never matches a radius query.
+    """
+    missing = Q(lat__isnull=True) | Q(lng__isnull=True) | Q(lat=0.0, lng=0.0)
+    return locations.annotate(
+        coordinates_rank=Case(When(missing, then=Value(1)), default=Value(0), output_field=IntegerField())
+    ).order_by('coordinates_rank', 'id')
+
+
+def resolve_location(text):
+    """Resolve free-text lead location to a Location row via the city/state index."""
+    city, state = split_location_text(text)
+    if not city:
+        return None
+    locations = Location.objects.filter(city__iexact=city)
+    if state:
+        exact = with_coordinates_first(locations.filter(state__iexact=state)).first()
+        if exact:
+            return exact
+    return with_coordinates_first(locations).first()
+
+
+class LocationResolver:
+    """
+    In-memory resolver for bulk paths: loads the Location table once and
+    resolves any number of texts without further queries. Same preference
+    as resolve_location: rows with coordinates, then the lowest id.
+    """
+
+    def __init__(self):
+        self.by_city_state = {}
+        self.by_city = {}
+        for location in with_coordinates_first(Location.objects.all()):
+            city, state = normalize_city(location.city), normalize_city(location.state)
+            self.by_city_state.setdefault((city, state), location)
+            self.by_city.setdefault(city, location)
+
+    def resolve(self, text):
+        city, state = split_location_text(text)
+        if not city:
+            return None
+        if state and (city, state) in self.by_city_state:
+            return self.by_city_state[(city, state)]
+        return self.by_city.get(city)
+
+
+def city_location_ids(city_names):
+    """Location ids for a list of city names (e.g. ArtistProfile.preferred_locations)."""
+    names = {normalize_city(name) for name in city_names or [] if isinstance(name, str) and name.strip()}
+    if not names:
+        return []
+    query = Q()
+    for name in names:
+        query |= Q(city__iexact=name)
+    return list(Location.objects.filter(query).values_list('id', flat=True))
+
+
+def has_coordinates(location):
+    # registration stores 0.0/0.0 when the client sends no coordinates
+    return bool(location) and location.lat is not None and location.lng is not None and (location.lat, location.lng) != (0.0, 0.0)
+
+# ------------------------------
+# ✅ Radius queries (bounding box + haversine)
+# ------------------------------
+
+def bounding_box(lat, lng, radius_km):
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    # longitude degrees shrink towards the poles
+    lng_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * max(math.cos(math.radians(lat)), 1e-6)))
+    return lat - lat_delta, lat + lat_delta, lng - lng_delta, lng + lng_delta
+
+
+def haversine_km(lat_field, lng_field, lat, lng):
+    """ORM expression for the great-circle distance in km from (lat, lng)."""
+    lat_rad = Radians(F(lat_field))
+    d_lat = Radians(F(lat_field) - Value(float(lat)))
+    d_lng = Radians(F(lng_field) - Value(float(lng)))
+    a = (
+        Power(Sin(d_lat / Value(2.0)), 2)
+        + Cos(lat_rad) * Value(math.cos(math.radians(lat))) * Power(Sin(d_lng / Value(2.0)), 2)
+    )
+    return ExpressionWrapper(Value(2.0 * EARTH_RADIUS_KM) * ASin(Sqrt(a)), output_field=FloatField())
+
+
+def filter_within_radius(leads, lat, lng, radius_km, prefix='resolved_location__'):
+    """
+    Narrow a lead queryset to leads within radius_km of (lat, lng). The
+    bounding box uses the Location (lat, lng) index; the exact haversine
+    check only runs on rows inside the box. Annotates distance_km.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    return (
+        leads
+        .filter(**{
+            f'{prefix}lat__range': (min_lat, max_lat),
+            f'{prefix}lng__range': (min_lng, max_lng),
+        })
+        .annotate(distance_km=haversine_km(f'{prefix}lat', f'{prefix}lng', lat, lng))
+        .filter(distance_km__lte=radius_km)
+    )
@@ -0,0 +1,54 @@
+import time
+import zlib
+from contextlib import contextmanager
+from django.db import connection
+
+# ------------------------------
+# ✅ Database advisory locks
+#
+# Named, session-level locks for work that must not run twice at once:
+# jobs cron fires on every app server, and request paths that check then
+# insert (duplicate lead submissions). MySQL uses GET_LOCK/RELEASE_LOCK and
+# PostgreSQL pg_try_advisory_lock; other backends (SQLite in development)
+# have a single writer and always acquire.
+# The lock is released when the block exits or the connection drops.
+# ------------------------------
+
+PG_RETRY_SECONDS = 0.05
+
+
+def _pg_key(name):
+    return zlib.crc32(name.encode())
+
+
+@contextmanager
+def advisory_lock(name, timeout=0):
+    """
+    Take the named lock, waiting up to `timeout` seconds (0: do not wait);
+    yields whether it was acquired. MySQL limits names to 64 characters.
+    """
+    vendor = connection.vendor
+    with connection.cursor() as cursor:
+        if vendor == 'mysql':
+            cursor.execute("SELECT GET_LOCK(%s, %s)", [name, timeout])
+            acquired = bool(cursor.fetchone()[0])
+        elif vendor == 'postgresql':
+            deadline = time.monotonic() + timeout
+            while True:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", [_pg_key(name)])
+                acquired = bool(cursor.fetchone()[0])
+                if acquired or time.monotonic() >= deadline:
+                    break
+                time.sleep(PG_RETRY_SECONDS)
+        else:
+            acquired = True
+
+    try:
+        yield acquired
+    finally:
+        if acquired and vendor in ('mysql', 'postgresql'):
+            with connection.cursor() as cursor:
+                if vendor == 'mysql':
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", [name])
+                else:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [_pg_key(name)])
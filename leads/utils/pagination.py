@@ -0,0 +1,118 @@
+import base64
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+# ------------------------------
+# ✅ Keyset (cursor) pagination on (created_at, id)
+# ------------------------------
+
+def encode_cursor(created_at, pk):
+    raw = f"{created_at.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Returns (created_at, pk) for a cursor produced by encode_cursor.
+    Raises ValueError for anything else.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_part, pk_part = raw.rsplit('|', 1)
+        created_at = parse_datetime(created_part)
+        pk = int(pk_part)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor.")
+    if created_at is None:
+        raise ValueError("Invalid cursor.")
+    return created_at, pk
+
+
+def parse_page_size(value, default=20, maximum=100):
+    """Parse a page size query param. Raises ValueError on bad input."""
+    if value in (None, ''):
+        return default
+    size = int(value)
+    if size < 1:
+        raise ValueError("Page size must be a positive integer.")
+    return min(size, maximum)
+
+
+def keyset_rows(queryset, cursor=None, limit=20, fields=('created_at', 'id')):
+    """Up to `limit` rows newest-first after the cursor (no lookahead handling)."""
+    created_field, pk_field = fields
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{created_field}__lt': created_at}) |
+            Q(**{created_field: created_at, f'{pk_field}__lt': pk})
+        )
+    return list(queryset.order_by(f'-{created_field}', f'-{pk_field}')[:limit])
+
+
+def paginate_by_keyset(queryset, cursor=None, page_size=20, fields=('created_at', 'id'), row_key=None):
+    """
+    Newest-first keyset pagination. Seeks past the cursor instead of using
+    OFFSET, so every page is one indexed range scan and no COUNT is needed.
+
+    `fields` are the ORM paths ordered on (descending); `row_key` extracts
+    the matching (created_at, pk) values from a fetched row and defaults to
+    (row.created_at, row.pk).
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if row_key is None:
+        row_key = lambda row: (row.created_at, row.pk)
+
+    rows = keyset_rows(queryset, cursor=cursor, limit=page_size + 1, fields=fields)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = encode_cursor(*row_key(rows[-1])) if has_more and rows else None
+    return rows, next_cursor
+
+
+def paginate_merged_by_keyset(querysets, cursor=None, page_size=20):
+    """
+    paginate_by_keyset across several querysets sharing the (created_at, id)
+    ordering and id space, e.g. live and archived leads. Each contributes at
+    most page_size + 1 rows; they are merged in memory.
+    """
+    rows = []
+    for queryset in querysets:
+        rows += keyset_rows(queryset, cursor=cursor, limit=page_size + 1)
+
+    rows.sort(key=lambda row: (row.created_at, row.pk), reverse=True)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].pk) if has_more and rows else None
+    return rows, next_cursor
+
+
+def estimate_count(queryset):
+    """
+    Planner row estimate for a queryset, used when admins opt out of an exact
+    COUNT on large ranges. Falls back to an exact count on backends without a
+    usable estimate.
+    """
+    connection = connections[queryset.db]
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [col[0] for col in cursor.description]
+            row = dict(zip(columns, cursor.fetchone()))
+        rows = row.get('rows') or 0
+        filtered = row.get('filtered') or 100
+        return int(rows * float(filtered) / 100)
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    return queryset.count()
@@ -0,0 +1,58 @@
+import logging
+from collections import defaultdict
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------
+# ✅ Realtime lead events
+#
+# When a lead enters or leaves the open-lead index a compact event
+# ({"event": "opened" | "closed", "lead_ids": [...]}) is sent, after
+# commit, to the channel group of the lead's city and to the catch-all
+# group. LeadEventsConsumer (ws/leads/) joins an artist to the groups of
+# their preferred cities, or to the catch-all group when they have none;
+# on "opened" the client fetches the feed with ?since= to get the new rows.
+# ------------------------------
+
+ALL_LEADS_GROUP = 'leads.all'
+LEAD_OPENED = 'opened'
+LEAD_CLOSED = 'closed'
+
+
+def location_group(location_id):
+    return f'leads.location.{location_id}'
+
+
+def _send(messages):
+    # runs after commit: a channel layer outage must not turn a saved change into a 500
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        for group, message in messages:
+            async_to_sync(channel_layer.group_send)(group, message)
+    except Exception:
+        logger.exception(f"Could not publish lead events to {len(messages)} groups")
+
+
+def publish_lead_events(event, leads):
+    """
+    Queue an event for leads given as (lead_id, resolved_location_id)
+    pairs; it is sent once the surrounding transaction commits.
+    """
+    lead_ids_by_group = defaultdict(list)
+    for lead_id, location_id in leads:
+        lead_ids_by_group[ALL_LEADS_GROUP].append(lead_id)
+        if location_id:
+            lead_ids_by_group[location_group(location_id)].append(lead_id)
+    if not lead_ids_by_group:
+        return
+
+    messages = [
+        (group, {'type': 'lead.event', 'event': event, 'lead_ids': lead_ids})
+        for group, lead_ids in lead_ids_by_group.items()
+    ]
+    transaction.on_commit(lambda: _send(messages))
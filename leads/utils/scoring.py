@@ -0,0 +1,147 @@
+import hashlib
+import json
+import re
+from collections import defaultdict
+from datetime import date
+from django.core.cache import cache
+from leads.models.models import Lead
+from leads.models.open_lead import OpenLead
+from leads.utils.locations import city_location_ids
+
+# ------------------------------
+# ✅ Lead ↔ artist relevance scoring
+#
+# Score out of 100 per open lead for one artist:
+#   location   40  lead city is the artist's city or one of their preferred_locations
+#   makeup     30  share of the lead's makeup_types the artist offers
+#   budget     20  overlap of the lead budget_range with the artist price_range
+#   date       10  sooner bookings rank higher, fading out over DATE_HORIZON_DAYS
+# Candidates are fetched as flat value tuples (two queries in total) and
+# scored in one pass; the ranked id list is cached per artist and keyed on
+# the open-lead version, so any lead opening or closing invalidates it.
+# ------------------------------
+
+WEIGHT_LOCATION = 40
+WEIGHT_MAKEUP = 30
+WEIGHT_BUDGET = 20
+WEIGHT_DATE = 10
+DATE_HORIZON_DAYS = 180
+RANKING_CACHE_TTL = 600
+
+_AMOUNT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([kK])?')
+
+
+def parse_price_range(text):
+    """
+    '₹5,000 - ₹10,000' → (5000.0, 10000.0); '15k+' → (15000.0, None);
+    'Below 5000' → (None, 5000.0). Returns (None, None) when nothing parses.
+    """
+    amounts = []
+    for number, thousands in _AMOUNT_RE.findall(text or ''):
+        value = float(number.replace(',', ''))
+        amounts.append(value * 1000 if thousands else value)
+    if not amounts:
+        return None, None
+    if len(amounts) == 1:
+        if re.search(r'below|under|upto|up to|<', text, re.IGNORECASE):
+            return None, amounts[0]
+        return amounts[0], None
+    return min(amounts), max(amounts)
+
+
+def artist_features(artist):
+    """Everything about the artist the scorer needs, as plain values."""
+    location_ids = set(city_location_ids(artist.preferred_locations))
+    if artist.location_id:
+        location_ids.add(artist.location_id)
+    return {
+        'location_ids': sorted(location_ids),
+        'makeup_ids': sorted(artist.type_of_makeup.values_list('id', flat=True)),
+        'price_range': parse_price_range(artist.price_range),
+    }
+
+
+def _budget_fit(lead_min, lead_max, artist_min, artist_max):
+    if artist_min is None and artist_max is None:
+        return 0.0
+    if lead_min is None and lead_max is None:
+        return 0.0
+    low = max(lead_min if lead_min is not None else 0.0, artist_min if artist_min is not None else 0.0)
+    high = min(
+        lead_max if lead_max is not None else float('inf'),
+        artist_max if artist_max is not None else float('inf'),
+    )
+    return 1.0 if low <= high else 0.0
+
+
+def _date_fit(booking_date, today):
+    if booking_date is None:
+        return 0.0
+    days = (booking_date - today).days
+    if days < 0:
+        return 0.0
+    return max(0.0, 1.0 - days / DATE_HORIZON_DAYS)
+
+
+def score_candidates(candidates, makeup_by_lead, features, today=None):
+    """
+    Score candidate rows of (id, resolved_location_id, budget_min, budget_max,
+    booking_date). Returns [(lead_id, score)] best first, newest id on ties.
+    """
+    today = today or date.today()
+    location_ids = set(features['location_ids'])
+    makeup_ids = set(features['makeup_ids'])
+    artist_min, artist_max = features['price_range']
+
+    scored = []
+    for lead_id, location_id, budget_min, budget_max, booking_date in candidates:
+        score = WEIGHT_LOCATION if location_id in location_ids else 0.0
+
+        lead_makeup = makeup_by_lead.get(lead_id)
+        if lead_makeup and makeup_ids:
+            score += WEIGHT_MAKEUP * len(lead_makeup & makeup_ids) / len(lead_makeup)
+
+        score += WEIGHT_BUDGET * _budget_fit(
+            float(budget_min) if budget_min is not None else None,
+            float(budget_max) if budget_max is not None else None,
+            artist_min,
+            artist_max,
+        )
+        score += WEIGHT_DATE * _date_fit(booking_date, today)
+        scored.append((lead_id, round(score, 2)))
+
+    scored.sort(key=lambda row: (-row[1], -row[0]))
+    return scored
+
+
+def rank_leads(leads, artist, filters=None):
+    """
+    Ranked [(lead_id, score)] for an already filtered lead queryset. The
+    result is cached per artist features, open-lead version and `filters`,
+    the request inputs the queryset was built from. The queryset's own SQL
+    is not part of the key: it can carry per-request values (e.g. a "now"
+    bound) that would make every key unique.
+    """
+    features = artist_features(artist)
+    digest = hashlib.sha1(
+        json.dumps([features, sorted((filters or {}).items())], default=str).encode()
+    ).hexdigest()
+    cache_key = f"lead_ranking:{artist.pk}:{OpenLead.current_version()}:{digest}"
+
+    ranking = cache.get(cache_key)
+    if ranking is not None:
+        return ranking
+
+    candidates = list(leads.order_by().values_list(
+        'id', 'resolved_location_id', 'budget_range__min_value', 'budget_range__max_value', 'booking_date'
+    ).distinct())
+
+    makeup_by_lead = defaultdict(set)
+    through = Lead.makeup_types.through
+    rows = through.objects.filter(lead_id__in=[row[0] for row in candidates]).values_list('lead_id', 'makeuptype_id')
+    for lead_id, makeup_id in rows:
+        makeup_by_lead[lead_id].add(makeup_id)
+
+    ranking = score_candidates(candidates, makeup_by_lead, features)
+    cache.set(cache_key, ranking, RANKING_CACHE_TTL)
+    return ranking
@@ -0,0 +1,55 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from media.cloudinary import CloudinaryUploader
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------
+# ✅ Parallel file uploads
+#
+# Files of one request are pushed to the uploader concurrently on a small
+# thread pool, so the request waits for the slowest upload instead of the
+# sum of all of them. Either every file is uploaded or none is kept: when
+# any upload fails the ones that succeeded are deleted again. The uploader
+# is anything with CloudinaryUploader's upload_file/delete_file interface.
+# ------------------------------
+
+UPLOAD_MAX_WORKERS = 4
+
+
+class UploadError(Exception):
+    pass
+
+
+def delete_uploads(results, uploader=CloudinaryUploader):
+    """Best-effort removal of uploaded assets (upload_file results)."""
+    for result in results:
+        outcome = uploader.delete_file(result['public_id'], resource_type=result.get('resource_type') or 'image')
+        if 'error' in outcome:
+            logger.warning(f"Could not delete orphaned upload {result['public_id']}: {outcome['error']}")
+
+
+def upload_files(files, folder=None, uploader=CloudinaryUploader, max_workers=UPLOAD_MAX_WORKERS):
+    """
+    Upload all files concurrently. Returns the upload_file results in the
+    order of `files`; raises UploadError (after cleaning up) if any failed.
+    """
+    if not files:
+        return []
+
+    def _upload(file):
+        try:
+            return uploader.upload_file(file, folder=folder)
+        except Exception as e:
+            # keep one failure from hiding the results needed for cleanup
+            return {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as pool:
+        results = list(pool.map(_upload, files))
+
+    failed = [(file, result) for file, result in zip(files, results) if 'error' in result]
+    if failed:
+        delete_uploads([result for result in results if 'error' not in result], uploader=uploader)
+        file, result = failed[0]
+        raise UploadError(f"{file.name}: {result['error']}")
+    return results
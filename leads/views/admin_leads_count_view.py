@@ -3,25 +3,30 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models.functions import Lower
-from django.db.models import Count
-from leads.models.models import Lead
+from django.utils.dateparse import parse_date
+from leads.models.status_count import LeadStatusCount
 
 class AdminLeadStatusCountView(APIView):
     """
     Returns lead counts grouped by status for admin dashboard.
-    Only includes non-deleted leads.
+    Only includes non-deleted leads (archived ones included). Reads the
+    LeadStatusCount table; ?start_date / ?end_date (YYYY-MM-DD, by lead
+    creation day) and ?source narrow it down.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        status_counts = (
-            Lead.objects
-            .filter(is_deleted=False)
-            .annotate(status_lower=Lower('status'))
-            .values('status_lower')
-            .annotate(count=Count('id'))
-            .order_by()
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+        start_day = parse_date(start_date) if start_date else None
+        end_day = parse_date(end_date) if end_date else None
+        if (start_date and start_day is None) or (end_date and end_day is None):
+            return Response({"error": "start_date and end_date must be YYYY-MM-DD."}, status=400)
+
+        status_counts = LeadStatusCount.totals(
+            start_day=start_day,
+            end_day=end_day,
+            source=request.query_params.get('source'),
         )
 
         result = {
@@ -32,9 +37,7 @@ class AdminLeadStatusCountView(APIView):
             "converted": 0
         }
 
-        for item in status_counts:
-            status = item['status_lower']
-            count = item['count']
+        for status, count in status_counts.items():
             if status in result:
                 result[status] = count
 
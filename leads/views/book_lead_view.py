@@ -33,7 +33,7 @@ class BookLeadView(APIView):
                 return Response({"error": "Lead not found."}, status=404)
 
             # 4. Check if lead is already booked by another artist
-            if lead.booked_artists.exists():
+            if lead.total_bookings > 0:
                 return Response({"error": "This lead has already been booked by another artist."}, status=400)
 
             # 5. Check if artist has claimed this lead
@@ -44,17 +44,17 @@ class BookLeadView(APIView):
             if lead.booked_artists.filter(id=artist_profile.id).exists():
                 return Response({"error": "You have already booked this lead."}, status=400)
 
-            # 6. Add to booked_artists and set status to 'booked'
+            # 6. Add to booked_artists (bumps total_bookings) and set status to 'booked'
             lead.booked_artists.add(artist_profile)
             lead.status = 'booked'
-            lead.save()
+            lead.save(update_fields=['status', 'updated_at'])
 
             return Response({
                 "message": "Lead booked successfully.",
                 "lead_id": lead.id,
                 "status": lead.status,
                 "available_leads": artist_profile.available_leads,
-                "booked_count": lead.booked_artists.count(),
+                "booked_count": lead.total_bookings,
                 "created_at": lead.created_at,
                 "updated_at": lead.updated_at
             }, status=200)
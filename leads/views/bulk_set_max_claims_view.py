@@ -3,10 +3,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
 from rest_framework import status as drf_status
 from leads.models.models import Lead
+from leads.models.open_lead import OpenLead
+from django.db import transaction
+from django.db.models import Count, Sum
 
 class BulkSetMaxClaimsView(APIView):
     """
     Admin-only API to set the maximum number of artists that can claim ALL leads at once.
+    Validation and statistics are grouped aggregates; nothing iterates leads in Python.
     """
     permission_classes = [IsAdminUser]
 
@@ -23,27 +27,33 @@ class BulkSetMaxClaimsView(APIView):
         # Get all non-deleted leads
         leads = Lead.objects.filter(is_deleted=False)
 
-        if not leads.exists():
-            return Response({"error": "No leads found to update."}, status=drf_status.HTTP_404_NOT_FOUND)
-
-        # Check if any lead has more claimed artists than the new max_claims
-        problematic_leads = []
-        for lead in leads:
-            current_claimed_count = lead.claimed_artists.count()
-            if current_claimed_count > max_claims:
-                problematic_leads.append({
-                    "lead_id": lead.id,
-                    "current_claimed_count": current_claimed_count
-                })
-
-        if problematic_leads:
-            return Response({
-                "error": f"Cannot set max_claims to {max_claims}. The following leads have more claimed artists:",
-                "problematic_leads": problematic_leads
-            }, status=drf_status.HTTP_400_BAD_REQUEST)
-
-        # Update all leads with the new max_claims
-        updated_count = leads.update(max_claims=max_claims)
+        with transaction.atomic():
+            total_leads = leads.count()
+            if not total_leads:
+                return Response({"error": "No leads found to update."}, status=drf_status.HTTP_404_NOT_FOUND)
+
+            # Leads with more claimed artists than the new max_claims (GROUP BY ... HAVING)
+            problematic_leads = [
+                {"lead_id": row['lead_id'], "current_claimed_count": row['current_claimed_count']}
+                for row in Lead.claimed_artists.through.objects
+                .filter(lead__is_deleted=False)
+                .values('lead_id')
+                .annotate(current_claimed_count=Count('id'))
+                .filter(current_claimed_count__gt=max_claims)
+                .order_by('lead_id')
+            ]
+
+            if problematic_leads:
+                return Response({
+                    "error": f"Cannot set max_claims to {max_claims}. The following leads have more claimed artists:",
+                    "problematic_leads": problematic_leads
+                }, status=drf_status.HTTP_400_BAD_REQUEST)
+
+            # One guarded UPDATE: a lead claimed past the new limit since the check is left alone
+            updated_count = leads.filter(total_claims__lte=max_claims).update(max_claims=max_claims)
+
+            # .update() skips signals, so resync leads that became full or reopened
+            OpenLead.rebuild()
 
         return Response({
             "message": f"Max claims updated successfully for {updated_count} leads.",
@@ -57,24 +67,31 @@ class BulkSetMaxClaimsView(APIView):
         """
         leads = Lead.objects.filter(is_deleted=False)
 
-        if not leads.exists():
+        # Totals in one aggregate over the counter columns
+        totals = leads.aggregate(
+            total_leads=Count('id'),
+            leads_with_max_claims=Count('max_claims'),
+            total_claimed_artists=Sum('total_claims'),
+            total_booked_artists=Sum('total_bookings'),
+        )
+        total_leads = totals['total_leads']
+
+        if not total_leads:
             return Response({"error": "No leads found."}, status=drf_status.HTTP_404_NOT_FOUND)
 
-        # Calculate statistics
-        total_leads = leads.count()
-        leads_with_max_claims = leads.filter(max_claims__isnull=False).count()
+        leads_with_max_claims = totals['leads_with_max_claims']
         leads_without_max_claims = total_leads - leads_with_max_claims
-
-        # Get distribution of max_claims values
-        max_claims_distribution = {}
-        for lead in leads:
-            if lead.max_claims is not None:
-                key = str(lead.max_claims)
-                max_claims_distribution[key] = max_claims_distribution.get(key, 0) + 1
-
-        # Get overall statistics
-        total_claimed_artists = sum(lead.claimed_artists.count() for lead in leads)
-        total_booked_artists = sum(lead.booked_artists.count() for lead in leads)
+        total_claimed_artists = totals['total_claimed_artists'] or 0
+        total_booked_artists = totals['total_booked_artists'] or 0
+
+        # Get distribution of max_claims values (GROUP BY max_claims)
+        max_claims_distribution = {
+            str(row['max_claims']): row['count']
+            for row in leads.filter(max_claims__isnull=False)
+            .values('max_claims')
+            .annotate(count=Count('id'))
+            .order_by('max_claims')
+        }
 
         return Response({
             "total_leads": total_leads,
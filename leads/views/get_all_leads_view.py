@@ -3,125 +3,184 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from leads.models.models import Lead
 from leads.serializers.serializers import LeadSerializer
+from leads.utils.pagination import paginate_by_keyset, parse_page_size
+from leads.utils.locations import city_location_ids, filter_within_radius, has_coordinates
+from leads.utils.scoring import rank_leads
+from django.db.models import Q
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.dateparse import parse_datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+FEED_DEFAULT_PAGE_SIZE = 50
+FEED_MAX_PAGE_SIZE = 100
+FEED_DEFAULT_RADIUS_KM = 25
+FEED_MAX_RADIUS_KM = 500
+
 class GetAllLeadsView(APIView):
+    """
+    Artist lead feed. Reads the maintained open-lead index (verified, not
+    deleted, not booked, not full) and pages through it with a cursor.
+
+    Location params: ?location=<city> (indexed city match), ?preferred=true
+    (the artist's preferred_locations), ?near_me=true&radius_km=25 (radius
+    around the artist's own Location).
+
+    ?since=<ISO datetime> limits the feed to leads updated after that moment;
+    clients use it to catch up after a realtime "opened" event (ws/leads/).
+
+    ?sort=relevance ranks the filtered feed for the artist (see
+    leads.utils.scoring) and pages with ?offset instead of a cursor.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        limit_param = request.query_params.get('limit', None)
         location_filter = request.query_params.get('location', None)
         name_filter = request.query_params.get('name', None)
         makeup_type_filter = request.query_params.get('makeup_type', None)
+        cursor = request.query_params.get('cursor', None)
+        preferred_only = str(request.query_params.get('preferred', '')).lower() == 'true'
+        near_me = str(request.query_params.get('near_me', '')).lower() == 'true'
+        sort = request.query_params.get('sort', 'newest').strip().lower()
 
-        user = request.user
-        artist_profile = None
-        excluded_lead_ids = []
+        if sort not in ('newest', 'relevance'):
+            return Response({"error": "Invalid sort parameter. Use 'newest' or 'relevance'."}, status=400)
 
-        # Get artist profile with better error handling
         try:
-            if hasattr(user, 'artist_profile'):
-                artist_profile = user.artist_profile
-                logger.info(f"User {user.id} has artist profile: {artist_profile.id if artist_profile else None}")
-            else:
-                logger.info(f"User {user.id} does not have artist_profile attribute")
-        except Exception as e:
-            logger.error(f"Error accessing artist profile for user {user.id}: {str(e)}")
+            page_size = parse_page_size(
+                request.query_params.get('limit', None),
+                default=FEED_DEFAULT_PAGE_SIZE,
+                maximum=FEED_MAX_PAGE_SIZE
+            )
+        except ValueError:
+            return Response({"error": "Invalid limit parameter. Must be a positive integer."}, status=400)
 
-        # Start with all non-deleted and verified leads
-        leads = Lead.objects.filter(is_deleted=False, is_verified=True).order_by('-created_at')
+        since = request.query_params.get('since', None)
+        if since:
+            since = parse_datetime(since.replace(' ', '+'))  # unencoded '+' in the offset arrives as a space
+            if since is None:
+                return Response({"error": "Invalid since parameter. Use an ISO 8601 datetime."}, status=400)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        user = request.user
+        # RelatedObjectDoesNotExist is an AttributeError, so getattr covers users without a profile
+        artist_profile = getattr(user, 'artist_profile', None)
+
+        # Leads in the open-lead index; the sweeper keeps it to the active window
+        leads = Lead.objects.filter(open_entry__isnull=False)
+
+        if since:
+            leads = leads.filter(updated_at__gt=since)
 
         # Apply filters before other exclusions
         if location_filter:
-            leads = leads.filter(location__icontains=location_filter)
+            location_ids = city_location_ids([location_filter])
+            if location_ids:
+                leads = leads.filter(resolved_location_id__in=location_ids)
+            else:
+                # text that matches no known city: fall back to a substring match
+                leads = leads.filter(location__icontains=location_filter)
+
+        if preferred_only and artist_profile:
+            leads = leads.filter(resolved_location_id__in=city_location_ids(artist_profile.preferred_locations))
+
+        if near_me:
+            artist_location = artist_profile.location if artist_profile else None
+            if not has_coordinates(artist_location):
+                return Response({"error": "Your profile location has no coordinates for a radius search."}, status=400)
+            try:
+                radius_km = float(request.query_params.get('radius_km', FEED_DEFAULT_RADIUS_KM))
+            except ValueError:
+                return Response({"error": "Invalid radius_km parameter."}, status=400)
+            if radius_km <= 0:
+                return Response({"error": "Invalid radius_km parameter."}, status=400)
+            radius_km = min(radius_km, FEED_MAX_RADIUS_KM)
+            leads = filter_within_radius(leads, artist_location.lat, artist_location.lng, radius_km)
 
         if name_filter:
             leads = leads.filter(
-                models.Q(first_name__icontains=name_filter) |
-                models.Q(last_name__icontains=name_filter)
+                Q(first_name__icontains=name_filter) |
+                Q(last_name__icontains=name_filter)
             )
 
         if makeup_type_filter:
             # Split by comma if multiple makeup types provided
             makeup_types = [mt.strip() for mt in makeup_type_filter.split(',') if mt.strip()]
             if makeup_types:
-                from adminpanel.models import MakeupType
-                # Get makeup type IDs by name
-                makeup_type_ids = MakeupType.objects.filter(
-                    name__in=makeup_types
-                ).values_list('id', flat=True)
-                if makeup_type_ids:
-                    # Filter leads that have any of these makeup types
-                    leads = leads.filter(makeup_types__id__in=makeup_type_ids)
-
-        # Filter out leads that are booked (have booked_artists) and leads older than 1 month
-        one_month_ago = timezone.now() - timedelta(days=30)
-        leads = leads.exclude(booked_artists__isnull=False).filter(created_at__gte=one_month_ago)
-
-        # Exclude leads that have reached max claims
-        # from django.db.models import Count
-        # from django.db import models
-        # leads = leads.annotate(
-        #     claimed_count=Count('claimed_artists')
-        # ).exclude(
-        #     claimed_count__gte=models.F('max_claims')
-        # )
-
-        # Filter out claimed leads based on artist profile
-        if artist_profile:
-            # Get leads claimed by this artist
-            claimed_leads = leads.filter(claimed_artists=artist_profile)
-            excluded_lead_ids.extend(claimed_leads.values_list('id', flat=True))
+                leads = leads.filter(makeup_types__name__in=makeup_types).distinct()
 
-            # Exclude claimed leads
-            leads = leads.exclude(claimed_artists=artist_profile)
-            logger.info(f"Excluded {claimed_leads.count()} leads claimed by artist profile {artist_profile.id}")
+        # Anti-join on the artist's own claims and assignments
+        if artist_profile:
+            leads = leads.exclude(claimed_artists=artist_profile).exclude(assigned_to=artist_profile)
         else:
             # If user doesn't have artist profile, exclude leads where user is the requested_artist
-            requested_leads = leads.filter(requested_artist__user=user)
-            excluded_lead_ids.extend(requested_leads.values_list('id', flat=True))
             leads = leads.exclude(requested_artist__user=user)
-            logger.info(f"Excluded {requested_leads.count()} leads where user {user.id} is the requested_artist")
 
-        # Additional safety check: also exclude leads where user is assigned_to
-        if artist_profile:
-            assigned_leads = leads.filter(assigned_to=artist_profile)
-            excluded_lead_ids.extend(assigned_leads.values_list('id', flat=True))
-            leads = leads.exclude(assigned_to=artist_profile)
-            logger.info(f"Excluded {assigned_leads.count()} leads assigned to artist profile {artist_profile.id}")
-
-        # Apply limit if specified
-        if limit_param:
+        if sort == 'relevance' and artist_profile:
             try:
-                limit = int(limit_param)
-                if limit > 0:
-                    leads = leads[:limit]
+                offset = max(0, int(request.query_params.get('offset', 0)))
             except ValueError:
-                return Response({"error": "Invalid limit parameter. Must be a positive integer."}, status=400)
+                return Response({"error": "Invalid offset parameter."}, status=400)
+
+            # the inputs the filtered queryset was built from, as the ranking cache key
+            feed_filters = {
+                'location': location_filter,
+                'name': name_filter,
+                'makeup_type': makeup_type_filter,
+                'preferred': preferred_only,
+                'near_me': (artist_profile.location.lat, artist_profile.location.lng, radius_km) if near_me else None,
+                'since': since.isoformat() if since else None,
+            }
+            ranking = rank_leads(leads, artist_profile, feed_filters)
+            window = ranking[offset:offset + page_size]
+            scores = dict(window)
+
+            # re-applying the feed filters drops leads this artist claimed since the ranking was cached
+            by_id = {
+                lead.id: lead
+                for lead in leads.filter(pk__in=list(scores)).select_related(
+                    'service', 'budget_range', 'assigned_to', 'requested_artist'
+                ).prefetch_related('makeup_types', 'claimed_artists', 'booked_artists')
+            }
+            page = [by_id[lead_id] for lead_id, _ in window if lead_id in by_id]
+
+            leads_data = LeadSerializer(page, many=True).data
+            for lead_data in leads_data:
+                lead_data['relevance_score'] = scores[lead_data['id']]
+
+            next_cursor = None
+            next_offset = offset + page_size if offset + page_size < len(ranking) else None
+        else:
+            leads = leads.select_related(
+                'service', 'budget_range', 'assigned_to', 'requested_artist'
+            ).prefetch_related('makeup_types', 'claimed_artists', 'booked_artists')
 
-        serializer = LeadSerializer(leads, many=True)
-        leads_data = serializer.data
+            try:
+                page, next_cursor = paginate_by_keyset(
+                    leads,
+                    cursor=cursor,
+                    page_size=page_size,
+                    fields=('open_entry__created_at', 'open_entry__lead')
+                )
+            except ValueError:
+                return Response({"error": "Invalid cursor parameter."}, status=400)
 
-        # Add claimed_count and booked_count to each lead in response
-        for i, lead in enumerate(leads):
-            leads_data[i]['claimed_count'] = lead.claimed_artists.count()
-            leads_data[i]['booked_count'] = lead.booked_artists.count()
+            leads_data = LeadSerializer(page, many=True).data
+            next_offset = None
 
-        logger.info(f"User {user.id} - Total leads found: {len(leads_data)}, Excluded lead IDs: {excluded_lead_ids}")
+        logger.info(f"User {user.id} - Feed page returned {len(leads_data)} leads")
 
         return Response({
             "message": "Fetched all leads successfully.",
-            "count": leads.count(),
+            "count": len(leads_data),
+            "next_cursor": next_cursor,
+            "next_offset": next_offset,
             "leads": leads_data,
             "debug_info": {
                 "user_id": user.id,
                 "has_artist_profile": artist_profile is not None,
                 "artist_profile_id": artist_profile.id if artist_profile else None,
-                "excluded_lead_ids": excluded_lead_ids,
-                "total_excluded": len(excluded_lead_ids)
             }
         }, status=200)
@@ -1,38 +1,42 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.utils.timezone import now, timedelta
-from django.db.models.functions import Lower
-from leads.models.models import Lead
 from leads.serializers.serializers import LeadDashboardListSerializer
+from leads.utils.dashboard import dashboard_leads, dashboard_summary
+from leads.utils.pagination import paginate_by_keyset, parse_page_size
 
 class ArtistRecentLeadsView(APIView):
+    """
+    Artist dashboard: cached summary counts plus the newest assigned
+    new/claimed leads, paged with ?cursor (per_page default 20, max 50).
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        artist_profile = request.user.artist_profile  
+        artist_profile = getattr(request.user, 'artist_profile', None)
+        if artist_profile is None:
+            return Response({"error": "Artist profile not found."}, status=404)
 
-        today = now().date()
-        start_of_week = today - timedelta(days=today.weekday())  # Monday
-        start_of_month = today.replace(day=1)
+        try:
+            per_page = parse_page_size(request.query_params.get('per_page'), default=20, maximum=50)
+        except ValueError:
+            return Response({"error": "per_page must be a positive integer."}, status=400)
 
-        # Get leads assigned to this artist, with specific status
-        leads = Lead.objects.filter(
-            assigned_to=artist_profile,
-            status__in=['new', 'claimed'],  # Changed from 'contacted' to 'claimed'
-            is_deleted=False
-        ).order_by('-created_at')
+        leads = dashboard_leads(artist_profile.pk).select_related('service', 'budget_range')
+        try:
+            page, next_cursor = paginate_by_keyset(leads, cursor=request.query_params.get('cursor'), page_size=per_page)
+        except ValueError:
+            return Response({"error": "Invalid cursor parameter."}, status=400)
 
-        # Count summaries
-        new_this_week = leads.filter(created_at__date__gte=start_of_week, status='new').count()
-        total_this_month = leads.filter(created_at__date__gte=start_of_month).count()
-
-        serializer = LeadDashboardListSerializer(leads, many=True)
+        summary = dashboard_summary(artist_profile.pk)
 
         return Response({
             "summary": {
-                "new_this_week": new_this_week,
-                "total_this_month": total_this_month
+                "new_this_week": summary['new_this_week'],
+                "total_this_month": summary['total_this_month']
             },
-            "leads": serializer.data
+            "count": summary['total'],
+            "per_page": per_page,
+            "next_cursor": next_cursor,
+            "leads": LeadDashboardListSerializer(page, many=True).data
         })
@@ -1,19 +1,46 @@
 # views/get_lead_detail.py
 
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from leads.models.models import Lead
 from leads.serializers.serializers import LeadDetailSerializer
+from leads.utils.lead_detail import cache_lead_detail, cached_lead_detail, lead_detail_validators
 
 class LeadDetailView(APIView):
+    """
+    Lead detail with conditional GET: ETag / Last-Modified come from
+    leads.utils.lead_detail, a matching If-None-Match or If-Modified-Since
+    gets a 304 without serializing, and the payload is cached briefly.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, lead_id):
-        try:
-            lead = Lead.objects.get(pk=lead_id, is_deleted=False)
-        except Lead.DoesNotExist:
+        validators = lead_detail_validators(lead_id)
+        if validators is None:
             return Response({"error": "Lead not found."}, status=404)
+        etag, last_modified = validators
+        headers = {
+            'ETag': etag,
+            'Last-Modified': http_date(last_modified.timestamp()),
+            # authenticated data: browsers may keep it but must revalidate every time
+            'Cache-Control': 'private, no-cache',
+        }
 
-        serializer = LeadDetailSerializer(lead)
-        return Response(serializer.data, status=200)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+        if not_modified is not None:
+            for header, value in headers.items():
+                not_modified[header] = value
+            return not_modified
+
+        data = cached_lead_detail(lead_id, etag)
+        if data is None:
+            lead = Lead.objects.select_related(
+                'service', 'budget_range', 'assigned_to', 'requested_artist', 'created_by'
+            ).prefetch_related('makeup_types', 'claimed_artists', 'booked_artists').get(pk=lead_id)
+            data = LeadDetailSerializer(lead).data
+            cache_lead_detail(lead_id, etag, data)
+
+        return Response(data, status=200, headers=headers)
@@ -2,108 +2,138 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from leads.models.models import Lead
-from leads.serializers.serializers import LeadSerializer
-from django.db.models.functions import Lower
-from django.db.models import Q, Count, Prefetch
-from django.core.paginator import Paginator
+from leads.models.archive import ArchivedLead, ArchivedLeadArtist
+from leads.serializers.serializers import LeadSerializer, ArchivedLeadSerializer
+from leads.utils.archive import archive_cutoff
+from leads.utils.pagination import paginate_by_keyset, paginate_merged_by_keyset, parse_page_size, estimate_count
+from django.db.models import Prefetch
 from artists.models.models import ArtistProfile
 from django.utils import timezone
 from datetime import timedelta
-from django.utils.dateparse import parse_datetime
+from django.utils.dateparse import parse_date, parse_datetime
+
+TOTAL_MODES = ('exact', 'approx', 'none')
+
+
+def _parse_bound(value, day_time):
+    """Aware datetime for a date or datetime query param; plain dates get day_time."""
+    day = parse_date(value)
+    moment = parse_datetime(f"{value}T{day_time}") if day else parse_datetime(value)
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
 
 class GetLeadsByStatusView(APIView):
+    """
+    Admin lead listing. Pages newest-first with a (created_at, id) cursor;
+    pass ?total=approx to use the planner estimate instead of an exact COUNT,
+    or ?total=none to skip the total entirely. A date range reaching past
+    the archive horizon also pages through archived leads (marked
+    "archived": true).
+    """
     permission_classes = [IsAuthenticated]
-    
+
     def get(self, request):
         try:
             # Get query parameters
             status_param = request.query_params.get('status', 'all').strip().lower()
-            page = int(request.query_params.get('page', 1))
-            per_page = int(request.query_params.get('per_page', 20))
-            
+            cursor = request.query_params.get('cursor')
+            total_mode = request.query_params.get('total', 'exact').strip().lower()
+            try:
+                per_page = parse_page_size(request.query_params.get('per_page'), default=20, maximum=100)
+            except ValueError:
+                return Response({"error": "per_page must be a positive integer."}, status=400)
+
+            if total_mode not in TOTAL_MODES:
+                return Response({"error": f"total must be one of {', '.join(TOTAL_MODES)}."}, status=400)
+
             # Get date range parameters
             start_date = request.query_params.get('start_date')
             end_date = request.query_params.get('end_date')
             limit = request.query_params.get('limit')
 
+            # limit caps the page size
+            if limit:
+                try:
+                    per_page = min(per_page, max(1, int(limit)))
+                except ValueError:
+                    pass
+
             # Start with base queryset
             leads = Lead.objects.filter(is_deleted=False)
+            archived = None
 
             # Apply date filters
             if start_date and end_date:
                 # Convert string dates to datetime
-                start_datetime = parse_datetime(start_date) or timezone.make_aware(parse_datetime(f"{start_date}T00:00:00"))
-                end_datetime = parse_datetime(end_date) or timezone.make_aware(parse_datetime(f"{end_date}T23:59:59"))
+                start_datetime = _parse_bound(start_date, "00:00:00")
+                end_datetime = _parse_bound(end_date, "23:59:59")
                 leads = leads.filter(created_at__range=(start_datetime, end_datetime))
+                if start_datetime < archive_cutoff():
+                    archived = ArchivedLead.objects.filter(
+                        is_deleted=False, created_at__range=(start_datetime, end_datetime)
+                    )
             else:
                 # Default to last 40 days if no date range specified and status is 'all'
                 if status_param == 'all':
                     forty_days_ago = timezone.now() - timedelta(days=40)
                     leads = leads.filter(created_at__gte=forty_days_ago)
 
-            # Add select_related and prefetch_related to optimize queries
+            # Apply status filter if needed. Statuses are stored lowercase and
+            # status_param is lowercased, so a plain equality keeps leads_lead_status_idx usable
+            if status_param != 'all':
+                leads = leads.filter(status=status_param)
+                if archived is not None:
+                    archived = archived.filter(status=status_param)
+
+            # Total for the whole filtered range, computed once and only if asked for
+            if total_mode == 'exact':
+                total = leads.count() + (archived.count() if archived is not None else 0)
+            elif total_mode == 'approx':
+                total = estimate_count(leads) + (estimate_count(archived) if archived is not None else 0)
+            else:
+                total = None
+
+            # Related rows are fetched for the page only
             leads = leads.select_related(
                 'service',
                 'budget_range',
                 'assigned_to',
                 'requested_artist',
                 'created_by'
-                # Removed 'location' since it's not a foreign key
             ).prefetch_related(
                 'makeup_types',
-                Prefetch('claimed_artists', queryset=ArtistProfile.objects.only('id', 'first_name', 'last_name')),
-                Prefetch('booked_artists', queryset=ArtistProfile.objects.only('id', 'first_name', 'last_name'))
-            )
-
-            # Apply status filter if needed
-            if status_param != 'all':
-                leads = leads.annotate(lower_status=Lower('status')).filter(lower_status=status_param)
-
-            # Order by latest first
-            leads = leads.order_by('-created_at')
-
-            # Apply limit if specified
-            if limit:
-                try:
-                    limit = int(limit)
-                    leads = leads[:limit]
-                except ValueError:
-                    pass
-
-            # Implement pagination
-            paginator = Paginator(leads, per_page)
-            page_obj = paginator.get_page(page)
-
-            # Serialize the current page
-            serializer = LeadSerializer(page_obj, many=True)
-            leads_data = serializer.data
-
-            # Add counts efficiently using annotation
-            leads_with_counts = leads.annotate(
-                claimed_count=Count('claimed_artists', distinct=True),
-                booked_count=Count('booked_artists', distinct=True)
+                Prefetch('claimed_artists', queryset=ArtistProfile.objects.only('id', 'first_name', 'last_name', 'phone')),
+                Prefetch('booked_artists', queryset=ArtistProfile.objects.only('id', 'first_name', 'last_name', 'phone'))
             )
 
-            # Create counts lookup dictionary
-            counts_lookup = {
-                lead.id: {
-                    'claimed_count': lead.claimed_count,
-                    'booked_count': lead.booked_count
-                }
-                for lead in leads_with_counts
-            }
+            try:
+                if archived is None:
+                    page, next_cursor = paginate_by_keyset(leads, cursor=cursor, page_size=per_page)
+                else:
+                    archived = archived.select_related(
+                        'service', 'budget_range', 'assigned_to', 'requested_artist'
+                    ).prefetch_related(
+                        Prefetch('artist_relations', queryset=ArchivedLeadArtist.objects.select_related('artist').only(
+                            'lead_id', 'relation', 'artist__id', 'artist__first_name', 'artist__last_name', 'artist__phone'
+                        ))
+                    )
+                    page, next_cursor = paginate_merged_by_keyset([leads, archived], cursor=cursor, page_size=per_page)
+            except ValueError:
+                return Response({"error": "Invalid cursor parameter."}, status=400)
 
-            # Add counts to serialized data
-            for lead_data in leads_data:
-                lead_counts = counts_lookup.get(lead_data['id'], {})
-                lead_data['claimed_count'] = lead_counts.get('claimed_count', 0)
-                lead_data['booked_count'] = lead_counts.get('booked_count', 0)
+            # claimed/booked counts come from the lead counter columns
+            leads_data = [
+                (ArchivedLeadSerializer if isinstance(lead, ArchivedLead) else LeadSerializer)(lead).data
+                for lead in page
+            ]
 
             return Response({
                 "message": f"Fetched {status_param if status_param != 'all' else 'all'} leads successfully.",
-                "count": paginator.count,
-                "num_pages": paginator.num_pages,
-                "current_page": page,
+                "count": total,
+                "count_is_approximate": total_mode == 'approx',
+                "per_page": per_page,
+                "next_cursor": next_cursor,
                 "leads": leads_data,
                 "filters_applied": {
                     "status": status_param,
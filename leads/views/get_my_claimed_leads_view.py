@@ -5,8 +5,15 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from leads.models.models import Lead
 from leads.serializers.serializers import ClaimedLeadListSerializer
+from leads.utils.pagination import paginate_by_keyset, parse_page_size
 
 class GetMyClaimedLeadsView(APIView):
+    """
+    Artist view: leads the logged-in artist claimed, newest first, paged
+    with ?cursor (per_page default 20, max 100). A page is a fixed three
+    queries (count, page with its FKs, makeup types); both reach the
+    artist's claims through leads_claimed_artist_idx.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -16,31 +23,46 @@ class GetMyClaimedLeadsView(APIView):
         except:
             return Response({"error": "Only artists can access their claimed leads."}, status=403)
 
+        try:
+            per_page = parse_page_size(request.query_params.get('per_page'), default=20, maximum=100)
+        except ValueError:
+            return Response({"error": "per_page must be a positive integer."}, status=400)
+
         leads = Lead.objects.filter(
             claimed_artists=artist_profile,
             is_deleted=False
-        ).order_by('-created_at')
+        )
+        page_leads = leads.select_related(
+            'service', 'budget_range', 'assigned_to__user', 'requested_artist__user'
+        ).prefetch_related('makeup_types')
+
+        try:
+            page, next_cursor = paginate_by_keyset(page_leads, cursor=request.query_params.get('cursor'), page_size=per_page)
+        except ValueError:
+            return Response({"error": "Invalid cursor parameter."}, status=400)
 
-        serializer = ClaimedLeadListSerializer(leads, many=True)
+        serializer = ClaimedLeadListSerializer(page, many=True)
         leads_data = serializer.data
 
         # Add budget, makeup_types, assigned_count, claimed_count to each lead
-        for i, lead in enumerate(leads):
+        for lead_data, lead in zip(leads_data, page):
             if lead.budget_range:
-                leads_data[i]['budget_range'] = {
+                lead_data['budget_range'] = {
                     'id': lead.budget_range.id,
                     'label': lead.budget_range.label,
                     'min_value': lead.budget_range.min_value,
                     'max_value': lead.budget_range.max_value
                 }
             else:
-                leads_data[i]['budget_range'] = None
-            leads_data[i]['makeup_types'] = [mt.name for mt in lead.makeup_types.all()]
-            leads_data[i]['assigned_count'] = lead.booked_artists.count()  # Artists who have booked this lead
-            leads_data[i]['claimed_count'] = lead.claimed_artists.count()  # Artists who have claimed this lead
+                lead_data['budget_range'] = None
+            lead_data['makeup_types'] = [mt.name for mt in lead.makeup_types.all()]
+            lead_data['assigned_count'] = lead.total_bookings  # Artists who have booked this lead
+            lead_data['claimed_count'] = lead.total_claims  # Artists who have claimed this lead
 
         return Response({
             "message": "Fetched claimed leads successfully.",
             "count": leads.count(),
+            "per_page": per_page,
+            "next_cursor": next_cursor,
             "leads": leads_data
         }, status=200)
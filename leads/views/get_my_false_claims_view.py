@@ -20,5 +20,6 @@ class GetMyFalseClaimsView(APIView):
             # Fetch all if no specific or invalid status provided
             claims = FalseLeadClaim.objects.filter(artist=artist)
 
+        claims = claims.select_related('lead').prefetch_related('documents')
         serializer = FalseLeadClaimSerializer(claims, many=True)
         return Response(serializer.data)
@@ -0,0 +1,48 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from rest_framework.parsers import MultiPartParser
+from rest_framework import status as drf_status
+from django.conf import settings
+from leads.utils.importer import LeadImporter, IMPORT_FORMATS, DEFAULT_CHUNK_SIZE, detect_format
+
+class ImportLeadsView(APIView):
+    """
+    Admin-only bulk import of leads from a CSV or JSONL file (multipart field
+    `file`). Rows are streamed and written in chunks; the response carries
+    counts and a per-row error summary. Use ?dry_run=true to validate only.
+    Imported leads stay unverified unless `verified` is true. Files over
+    LEAD_IMPORT_MAX_UPLOAD_BYTES are refused: the import runs inside the
+    request, so large files go through the import_leads command.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({"error": "A CSV or JSONL file is required under 'file'."}, status=drf_status.HTTP_400_BAD_REQUEST)
+
+        if upload.size > settings.LEAD_IMPORT_MAX_UPLOAD_BYTES:
+            return Response({
+                "error": f"File is larger than {settings.LEAD_IMPORT_MAX_UPLOAD_BYTES} bytes. "
+                         "Import it with the import_leads management command instead."
+            }, status=drf_status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        fmt = (request.data.get('format') or detect_format(upload.name)).strip().lower()
+        if fmt not in IMPORT_FORMATS:
+            return Response({"error": f"format must be one of {', '.join(IMPORT_FORMATS)}."}, status=drf_status.HTTP_400_BAD_REQUEST)
+
+        source = request.data.get('source') or None
+        dry_run = str(request.query_params.get('dry_run', '')).lower() == 'true'
+        verified = str(request.data.get('verified', '')).lower() == 'true'
+
+        importer = LeadImporter(
+            created_by=request.user, source=source, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=dry_run, verified=verified
+        )
+        report = importer.run(upload, fmt)
+
+        return Response({
+            "message": "Lead import validated." if dry_run else "Lead import completed.",
+            **report
+        }, status=drf_status.HTTP_200_OK)
@@ -1,33 +1,51 @@
+from django.db.models import Count, Q
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from leads.models.false_lead_claim import FalseLeadClaim
 from leads.serializers.false_lead_claim_serializer import FalseLeadClaimSerializer
+from leads.utils.pagination import paginate_by_keyset, parse_page_size
 from users.permissions import IsAdminRole  # ✅ Correct import
 from superadmin_auth.permissions import IsSuperAdmin  # ✅ Correct import
 
+CLAIM_STATUSES = ['pending', 'approved', 'rejected']
+
 class ListFalseClaimsAdminView(APIView):
+    """
+    Admin false-claim queue, newest first, paged with ?cursor (per_page
+    default 20, max 100). A page is three queries whatever the queue size:
+    the tab counts (one conditional aggregate), the claims with their lead,
+    and their proof documents.
+    """
     permission_classes = [IsSuperAdmin]
 
     def get(self, request):
         status_filter = request.query_params.get('status', 'pending')
+        try:
+            per_page = parse_page_size(request.query_params.get('per_page'), default=20, maximum=100)
+        except ValueError:
+            return Response({"error": "per_page must be a positive integer."}, status=400)
+
+        claims = FalseLeadClaim.objects.select_related('lead').prefetch_related('documents')
+        if status_filter in CLAIM_STATUSES:
+            claims = claims.filter(status=status_filter)
 
-        if status_filter in ['pending', 'approved', 'rejected']:
-            claims = FalseLeadClaim.objects.filter(status=status_filter).order_by('-created_at')
-        else:
-            claims = FalseLeadClaim.objects.all().order_by('-created_at')
+        try:
+            page, next_cursor = paginate_by_keyset(claims, cursor=request.query_params.get('cursor'), page_size=per_page)
+        except ValueError:
+            return Response({"error": "Invalid cursor parameter."}, status=400)
 
-        serializer = FalseLeadClaimSerializer(claims, many=True)
+        serializer = FalseLeadClaimSerializer(page, many=True)
 
         # Status counts
-        counts = {
-            "all": FalseLeadClaim.objects.count(),
-            "pending": FalseLeadClaim.objects.filter(status="pending").count(),
-            "approved": FalseLeadClaim.objects.filter(status="approved").count(),
-            "rejected": FalseLeadClaim.objects.filter(status="rejected").count()
-        }
+        counts = FalseLeadClaim.objects.aggregate(
+            all=Count('id'),
+            **{status: Count('id', filter=Q(status=status)) for status in CLAIM_STATUSES}
+        )
 
         return Response({
             "claims": serializer.data,
-            "counts": counts
+            "counts": counts,
+            "per_page": per_page,
+            "next_cursor": next_cursor
         }, status=200)
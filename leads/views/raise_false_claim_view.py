@@ -1,20 +1,26 @@
 # leads/views/raise_false_claim_view.py
 
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from media.cloudinary import CloudinaryUploader
 
-from leads.models.models import Lead
 from leads.serializers.false_lead_claim_serializer import FalseLeadClaimSerializer
 from leads.models.false_lead_claim import FalseClaimDocument
+from leads.utils.uploads import UploadError, delete_uploads, upload_files
 
 class RaiseFalseLeadClaimView(APIView):
     """
     Artist API: Raise a false lead claim
+
+    Proof documents are uploaded in parallel before anything is written;
+    the claim and its documents are then saved in one transaction, so a
+    failed upload leaves neither a claim nor orphaned files behind.
     """
     permission_classes = [IsAuthenticated]
+    uploader = CloudinaryUploader
 
     def post(self, request):
         try:
@@ -24,26 +30,30 @@ class RaiseFalseLeadClaimView(APIView):
 
         serializer = FalseLeadClaimSerializer(data=request.data)
         if serializer.is_valid():
-            claim = serializer.save(artist=artist)
-
-            # Handle document uploads separately
             files = request.FILES.getlist('proof_documents')
-            uploaded_docs = []
-            for file in files:
-                upload_result = CloudinaryUploader.upload_file(file, folder="false_claim_documents/")
-                if 'error' in upload_result:
-                    return Response({"error": f"File upload failed: {upload_result['error']}"}, status=400)
-
-                doc = FalseClaimDocument.objects.create(
-                    false_claim=claim,
-                    lead=claim.lead,
-                    file_name=file.name,
-                    file_type=file.content_type.split('/')[-1],
-                    file_url=upload_result.get('url'),
-                    public_id=upload_result.get('public_id'),
-                    tag='proof'
-                )
-                uploaded_docs.append(doc)
+            try:
+                uploads = upload_files(files, folder="false_claim_documents/", uploader=self.uploader)
+            except UploadError as e:
+                return Response({"error": f"File upload failed: {e}"}, status=400)
+
+            try:
+                with transaction.atomic():
+                    claim = serializer.save(artist=artist)
+                    FalseClaimDocument.objects.bulk_create([
+                        FalseClaimDocument(
+                            false_claim=claim,
+                            lead_id=claim.lead_id,
+                            file_name=file.name,
+                            file_type=file.content_type.split('/')[-1],
+                            file_url=upload_result.get('url'),
+                            public_id=upload_result.get('public_id'),
+                            tag='proof'
+                        )
+                        for file, upload_result in zip(files, uploads)
+                    ])
+            except Exception:
+                delete_uploads(uploads, uploader=self.uploader)
+                raise
 
             # Re-serialize to include proof_documents details
             response_serializer = FalseLeadClaimSerializer(claim)
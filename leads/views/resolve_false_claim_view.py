@@ -5,7 +5,7 @@ from artists.models.models import ArtistSubscription
 from leads.models.false_lead_claim import FalseLeadClaim
 from users.permissions import IsAdminRole
 from django.utils import timezone
-from notifications.services import NotificationService
+from notifications.models import NotificationOutbox
 from django.db import transaction
 from superadmin_auth.permissions import IsSuperAdmin
 
@@ -60,13 +60,8 @@ class ResolveFalseClaimView(APIView):
                 "smsText": message
             }]
 
-            try:
-                # Send notification
-                response = NotificationService(messages=notification_messages).send_notifications()
-                print("False Claim Notification Response:", response)
-            except Exception as e:
-                print(f"Notification failed: {str(e)}")
-                # Continue execution even if notification fails
+            # Queued in this transaction; the outbox dispatcher sends it after commit
+            NotificationOutbox.enqueue(notification_messages, source='false_claim')
 
             return Response({
                 "message": f"Claim #{claim.id} marked as {new_status}",
@@ -26,7 +26,7 @@ class SetMaxClaimsView(APIView):
             return Response({"error": "max_claims must be a positive integer."}, status=drf_status.HTTP_400_BAD_REQUEST)
 
         # Check if current claimed count exceeds new max_claims
-        current_claimed_count = lead.claimed_artists.count()
+        current_claimed_count = lead.total_claims
         if current_claimed_count > max_claims:
             return Response({
                 "error": f"Cannot set max_claims to {max_claims}. Lead currently has {current_claimed_count} claimed artists."
@@ -55,6 +55,6 @@ class SetMaxClaimsView(APIView):
         return Response({
             "lead_id": lead.id,
             "max_claims": lead.max_claims,
-            "current_claimed_count": lead.claimed_artists.count(),
-            "available_slots": max(0, lead.max_claims - lead.claimed_artists.count())
+            "current_claimed_count": lead.total_claims,
+            "available_slots": max(0, lead.max_claims - lead.total_claims)
         }, status=drf_status.HTTP_200_OK)
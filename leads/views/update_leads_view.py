@@ -11,7 +11,7 @@ class UpdateLeadView(APIView):
 
     def put(self, request, lead_id):
         try:
-            lead = Lead.objects.get(id=lead_id)
+            lead = Lead.objects.get(id=lead_id, is_deleted=False)
         except Lead.DoesNotExist:
             return Response({"error": "Lead not found."}, status=drf_status.HTTP_404_NOT_FOUND)
 
@@ -44,7 +44,7 @@ class UpdateLeadView(APIView):
             if not isinstance(max_claims, int) or max_claims < 1:
                 return Response({"error": "max_claims must be a positive integer."}, status=drf_status.HTTP_400_BAD_REQUEST)
             # Check if current claimed count exceeds new max_claims
-            current_claimed_count = lead.claimed_artists.count()
+            current_claimed_count = lead.total_claims
             if current_claimed_count > max_claims:
                 return Response({
                     "error": f"Cannot set max_claims to {max_claims}. Lead currently has {current_claimed_count} claimed artists."
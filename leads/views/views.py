@@ -2,11 +2,15 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from appconfig.utils import MasterConfigManager
-from leads.models.models import Lead
+from leads.models.models import Lead, lead_fingerprint
 from leads.serializers.serializers import LeadSerializer
 from django.conf import settings
-from leads.utils.distribution import assign_lead_automatically
-from notifications.services import NotificationService
+from leads.utils.distribution import assign_lead_automatically, assign_leads_in_batch
+from leads.utils.deletion import soft_delete_leads
+from leads.utils.pagination import paginate_by_keyset, parse_page_size
+from leads.utils.dedupe import get_dedupe_settings, find_duplicate, merge_submission, submission_lock
+from notifications.models import NotificationOutbox
+from django.db import transaction
 from users.models import User  # Adjust path if needed
 from adminpanel.models import MakeupType
 
@@ -55,10 +59,47 @@ class PublicLeadSubmissionView(APIView):
 
         serializer = LeadSerializer(data=data)
         if serializer.is_valid():
-            lead = serializer.save()
-
-            # 🔔 TODO: Trigger notification to artist & admin here
-            self.send_lead_notification_to_admin_and_artist(lead)
+            # Same phone + booking date (+ requested artist) inside the dedupe window is a repeat submission
+            mode, window_hours = get_dedupe_settings()
+            requested_artist = serializer.validated_data.get('requested_artist')
+            requested_artist_id = requested_artist.pk if requested_artist else None
+            fingerprint = None
+            if mode != 'off':
+                fingerprint = lead_fingerprint(
+                    serializer.validated_data.get('phone'),
+                    serializer.validated_data.get('booking_date'),
+                    requested_artist_id
+                )
+
+            # check and insert under one lock per fingerprint, released after commit
+            with submission_lock(fingerprint) as acquired:
+                if not acquired:
+                    return Response({
+                        "error": "This lead is already being submitted. Please try again."
+                    }, status=409)
+
+                existing = find_duplicate(
+                    serializer.validated_data.get('phone'),
+                    serializer.validated_data.get('booking_date'),
+                    window_hours,
+                    requested_artist_id
+                ) if fingerprint else None
+                if existing and mode == 'reject':
+                    return Response({
+                        "error": "A lead with this phone number and booking date was already submitted."
+                    }, status=409)
+                if existing:
+                    merge_submission(existing, serializer.validated_data)
+                    return Response({
+                        "message": "Lead already submitted",
+                        "lead_id": existing.id,
+                        "duplicate": True
+                    }, status=200)
+
+                # lead and its notifications commit together; the outbox dispatcher sends them
+                with transaction.atomic():
+                    lead = serializer.save()
+                    self.send_lead_notification_to_admin_and_artist(lead)
 
             return Response({
                 "message": "Lead submitted successfully",
@@ -71,7 +112,7 @@ class PublicLeadSubmissionView(APIView):
         
     def send_lead_notification_to_admin_and_artist(self,lead):
         """
-        Send SMS notifications to:
+        Queue SMS notifications to:
         - Admins (about new lead submitted for an artist)
         - Requested Artist (that they got a lead)
         """
@@ -116,18 +157,16 @@ class PublicLeadSubmissionView(APIView):
                 "smsTo": f"+91{artist.phone.strip()[-10:]}",
                 "smsText": artist_message
             })
-        print(f"Messages to send: {messages}")
-        # Send bulk notifications
-        response = NotificationService(messages=messages).send_notifications()
-        print("Lead Notification Response:", response)
-        return response
+        print(f"Messages to queue: {messages}")
+        # Queue for the outbox dispatcher (dispatch_notifications)
+        return NotificationOutbox.enqueue(messages, source='public_lead')
 
 
 class AdminCreateMultipleLeadsView(APIView):
     """
     Admin panel view: Admins create multiple leads manually.
-    Will auto-assign each lead only if an active distribution strategy exists.
-    Limited to 10 leads per request.
+    Valid leads are auto-assigned together in one batch, only if an active
+    distribution strategy exists.
     """
     permission_classes = [IsAuthenticated]
 
@@ -136,27 +175,30 @@ class AdminCreateMultipleLeadsView(APIView):
         if not isinstance(leads_data, list):
             return Response({"error": "Expected a list of leads under 'leads' key"}, status=400)
 
-        if len(leads_data) > 10:
-            return Response({"error": "Cannot create more than 10 leads at once"}, status=400)
-
         results = []
+        created = []
         for lead_data in leads_data:
             serializer = LeadSerializer(data=lead_data)
             if serializer.is_valid():
-                lead = serializer.save(created_by=request.user)
-                # Try assigning automatically (only if strategy is active)
-                artist = assign_lead_automatically(lead)
-                results.append({
-                    "success": True,
-                    "lead": serializer.data,
-                    "assigned_to": artist.first_name + " " + artist.last_name + " Mobile: " + artist.user.username if artist else None
-                })
+                serializer.save(created_by=request.user)
+                created.append((len(results), serializer))
+                results.append({"success": True})
             else:
                 results.append({
                     "success": False,
                     "errors": serializer.errors
                 })
 
+        # Try assigning automatically (only if strategy is active)
+        assigned = assign_leads_in_batch([serializer.instance for _, serializer in created])
+
+        for index, serializer in created:
+            artist = assigned.get(serializer.instance.id)
+            results[index].update({
+                "lead": serializer.data,
+                "assigned_to": artist.first_name + " " + artist.last_name + " Mobile: " + artist.user.username if artist else None
+            })
+
         return Response({
             "message": "Bulk lead creation completed",
             "results": results
@@ -166,21 +208,23 @@ class AdminCreateMultipleLeadsView(APIView):
 class AdminDeleteLeadView(APIView):
     """
     Admin panel view: Admins delete a lead by ID.
+    Soft delete; rows are hard-deleted later by the purge_deleted_leads command.
     """
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, lead_id):
-        try:
-            lead = Lead.objects.get(id=lead_id)
-            lead.delete()
-            return Response({"message": "Lead deleted successfully"}, status=200)
-        except Lead.DoesNotExist:
+        deleted_ids, _ = soft_delete_leads([lead_id])
+        if not deleted_ids:
             return Response({"error": "Lead not found"}, status=404)
+        return Response({"message": "Lead deleted successfully"}, status=200)
 
 
 class GetMyAssignedLeadsView(APIView):
     """
-    Artist view: Get leads assigned to the logged-in artist.
+    Artist view: Get leads assigned to the logged-in artist, newest first,
+    paged with ?cursor (per_page default 20, max 100). Served by
+    leads_lead_assignee_idx; a page is a fixed five queries (count, page
+    with its FKs, makeup types, claimed and booked artists).
     """
     permission_classes = [IsAuthenticated]
 
@@ -190,20 +234,36 @@ class GetMyAssignedLeadsView(APIView):
         except:
             return Response({"error": "Artist profile not found."}, status=404)
 
-        leads = Lead.objects.filter(assigned_to=artist_profile, is_deleted=False).order_by('-created_at')
-        serializer = LeadSerializer(leads, many=True)
+        try:
+            per_page = parse_page_size(request.query_params.get('per_page'), default=20, maximum=100)
+        except ValueError:
+            return Response({"error": "per_page must be a positive integer."}, status=400)
+
+        leads = Lead.objects.filter(assigned_to=artist_profile, is_deleted=False)
+        page_leads = leads.select_related(
+            'service', 'budget_range', 'assigned_to', 'requested_artist'
+        ).prefetch_related('makeup_types', 'claimed_artists', 'booked_artists')
+
+        try:
+            page, next_cursor = paginate_by_keyset(page_leads, cursor=request.query_params.get('cursor'), page_size=per_page)
+        except ValueError:
+            return Response({"error": "Invalid cursor parameter."}, status=400)
+
+        serializer = LeadSerializer(page, many=True)
         leads_data = serializer.data
 
         # Add booked_date for each lead if it's booked
-        for i, lead in enumerate(leads):
+        for lead_data, lead in zip(leads_data, page):
             if lead.status == 'booked':
-                leads_data[i]['booked_date'] = lead.updated_at.date().isoformat()
+                lead_data['booked_date'] = lead.updated_at.date().isoformat()
             else:
-                leads_data[i]['booked_date'] = None
+                lead_data['booked_date'] = None
 
         return Response({
             "message": "Assigned leads fetched successfully.",
             "count": leads.count(),
+            "per_page": per_page,
+            "next_cursor": next_cursor,
             "leads": leads_data
         }, status=200)
 
@@ -211,7 +271,8 @@ class GetMyAssignedLeadsView(APIView):
 class AdminBulkDeleteLeadsView(APIView):
     """
     Admin panel view: Admins delete multiple leads by IDs.
-    Limited to 10 leads per request.
+    Soft delete in one set-based UPDATE; rows are hard-deleted later by the
+    purge_deleted_leads command.
     """
     permission_classes = [IsAuthenticated]
 
@@ -220,22 +281,13 @@ class AdminBulkDeleteLeadsView(APIView):
         if not isinstance(lead_ids, list):
             return Response({"error": "Expected a list of lead IDs under 'lead_ids' key"}, status=400)
 
-        if len(lead_ids) > 10:
-            return Response({"error": "Cannot delete more than 10 leads at once"}, status=400)
-
-        deleted_count = 0
-        not_found_ids = []
+        if not all(isinstance(lead_id, int) for lead_id in lead_ids):
+            return Response({"error": "Lead IDs must be integers"}, status=400)
 
-        for lead_id in lead_ids:
-            try:
-                lead = Lead.objects.get(id=lead_id)
-                lead.delete()
-                deleted_count += 1
-            except Lead.DoesNotExist:
-                not_found_ids.append(lead_id)
+        deleted_ids, not_found_ids = soft_delete_leads(lead_ids)
 
         response_data = {
-            "message": f"Deleted {deleted_count} leads successfully"
+            "message": f"Deleted {len(deleted_ids)} leads successfully"
         }
         if not_found_ids:
             response_data["not_found_ids"] = not_found_ids
@@ -251,7 +303,7 @@ class AdminSetLeadVerifiedView(APIView):
 
     def patch(self, request, lead_id):
         try:
-            lead = Lead.objects.get(id=lead_id)
+            lead = Lead.objects.get(id=lead_id, is_deleted=False)
         except Lead.DoesNotExist:
             return Response({"error": "Lead not found"}, status=404)
 
@@ -18,3 +18,11 @@ class CloudinaryUploader:
             }
         except Error as e:
             return {'error': str(e)}
+
+    @staticmethod
+    def delete_file(public_id, resource_type='image'):
+        try:
+            result = cloudinary.uploader.destroy(public_id, resource_type=resource_type, invalidate=True)
+            return {'result': result.get('result')}
+        except Error as e:
+            return {'error': str(e)}
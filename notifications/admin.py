@@ -1,3 +1,12 @@
 from django.contrib import admin
+from .models import NotificationOutbox
 
 # Register your models here.
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'sms_to', 'source', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'source')
+    search_fields = ('sms_to',)
+    readonly_fields = ('provider_response', 'last_error', 'created_at', 'sent_at')
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from notifications.models import NotificationOutbox
+from notifications.services import NotificationService
+
+# ------------------------------
+# ✅ Outbox dispatcher
+#
+# 1. claim a batch of due rows (FOR UPDATE SKIP LOCKED where supported) and
+#    push their next_attempt_at out by LEASE_SECONDS, then commit
+# 2. send the batch through the 2Factor Bulk API outside any transaction
+# 3. mark the rows sent, or schedule a retry with exponential backoff
+# A dispatcher that dies mid-send leaves its rows to be retried once the
+# lease runs out; several dispatchers can run side by side.
+# ------------------------------
+
+LEASE_SECONDS = 120
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+
+def backoff_delay(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS))
+
+
+def claim_batch(batch_size):
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            NotificationOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if rows:
+            NotificationOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                next_attempt_at=now + timedelta(seconds=LEASE_SECONDS)
+            )
+    return rows
+
+
+def _is_success(response):
+    return isinstance(response, dict) and str(response.get('Status', '')).lower() == 'success'
+
+
+def dispatch_batch(batch_size=100, url=None, timeout=None, max_attempts=None):
+    """Send one batch. Returns (sent, retrying, failed)."""
+    max_attempts = max_attempts or settings.NOTIFICATION_MAX_ATTEMPTS
+    rows = claim_batch(batch_size)
+    if not rows:
+        return 0, 0, 0
+
+    response = NotificationService(
+        messages=[row.as_message() for row in rows], url=url, timeout=timeout
+    ).send_notifications()
+
+    now = timezone.now()
+    ids = [row.pk for row in rows]
+    if _is_success(response):
+        NotificationOutbox.objects.filter(pk__in=ids).update(
+            status='sent', sent_at=now, provider_response=response, last_error=''
+        )
+        return len(rows), 0, 0
+
+    error = str(response.get('error') or response.get('Details') or response) if isinstance(response, dict) else str(response)
+    retrying = failed = 0
+    # rows in one batch can differ in attempts, so backoff is applied per attempts group
+    by_attempts = {}
+    for row in rows:
+        by_attempts.setdefault(row.attempts + 1, []).append(row.pk)
+
+    for attempts, group in by_attempts.items():
+        if attempts >= max_attempts:
+            status, next_attempt_at = 'failed', now
+            failed += len(group)
+        else:
+            status, next_attempt_at = 'pending', now + backoff_delay(attempts)
+            retrying += len(group)
+        NotificationOutbox.objects.filter(pk__in=group).update(
+            status=status,
+            attempts=attempts,
+            next_attempt_at=next_attempt_at,
+            last_error=error[:1000],
+            provider_response=response if isinstance(response, dict) else None,
+        )
+    return 0, retrying, failed
+
+
+def dispatch_pending(batch_size=100, max_batches=None, **kwargs):
+    """Drain due rows batch by batch. Returns totals (sent, retrying, failed)."""
+    totals = [0, 0, 0]
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        result = dispatch_batch(batch_size=batch_size, **kwargs)
+        if result == (0, 0, 0):
+            break
+        totals = [total + value for total, value in zip(totals, result)]
+        batches += 1
+        # a failing batch is rescheduled, so it cannot be picked up again in this loop
+    return tuple(totals)
@@ -0,0 +1 @@
+# Empty file to make management directory a Python package
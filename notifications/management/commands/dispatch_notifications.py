@@ -0,0 +1,33 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from notifications.dispatcher import dispatch_pending
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Send queued SMS from the notification outbox through the 2Factor Bulk API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Messages per Bulk API call')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox instead of exiting when it is drained')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+        parser.add_argument('--url', help='Bulk API URL (defaults to settings.TWOFACTOR_BULK_URL)')
+        parser.add_argument('--timeout', type=float, help='HTTP timeout in seconds (defaults to settings.NOTIFICATION_HTTP_TIMEOUT)')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, retrying, failed = dispatch_pending(
+                batch_size=options['batch_size'],
+                url=options['url'],
+                timeout=options['timeout'],
+            )
+            if sent or retrying or failed:
+                logger.info(f"Outbox dispatch: {sent} sent, {retrying} retrying, {failed} failed")
+                self.stdout.write(self.style.SUCCESS(f'Sent {sent} messages, {retrying} scheduled for retry, {failed} failed.'))
+
+            if not options['loop']:
+                if not (sent or retrying or failed):
+                    self.stdout.write('No queued messages.')
+                break
+            time.sleep(options['interval'])
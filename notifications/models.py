@@ -1,3 +1,59 @@
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
+
+
+class NotificationOutbox(models.Model):
+    """
+    SMS waiting to go out through the 2Factor Bulk API. Rows are written in
+    the same transaction as the change they announce and drained by the
+    dispatch_notifications command, so web requests never wait on 2Factor.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    sms_from = models.CharField(max_length=20, default='TFACTR')
+    sms_to = models.CharField(max_length=20)
+    sms_text = models.TextField()
+    source = models.CharField(max_length=50, blank=True, help_text="What queued the message, e.g. 'public_lead'")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    # also the lease: a dispatcher pushes this forward while it sends the row
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    provider_response = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='notif_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.sms_to} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, messages, source=''):
+        """
+        Queue messages in the 2Factor bulk shape ({"smsFrom", "smsTo",
+        "smsText"}). Call inside the transaction that makes them true.
+        """
+        return cls.objects.bulk_create([
+            cls(
+                sms_from=message.get('smsFrom', 'TFACTR'),
+                sms_to=message['smsTo'],
+                sms_text=message['smsText'],
+                source=source,
+            )
+            for message in messages
+        ])
+
+    def as_message(self):
+        return {"smsFrom": self.sms_from, "smsTo": self.sms_to, "smsText": self.sms_text}
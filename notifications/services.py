@@ -103,20 +103,21 @@ class TwoFactorService:
 
 class NotificationService:
 
-    def __init__(self,messages: list = None):
+    def __init__(self,messages: list = None, url: str = None, timeout: float = None):
         self.two_factor_settings = TwoFactorSettings()
         self.messages = messages if messages else []
+        self.url = url or settings.TWOFACTOR_BULK_URL
+        self.timeout = timeout or settings.NOTIFICATION_HTTP_TIMEOUT
 
     def send_notifications(self):
         """
         Send bulk SMS using 2Factor's Bulk API.
 
         :param messages: List of dicts with keys - smsFrom, smsTo, smsText
-        :return: Response JSON from 2Factor
+        :return: Response JSON from 2Factor, or {"error": ...} if the call failed
         """
         if not self.messages:
             return {"error": "No messages to send."}
-        url = "https://2factor.in/API/R1/Bulk/"
         payload = {
             "module": "TRANS_SMS",
             "apikey": self.two_factor_settings.TWOFACTOR_API_KEY,
@@ -126,5 +127,8 @@ class NotificationService:
             "Content-Type": "application/json"
         }
 
-        response = requests.post(url, json=payload, headers=headers)
-        return response.json()
+        try:
+            response = requests.post(self.url, json=payload, headers=headers, timeout=self.timeout)
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            return {"error": str(e)}
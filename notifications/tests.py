@@ -1,3 +1,148 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock, skipUnless
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from notifications.dispatcher import BACKOFF_BASE_SECONDS, claim_batch, dispatch_pending
+from notifications.models import NotificationOutbox
+from notifications.services import TwoFactorSettings
 
-# Create your tests here.
+
+class StubBulkAPI(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the 2Factor Bulk API. Answers each POST with the next
+    (status, body, delay) from `replies` (the last one repeats) and records
+    the decoded payloads in `requests`.
+    """
+    replies = []
+    requests = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        type(self).requests.append(payload)
+        replies = type(self).replies
+        status, body, delay = replies.pop(0) if len(replies) > 1 else replies[0]
+        time.sleep(delay)
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body.encode())
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out first
+
+    def log_message(self, *args):
+        pass
+
+
+class DispatcherTests(TestCase):
+    """dispatch_notifications against a local HTTP server instead of 2Factor."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubBulkAPI)
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/API/R1/Bulk/'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        StubBulkAPI.requests = []
+        for patcher in (
+            mock.patch.object(TwoFactorSettings, 'TWOFACTOR_API_KEY', 'test-key'),
+            mock.patch.object(TwoFactorSettings, 'DLT_TAG', 'TEST'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        NotificationOutbox.enqueue([
+            {'smsTo': '+919000000001', 'smsText': 'New lead'},
+            {'smsTo': '+919000000002', 'smsText': 'New lead'},
+        ], source='test')
+
+    def reply(self, *replies):
+        StubBulkAPI.replies = list(replies)
+
+    def dispatch(self, **kwargs):
+        return dispatch_pending(url=self.url, timeout=0.5, **kwargs)
+
+    def test_success_marks_rows_sent(self):
+        self.reply((200, '{"Status": "Success", "Details": "ok"}', 0))
+        self.assertEqual(self.dispatch(), (2, 0, 0))
+
+        self.assertEqual(len(StubBulkAPI.requests), 1)
+        self.assertEqual([m['smsTo'] for m in StubBulkAPI.requests[0]['messages']], ['+919000000001', '+919000000002'])
+        self.assertEqual(set(NotificationOutbox.objects.values_list('status', flat=True)), {'sent'})
+        self.assertFalse(NotificationOutbox.objects.filter(sent_at__isnull=True).exists())
+
+    def test_server_error_schedules_retry_with_doubling_backoff(self):
+        self.reply((503, 'Service Unavailable', 0))
+        for attempts in (1, 2, 3):
+            started = timezone.now()
+            self.assertEqual(self.dispatch(), (0, 2, 0))
+            row = NotificationOutbox.objects.first()
+            self.assertEqual((row.status, row.attempts), ('pending', attempts))
+            delay = (row.next_attempt_at - started).total_seconds()
+            self.assertAlmostEqual(delay, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), delta=2)
+            # due again
+            NotificationOutbox.objects.update(next_attempt_at=timezone.now())
+
+    def test_timeout_schedules_retry(self):
+        self.reply((200, '{"Status": "Success"}', 1.0))
+        self.assertEqual(self.dispatch(), (0, 2, 0))
+        row = NotificationOutbox.objects.first()
+        self.assertEqual((row.status, row.attempts), ('pending', 1))
+        self.assertIn('timed out', row.last_error.lower())
+
+    def test_gives_up_after_max_attempts(self):
+        self.reply((500, '{"Status": "Error", "Details": "down"}', 0))
+        NotificationOutbox.objects.update(attempts=2)
+        self.assertEqual(self.dispatch(max_attempts=3), (0, 0, 2))
+        self.assertEqual(set(NotificationOutbox.objects.values_list('status', 'attempts')), {('failed', 3)})
+        self.assertEqual(self.dispatch(max_attempts=3), (0, 0, 0))
+
+    def test_claimed_rows_are_leased(self):
+        first = claim_batch(1)
+        second = claim_batch(5)
+        self.assertEqual(len(first) + len(second), 2)
+        self.assertFalse({row.pk for row in first} & {row.pk for row in second})
+        self.assertEqual(claim_batch(5), [])
+
+
+@skipUnless(connection.features.has_select_for_update_skip_locked, 'needs SELECT ... FOR UPDATE SKIP LOCKED')
+class ConcurrentClaimTests(TransactionTestCase):
+    """Dispatchers running side by side never claim the same outbox row."""
+
+    def test_concurrent_claims_are_disjoint(self):
+        NotificationOutbox.enqueue([{'smsTo': f'+9190000{i:05d}', 'smsText': 'x'} for i in range(40)])
+        barrier = threading.Barrier(4, timeout=10)
+        claimed = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                barrier.wait()
+                while True:
+                    rows = claim_batch(3)
+                    if not rows:
+                        break
+                    with lock:
+                        claimed.extend(row.pk for row in rows)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(claimed), 40)
+        self.assertEqual(len(set(claimed)), 40)
@@ -2,6 +2,8 @@
 ASGI config for wedmac_services project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django as before; WebSocket connections are routed to the
+consumers in leads.routing (realtime lead events).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -13,4 +15,28 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wedmac_services.settings')
 
-application = get_asgi_application()
+# set up Django before importing consumers, which import models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import OriginValidator  # noqa: E402
+from django.conf import settings  # noqa: E402
+from leads.routing import websocket_urlpatterns  # noqa: E402
+
+
+class WebsocketOriginValidator(OriginValidator):
+    """
+    Browsers must connect from one of the CORS origins; the native artist
+    apps send no Origin header and are let through. Sockets authenticate
+    with a JWT in the query string, not cookies, so this only keeps other
+    sites' pages from opening sockets.
+    """
+
+    def valid_origin(self, parsed_origin):
+        return parsed_origin is None or self.validate_origin(parsed_origin)
+
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': WebsocketOriginValidator(URLRouter(websocket_urlpatterns), settings.CORS_ALLOWED_ORIGINS),
+})
@@ -39,6 +39,7 @@ ALLOWED_HOSTS = ["89.116.33.217 ", "localhost", "127.0.0.1","wedmac-be.onrender.
 # Application definition
 
 INSTALLED_APPS = [
+    'daphne',  # ASGI runserver, so ws/leads/ works in development; must precede staticfiles
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -113,6 +114,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'wedmac_services.wsgi.application'
+ASGI_APPLICATION = 'wedmac_services.asgi.application'
 
 
 # Database
@@ -136,6 +138,30 @@ DATABASES = {
     }
 }
 
+# Cache
+# LocMem is per process; point CACHE_BACKEND/CACHE_LOCATION at Redis, Memcached
+# or the database cache in multi-worker deployments so cache invalidations
+# (lead feed ranking, dashboards, master data) reach every worker.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='wedmac-default'),
+    }
+}
+
+# Channel layer for the realtime lead push (ws/leads/). The in-memory layer
+# only reaches sockets served by the same process; set CHANNEL_REDIS_URL
+# (needs channels-redis) when HTTP workers and the ASGI server are separate.
+CHANNEL_REDIS_URL = config('CHANNEL_REDIS_URL', default='')
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {'hosts': [CHANNEL_REDIS_URL]},
+    } if CHANNEL_REDIS_URL else {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -156,6 +182,16 @@ AUTH_PASSWORD_VALIDATORS = [
 
 TWOFACTOR_API_KEY = config('TWOFACTOR_API_KEY')
 DLT_TAG = config('DLT_TAG')
+# Bulk SMS endpoint; point at a local stand-in to exercise the outbox dispatcher
+TWOFACTOR_BULK_URL = config('TWOFACTOR_BULK_URL', default='https://2factor.in/API/R1/Bulk/')
+NOTIFICATION_HTTP_TIMEOUT = config('NOTIFICATION_HTTP_TIMEOUT', default=10, cast=float)
+NOTIFICATION_MAX_ATTEMPTS = config('NOTIFICATION_MAX_ATTEMPTS', default=6, cast=int)
+# Leads created longer ago than this are moved to the archive tables by archive_leads
+LEAD_ARCHIVE_HORIZON_DAYS = config('LEAD_ARCHIVE_HORIZON_DAYS', default=180, cast=int)
+# Leads stay in the artist feed (open-lead index) for this many days after creation; see sweep_open_leads
+LEAD_OPEN_WINDOW_DAYS = config('LEAD_OPEN_WINDOW_DAYS', default=30, cast=int)
+# Largest file the admin import endpoint accepts; bigger files go through the import_leads command
+LEAD_IMPORT_MAX_UPLOAD_BYTES = config('LEAD_IMPORT_MAX_UPLOAD_BYTES', default=2 * 1024 * 1024, cast=int)
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 